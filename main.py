@@ -1,49 +1,291 @@
-from src.utils.utils import read_yaml
-from src.preprocessor.cleaner import clean_data, save_file, read_prepro
-from src.analyzer.aggregator import create_hierarchical_summary
-from src.analyzer.output_processor import (
-    create_summary_by_month, filter_target_month_summary,
-    create_dataframes_with_separators, add_dataframe_to_excel,
-    process_asset_data,
-    auto_adjust_column_width_to_output, apply_accounting_format_to_output, set_font_size_for_output
-)
-
-# Read config
-# 계산할 일자, 원본 데이터 위치 등등 각종 설정을 config 파일로 제어
-config_path = 'config/config.yaml'
-config = read_yaml(config_path)
-
-# Cleaning data & Save
-# 입력 엑셀 파일을 읽어 분석 가능한 형태로 정제 & prepro 경로에 이력 저장, 경로에 동일 파일 존재시 overwrite됨.
-pdf_prepro_target_date = clean_data(config)
-save_file(pdf_prepro_target_date, config, 'prepro')
-
-# Load all data (with past data)
-# target date 뿐만 아니고 그 이전 파일까지 한꺼번에 불러옴
-pdf_prepro = read_prepro(config)
-
-# Aggregation data & create output data
-# 최종 output 계산, 경로에 동일 파일 존재시 overwrite됨.
-pdf_agg = create_hierarchical_summary(pdf_prepro) # final output
-save_file(pdf_agg.reset_index(), config, 'output')
-
-# Output data processing (append)
-# target_month와 전월 데이터를 필터링하고 최종 파일에 별도 시트로 추가
-pdf_summ_type_all, pdf_summ_small_all = create_summary_by_month(pdf_agg) # all date
-pdf_summ_type_tar, pdf_summ_small_tar = filter_target_month_summary(pdf_summ_type_all, pdf_summ_small_all, config)
-pdf_tar = create_dataframes_with_separators([pdf_summ_type_tar, pdf_summ_small_tar])
-add_dataframe_to_excel(
-    pdf_tar,
-    config['output_path'] + '/' + config['output_file_name'],
-    sheet_name='target_month_summary'
-)
-
-# Asset data processing (append)
-# 자산 데이터를 불러와 피벗테이블로 변환하고 최종 파일에 별도 시트로 추가
-process_asset_data(config)
-
-# Cleaning format
-# 읽기 편한 형식으로 엑셀 파일 수정
-set_font_size_for_output(config, 15)
-apply_accounting_format_to_output(config)
-auto_adjust_column_width_to_output(config)
\ No newline at end of file
+"""
+moneyflow 파이프라인 CLI
+
+무거운 모듈(pandas, openpyxl, matplotlib 등)은 각 단계에서 필요할 때 import하므로,
+--help, --dry-run, config 오류는 데이터 처리 모듈을 로드하지 않고 바로 반환됩니다.
+
+Example:
+    python main.py                      # 전체 실행 (config/config.yaml)
+    python main.py --config other.yaml  # 다른 config로 실행
+    python main.py --dry-run            # config 검증 + 입력 파일/출력 형식 확인만 수행
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+from src.utils.background import create_background_io
+from src.utils.config import ConfigError, load_config, resolve_sheet_formats
+
+# 출력 시트 (exporters.sheets에서 시트별 출력 형식 지정)
+OUTPUT_SHEETS = [
+    'processed_data', 'target_month_summary', 'member_data', 'member_summary', 'spending_alerts',
+    'recurring_payments', 'quarter_summary', 'year_summary', 'ytd_summary', 'asset_summary', 'charts'
+]
+
+
+def get_partition_limit_mb(config):
+    """chunked 모드에서 prepro 파티션 하나가 사용할 메모리 한도 (memory_limit_mb의 절반, memory 모드는 파일 단위)"""
+    memory_limit_mb = config.get('memory_limit_mb')
+    if config.get('execution_mode', 'memory') != 'chunked' or not memory_limit_mb:
+        return None
+    return memory_limit_mb / 2
+
+
+def run_cleaning(config, background):
+    """
+    입력 엑셀 파일을 읽어 분석 가능한 형태로 정제 & prepro 경로에 이력 저장, 경로에 동일 파일 존재시 overwrite됨.
+    prepro 저장은 background에서 진행하고, 정제 결과는 다음 단계에 메모리로 넘겨줌 (저장한 파일을 다시 읽지 않음)
+    (정제 결과, prepro 저장 Future)를 반환
+    """
+    from src.preprocessor.cleaner import as_prepro_frame, clean_data, save_file
+
+    pdf_prepro_target_date = as_prepro_frame(clean_data(config))
+    prepro_saved = background.submit(save_file, pdf_prepro_target_date, config, 'prepro')
+    return pdf_prepro_target_date, prepro_saved
+
+
+def run_aggregation(config, handoff, background):
+    """
+    target date 뿐만 아니고 그 이전 파일까지 불러와 최종 output 계산, 경로에 동일 파일 존재시 overwrite됨.
+    chunked 모드에서는 월별 부분 집계(agg 저장소, 변경된 월만 재계산)를 스트리밍하며 병합 (결과는 memory 모드와 동일)
+    quantiles 설정 시 노드별 분위수 컬럼 추가 (chunked 모드는 월별 스케치를 병합)
+    memory 모드도 월별 부분 집계(스케치 포함)를 agg 저장소에 저장하여 chunked 실행과 query 조회에서 재사용
+    구성원별 노드와 가구 합계 노드를 한 번에 집계하여 (구성원별 집계, 가구 합계 집계, prepro 이력)을 반환
+    (prepro 이력은 memory 모드에서 읽은 전체 이력, chunked 모드는 None)
+    handoff(yyyymm: 정제 결과)의 월은 prepro 파일 대신 메모리의 DataFrame을 사용하고,
+    chunked 모드에서는 다음 달 부분 집계를 background에서 미리 읽음
+    """
+    from src.analyzer.aggregator import (
+        create_hierarchical_summary_from_partials, create_partial_summary, finalize_partial_summary,
+        iter_month_partials, save_month_partials, select_member
+    )
+    from src.preprocessor.cleaner import read_prepro
+
+    quantiles = config.get('quantiles') or None
+    if config.get('execution_mode', 'memory') == 'chunked':
+        partition_limit_mb = get_partition_limit_mb(config)
+        partials = iter_month_partials(
+            config, partition_limit_mb, with_sketch=bool(quantiles), by_member=True, handoff=handoff
+        )
+        pdf_agg_member = create_hierarchical_summary_from_partials(
+            background.prefetch(partials), partition_limit_mb, quantiles
+        )
+        pdf_prepro = None
+    else:
+        pdf_prepro = read_prepro(config, handoff)
+        partial = create_partial_summary(pdf_prepro, with_sketch=bool(quantiles), by_member=True)
+        # hand-off 월은 prepro 파일이 저장 중이므로 agg 저장소에 쓰지 않음 (iter_month_partials와 동일)
+        save_month_partials(partial, config, skip=handoff)
+        pdf_agg_member = finalize_partial_summary(partial, quantiles)
+    return pdf_agg_member, select_member(pdf_agg_member), pdf_prepro
+
+
+def get_history_partitions(config, pdf_prepro, handoff, background):
+    """
+    prepro 이력 파티션 iterable (memory 모드에서 이미 읽은 이력이 있으면 그대로 하나의 파티션으로 사용,
+    chunked 모드는 파티션 단위로 읽으며 다음 파티션을 background에서 미리 읽음)
+    """
+    if pdf_prepro is not None:
+        return [pdf_prepro]
+    from src.preprocessor.cleaner import iter_prepro
+
+    return background.prefetch(iter_prepro(config, get_partition_limit_mb(config), handoff))
+
+
+def run_prefetch(config, pdf_prepro_target, background):
+    """
+    이후 단계에서 쓸 입력을 계산과 겹쳐 background에서 미리 읽음
+    (asset.xlsx 피벗, 월말 예상이 필요하면 직전 개월 일자 누적 곡선) Future 딕셔너리를 반환
+    """
+    from src.analyzer.output_processor import create_asset_pivot
+    from src.analyzer.projection import get_projection_as_of, load_history_profiles
+
+    prefetched = {'asset': background.submit(create_asset_pivot, config)}
+    if get_projection_as_of(pdf_prepro_target, config) is not None:
+        prefetched['history_profiles'] = background.submit(load_history_profiles, config)
+    return prefetched
+
+
+def run_outputs(config, session, pdf_agg_member, pdf_agg, pdf_prepro, pdf_prepro_target, handoff, background, prefetched):
+    """
+    집계 결과와 자산 데이터로 출력 시트를 만들고 config에 지정된 형식으로 출력 세션(session)에 내보냄
+    정기결제 탐지는 memory 모드에서 이미 읽은 prepro 이력(pdf_prepro)을 다시 읽지 않고 사용 (get_history_partitions)
+    미리 읽은 입력(run_prefetch)의 결과와 예외는 각 시트를 만드는 지점에서 확인
+    """
+    from src.analyzer.aggregator import (
+        HOUSEHOLD, MEMBER_LEVEL, PERIOD_LEVEL, create_period_summary, get_comparison_periods
+    )
+    from src.analyzer.anomaly import detect_spending_anomalies
+    from src.analyzer.exporter import export_sheet
+    from src.analyzer.projection import add_projection_columns, project_target_month
+    from src.analyzer.recurring import detect_recurring_payments
+    from src.analyzer.output_processor import (
+        create_summary_by_month, filter_target_month_summary, filter_period_summary,
+        create_dataframes_with_separators,
+    )
+
+    # 가구 합계 집계 (member 레벨 없음, 구성원별 행은 member_summary 설정 시 member_data 시트로 분리)
+    export_sheet(pdf_agg.reset_index(), session, 'processed_data')
+
+    # Output data processing (append)
+    # target_month와 전월 데이터를 필터링하고 최종 파일에 별도 시트로 추가
+    pdf_summ_type_all, pdf_summ_small_all = create_summary_by_month(pdf_agg) # all date
+    pdf_summ_type_tar, pdf_summ_small_tar = filter_target_month_summary(pdf_summ_type_all, pdf_summ_small_all, config)
+    # target_month가 진행 중이면 기준일 실적과 월말 예상 금액합계 컬럼 추가 (지난 달 비교가 왜곡되지 않도록)
+    history_profiles = prefetched['history_profiles'].result() if 'history_profiles' in prefetched else None
+    projection = project_target_month(pdf_prepro_target, config, history_profiles=history_profiles)
+    target_month_ym = config['target_month'].strftime('%Y-%m')
+    pdf_summ_type_tar = add_projection_columns(pdf_summ_type_tar, projection, target_month_ym)
+    pdf_summ_small_tar = add_projection_columns(pdf_summ_small_tar, projection, target_month_ym)
+    pdf_tar = create_dataframes_with_separators([pdf_summ_type_tar, pdf_summ_small_tar])
+    export_sheet(pdf_tar, session, 'target_month_summary')
+
+    # Member summary (append, member_summary: true)
+    # 구성원별 집계(가구 합계 노드 제외)와 target_month / 전월 요약을 구성원별로 나누어 별도 시트로 추가
+    if config.get('member_summary'):
+        pdf_member = pdf_agg_member[pdf_agg_member.index.get_level_values(MEMBER_LEVEL) != HOUSEHOLD]
+        export_sheet(pdf_member.reset_index(), session, 'member_data')
+        pdf_summ_type_mem, pdf_summ_small_mem = filter_target_month_summary(
+            *create_summary_by_month(pdf_member), config
+        )
+        export_sheet(create_dataframes_with_separators([pdf_summ_type_mem, pdf_summ_small_mem]), session, 'member_summary')
+
+    # Spending anomaly & budget (append)
+    # 직전 이력 대비 target_month 지출이 크게 달라진 노드와 예산 초과 노드를 별도 시트로 추가
+    pdf_alert = detect_spending_anomalies(pdf_agg, config)
+    export_sheet(pdf_alert, session, 'spending_alerts')
+
+    # Recurring payments (append)
+    # prepro 이력 전체에서 월간/연간 정기결제를 찾아 다음 결제 예정일, 가격 변경과 함께 별도 시트로 추가
+    if (config.get('recurring') or {}).get('enabled', True):
+        partitions = get_history_partitions(config, pdf_prepro, handoff, background)
+        pdf_recurring = detect_recurring_payments(partitions, config)
+        export_sheet(pdf_recurring, session, 'recurring_payments')
+
+    # Period summary (append, period_summaries: [quarter, year, ytd])
+    # 월별 집계를 분기/연/YTD로 합산하여 현재 기간과 비교 기간(전분기, 전년, 전년 같은 기간)을 별도 시트로 추가
+    for period in config.get('period_summaries') or []:
+        pdf_period = create_period_summary(pdf_agg, period, config['target_month'])
+        if len(pdf_period) == 0:
+            continue
+        pdf_summ_type_per, pdf_summ_small_per = filter_period_summary(
+            *create_summary_by_month(pdf_period),
+            get_comparison_periods(period, config['target_month']),
+            PERIOD_LEVEL
+        )
+        export_sheet(create_dataframes_with_separators([pdf_summ_type_per, pdf_summ_small_per]), session, f'{period}_summary')
+
+    # Asset data processing (append)
+    # 자산 데이터를 불러와 피벗테이블로 변환하고 최종 파일에 별도 시트로 추가 (run_prefetch에서 미리 읽음)
+    pdf_asset = prefetched['asset'].result()
+    export_sheet(pdf_asset, session, 'asset_summary', include_index=True)
+    return pdf_asset
+
+
+def run_formatting(session):
+    """
+    출력 세션에 모아 둔 엑셀/HTML 시트(차트 포함)를 한 번에 저장하고, 엑셀은 읽기 편한 형식(글자 크기, 회계 형식, 컬럼 너비)을
+    저장 전에 한 번만 적용 (엑셀로 출력하는 시트가 없으면 엑셀 파일 생성과 서식 작업 생략)
+    """
+    from src.analyzer.exporter import write_outputs
+
+    write_outputs(session, font_size=15)
+
+
+def run_charts(config, session, pdf_agg, pdf_asset):
+    """
+    수입/지출 추이, 대분류 비중, 자산 추이 차트를 그려 charts 시트(excel/html)에 추가 (데이터가 같은 차트는 캐시 재사용)
+    chart_path가 없거나 차트 생성에 실패하면 경고 후 차트 없이 진행
+    """
+    chart_formats = resolve_sheet_formats(config, 'charts')
+    if not (config.get('chart') or {}).get('enabled', True) or not ({'excel', 'html'} & set(chart_formats)):
+        return
+    if not config.get('chart_path'):
+        print('Warning: chart_path가 없어 차트를 생략합니다')
+        return
+    from src.analyzer.chart import build_chart_specs, render_charts
+    from src.analyzer.exporter import export_charts
+
+    # 차트 실패로 이미 계산한 시트가 저장되지 않는 일이 없도록, 실패하면 경고만 출력하고 차트 없이 진행
+    try:
+        chart_files = render_charts(build_chart_specs(pdf_agg, pdf_asset, config), config)
+    except Exception as e:
+        print(f'Warning: 차트 생성 실패, 차트 없이 저장합니다: {e}')
+        return
+    export_charts(chart_files, session)
+
+
+def dry_run(config):
+    """config 검증 결과와 실행 계획(입력 파일 존재 여부, prepro 이력 수, 시트별 출력 형식)을 출력"""
+    print(f"target_month: {config['target_month']}")
+    print(f"execution_mode: {config.get('execution_mode', 'memory')}")
+    print(f"background_io: {(config.get('background_io') or {}).get('enabled', False)}")
+
+    missing = 0
+    for file_name in config['input_file_names'] + [config['asset_file_name']]:
+        file_path = os.path.join(config['input_path'], file_name)
+        exists = os.path.exists(file_path)
+        missing += not exists
+        print(f"  - 입력 파일 {'OK' if exists else '없음'}: {file_path}")
+
+    prepro_pattern = os.path.join(config['prepro_path'], config['prepro_file_name'].replace('{date}', '*'))
+    print(f'  - prepro 이력: {len(glob.glob(prepro_pattern))}개 ({prepro_pattern})')
+    for sheet in OUTPUT_SHEETS:
+        print(f'  - 출력 {sheet}: {resolve_sheet_formats(config, sheet)}')
+    return 1 if missing else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='뱅크샐러드 가계부 데이터 정제/집계/리포트 파이프라인')
+    parser.add_argument('--config', default='config/config.yaml', help='config 파일 경로 (기본값: config/config.yaml)')
+    parser.add_argument('--dry-run', action='store_true', help='config 검증과 실행 계획만 출력하고 종료')
+    parser.add_argument('--no-config-cache', action='store_true', help='검증된 config 캐시를 사용하지 않음')
+    args = parser.parse_args(argv)
+
+    # Read config
+    # 계산할 일자, 원본 데이터 위치 등등 각종 설정을 config 파일로 제어 (스키마 검증 후 캐시)
+    try:
+        config = load_config(args.config, use_cache=not args.no_config_cache)
+    except ConfigError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.dry_run:
+        return dry_run(config)
+
+    # background_io.enabled: 독립적인 파일 I/O를 계산과 겹쳐 실행 (결과/예외는 정해진 지점에서 제출 순서대로 확인)
+    with create_background_io(config) as background:
+        # Cleaning data & Save (background)
+        pdf_prepro_target, prepro_saved = run_cleaning(config, background)
+        handoff = {config['target_month'].strftime('%Y%m'): pdf_prepro_target}
+
+        # Prefetch asset data & projection history (background)
+        prefetched = run_prefetch(config, pdf_prepro_target, background)
+
+        # Load all data (with past data) & Aggregation data
+        # final output (구성원별, 가구 합계), memory 모드에서 읽은 prepro 이력 (정기결제 탐지에 재사용)
+        pdf_agg_member, pdf_agg, pdf_prepro = run_aggregation(config, handoff, background)
+        prepro_saved.result() # prepro 저장 실패는 항상 집계 직후에 전달
+
+        # Output sheets & Asset data processing (append)
+        # 엑셀/HTML 시트는 출력 세션에 모아 두었다가 run_formatting에서 한 번에 저장
+        from src.analyzer.exporter import create_output_session
+        session = create_output_session(config)
+        pdf_asset = run_outputs(
+            config, session, pdf_agg_member, pdf_agg, pdf_prepro, pdf_prepro_target, handoff, background, prefetched
+        )
+
+        # Charts (append)
+        run_charts(config, session, pdf_agg, pdf_asset)
+
+        # Write output files & Cleaning format
+        run_formatting(session)
+        background.wait_all()
+    return 0
+
+
+# 차트 process pool이 spawn 방식으로 이 모듈을 다시 import해도 파이프라인이 재실행되지 않도록 보호
+if __name__ == '__main__':
+    sys.exit(main())
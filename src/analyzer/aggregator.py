@@ -1,46 +1,160 @@
+import os
 import pandas as pd
+from datetime import date
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-def create_income_summary(df: pd.DataFrame) -> pd.DataFrame:
+from dateutil.relativedelta import relativedelta
+
+from src.analyzer.sketch import build_sketch, merge_sketches, sketch_quantile
+from src.preprocessor.cleaner import (
+    extract_file_date, find_prepro_files, get_store_file_path, read_prepro_file_chunks, save_file
+)
+
+HIERARCHY_LEVELS = ['month', '타입', '대분류', '소분류', '내용']
+# 구성원별 집계의 인덱스 (household 합계 노드는 member 레벨이 HOUSEHOLD)
+MEMBER_LEVEL = 'member'
+MEMBER_HIERARCHY_LEVELS = ['month', MEMBER_LEVEL, '타입', '대분류', '소분류', '내용']
+HOUSEHOLD = '전체'
+# 월별 집계에서 파생한 기간 집계의 기간 레벨 (month 자리)
+PERIOD_LEVEL = 'period'
+PERIOD_TYPES = ('quarter', 'year', 'ytd')
+PARTIAL_COLUMNS = ['금액합계', '거래건수']
+SKETCH_COLUMN = '금액스케치'
+
+
+def quantile_column_name(q: float) -> str:
+    """분위수 컬럼명 (예: 0.5 -> '금액_p50', 0.9 -> '금액_p90')"""
+    return f'금액_p{round(q * 100):g}'
+
+
+def _create_level_partials(
+    df: pd.DataFrame,
+    type_label: str,
+    group_columns: List[str],
+    with_sketch: bool = False,
+    by_member: bool = False
+) -> List[pd.DataFrame]:
     """
-    수입 데이터에 대한 계층적 집계 (월별 + 대분류까지만)
+    타입별 데이터에서 각 계층 레벨의 부분 집계(합계, 건수)를 생성
+
+    Args:
+        df: 타입별로 필터링된 DataFrame (month 컬럼 포함)
+        type_label: 인덱스의 타입 레벨에 들어갈 값 ('수입' 또는 '지출')
+        group_columns: 레벨별로 누적되는 그룹 컬럼 (month 제외, 예: ['대분류', '소분류'])
+        with_sketch: 노드별 금액 분위수 스케치 컬럼 포함 여부
+        by_member: month 다음에 member 레벨을 두고 구성원별로 집계할지 여부
+
+    Returns:
+        List[pd.DataFrame]: 레벨별 부분 집계 리스트 (Level 1부터)
+    """
+    prefix = ['month', MEMBER_LEVEL] if by_member else ['month']
+    index_names = MEMBER_HIERARCHY_LEVELS if by_member else HIERARCHY_LEVELS
+    all_levels = []
+    for depth in range(len(group_columns) + 1):
+        keys = prefix + group_columns[:depth]
+        grouped = df.groupby(keys)['금액']
+        level = grouped.agg(['sum', 'count'])
+        # (month[, member]) + 타입 + 그룹 키 + 빈 하위 레벨
+        padding = ('',) * (len(HIERARCHY_LEVELS) - 2 - depth)
+        rows = level.index if isinstance(level.index, pd.MultiIndex) else [(x,) for x in level.index]
+        tuples = [x[:len(prefix)] + (type_label,) + x[len(prefix):] + padding for x in map(tuple, rows)]
+        level.index = pd.MultiIndex.from_tuples(tuples, names=index_names)
+        level.columns = PARTIAL_COLUMNS
+        if with_sketch:
+            # groupby 순회 순서는 agg 결과의 인덱스 순서와 동일 (정렬된 키)
+            level[SKETCH_COLUMN] = [build_sketch(values.to_numpy()) for _, values in grouped]
+        all_levels.append(level)
+    return all_levels
+
+
+def create_income_partial(df: pd.DataFrame, with_sketch: bool = False, by_member: bool = False) -> pd.DataFrame:
+    """
+    수입 데이터의 병합 가능한 부분 집계 (월별 + 대분류까지만, 금액합계/거래건수)
 
     Args:
         df: target_data DataFrame (month 컬럼 포함)
+        with_sketch: 노드별 금액 분위수 스케치 컬럼 포함 여부
+        by_member: 구성원별 집계 여부 (member 컬럼 필요)
 
     Returns:
-        pd.DataFrame: 수입 데이터 계층적 집계 결과 (월별)
+        pd.DataFrame: 수입 데이터 부분 집계 결과 (월별)
     """
     # 수입 데이터만 필터링
-    income_df = df[df['타입'] == '수입'].copy()
+    income_df = df[df['타입'] == '수입']
 
     if len(income_df) == 0:
         return pd.DataFrame()
 
-    all_levels = []
+    # Level 1: 월별 수입 총계, Level 2: 월별 + 대분류별 수입 집계
+    return pd.concat(_create_level_partials(income_df, '수입', ['대분류'], with_sketch, by_member))
 
-    # Level 1: 월별 수입 총계
-    level1 = income_df.groupby('month')['금액'].agg(['sum', 'count', 'mean'])
-    level1.index = pd.MultiIndex.from_tuples(
-        [(x, '수입', '', '', '') for x in level1.index],
-        names=['month', '타입', '대분류', '소분류', '내용']
-    )
-    all_levels.append(level1)
 
-    # Level 2: 월별 + 대분류별 수입 집계
-    level2 = income_df.groupby(['month', '대분류'])['금액'].agg(['sum', 'count', 'mean'])
-    level2.index = pd.MultiIndex.from_tuples(
-        [(x[0], '수입', x[1], '', '') for x in level2.index],
-        names=['month', '타입', '대분류', '소분류', '내용']
-    )
-    all_levels.append(level2)
+def create_expense_partial(df: pd.DataFrame, with_sketch: bool = False, by_member: bool = False) -> pd.DataFrame:
+    """
+    지출 데이터의 병합 가능한 부분 집계 (월별 + 대분류-소분류-내용, 금액합계/거래건수)
+
+    Args:
+        df: target_data DataFrame (month 컬럼 포함)
+        with_sketch: 노드별 금액 분위수 스케치 컬럼 포함 여부
+        by_member: 구성원별 집계 여부 (member 컬럼 필요)
+
+    Returns:
+        pd.DataFrame: 지출 데이터 부분 집계 결과 (월별)
+    """
+    # 지출/이체 데이터만 필터링
+    expense_df = df[df['타입'].isin(['지출', '이체'])]
+
+    if len(expense_df) == 0:
+        return pd.DataFrame()
+
+    # Level 1: 월별 지출 총계 ~ Level 4: 월별 + 대분류 + 소분류 + 내용별 지출 (최상세 레벨)
+    return pd.concat(_create_level_partials(expense_df, '지출', ['대분류', '소분류', '내용'], with_sketch, by_member))
+
+
+def _add_mean_column(partial: pd.DataFrame) -> pd.DataFrame:
+    """부분 집계의 합계/건수로부터 평균금액 컬럼을 계산"""
+    combined = partial[PARTIAL_COLUMNS].copy()
+    combined['평균금액'] = combined['금액합계'] / combined['거래건수']
+    return combined
+
 
-    # 모든 레벨 합치기
-    combined = pd.concat(all_levels)
-    combined.columns = ['금액합계', '거래건수', '평균금액']
+def _add_quantile_columns(combined: pd.DataFrame, partial: pd.DataFrame, quantiles: List[float]) -> pd.DataFrame:
+    """
+    부분 집계의 스케치로부터 분위수 컬럼을 계산
 
+    지출은 금액이 음수로 기록되므로 절댓값 기준 분위수가 되도록 1 - q 분위를 사용합니다.
+    (예: 지출 p90은 10% 노드만 더 큰 금액을 쓴 거래 금액)
+    """
+    if SKETCH_COLUMN not in partial.columns:
+        raise ValueError(f'분위수 계산에는 {SKETCH_COLUMN} 컬럼이 필요합니다. with_sketch=True로 부분 집계를 생성하세요.')
+
+    is_expense = (partial.index.get_level_values('타입') == '지출')
+    for q in quantiles:
+        combined[quantile_column_name(q)] = [
+            sketch_quantile(sketch, 1 - q if expense else q)
+            for sketch, expense in zip(partial[SKETCH_COLUMN], is_expense)
+        ]
     return combined
 
 
+def create_income_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    수입 데이터에 대한 계층적 집계 (월별 + 대분류까지만)
+
+    Args:
+        df: target_data DataFrame (month 컬럼 포함)
+
+    Returns:
+        pd.DataFrame: 수입 데이터 계층적 집계 결과 (월별)
+    """
+    partial = create_income_partial(df)
+    if len(partial) == 0:
+        return pd.DataFrame()
+    return _add_mean_column(partial)
+
+
 def create_expense_summary(df: pd.DataFrame) -> pd.DataFrame:
     """
     지출 데이터에 대한 계층적 집계 (월별 + 대분류-소분류-내용)
@@ -51,88 +165,549 @@ def create_expense_summary(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: 지출 데이터 계층적 집계 결과 (월별)
     """
-    # 지출/이체 데이터만 필터링
-    expense_df = df[df['타입'].isin(['지출', '이체'])].copy()
+    partial = create_expense_partial(df)
+    if len(partial) == 0:
+        return pd.DataFrame()
+    return _add_mean_column(partial)
 
-    if len(expense_df) == 0:
+
+def create_partial_summary(df: pd.DataFrame, with_sketch: bool = False, by_member: bool = False) -> pd.DataFrame:
+    """
+    수입/지출 부분 집계(금액합계, 거래건수)를 합친 병합 가능한 중간 결과
+
+    파티션별로 계산한 결과를 merge_partial_summaries로 합친 뒤
+    finalize_partial_summary를 적용하면 전체 데이터로 계산한 결과와 동일합니다.
+    (분위수 스케치는 근사값이며, 노드 거래 수가 압축 계수 이하이면 정확한 값)
+
+    Args:
+        df: target_data DataFrame 또는 그 일부 파티션 (month 컬럼 포함)
+        with_sketch: 노드별 금액 분위수 스케치(금액스케치) 컬럼 포함 여부
+        by_member: 구성원별로 집계할지 여부 (member 컬럼 필요, 가구 합계 노드는 finalize에서 추가)
+
+    Returns:
+        pd.DataFrame: MultiIndex(month, 타입, 대분류, 소분류, 내용) 부분 집계
+            (by_member면 MultiIndex(month, member, 타입, 대분류, 소분류, 내용))
+    """
+    partials = [
+        p for p in [
+            create_income_partial(df, with_sketch, by_member),
+            create_expense_partial(df, with_sketch, by_member)
+        ]
+        if len(p) > 0
+    ]
+    if not partials:
         return pd.DataFrame()
+    return pd.concat(partials)
 
-    all_levels = []
 
-    # Level 1: 월별 지출 총계
-    level1 = expense_df.groupby('month')['금액'].agg(['sum', 'count', 'mean'])
-    level1.index = pd.MultiIndex.from_tuples(
-        [(x, '지출', '', '', '') for x in level1.index],
-        names=['month', '타입', '대분류', '소분류', '내용']
-    )
-    all_levels.append(level1)
+def merge_partial_summaries(partials: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    여러 파티션의 부분 집계를 계층 키 기준으로 합산
 
-    # Level 2: 월별 + 대분류별 지출
-    level2 = expense_df.groupby(['month', '대분류'])['금액'].agg(['sum', 'count', 'mean'])
-    level2.index = pd.MultiIndex.from_tuples(
-        [(x[0], '지출', x[1], '', '') for x in level2.index],
-        names=['month', '타입', '대분류', '소분류', '내용']
-    )
-    all_levels.append(level2)
+    Args:
+        partials: create_partial_summary 결과 리스트
 
-    # Level 3: 월별 + 대분류 + 소분류별 지출
-    level3 = expense_df.groupby(['month', '대분류', '소분류'])['금액'].agg(['sum', 'count', 'mean'])
-    level3.index = pd.MultiIndex.from_tuples(
-        [(x[0], '지출', x[1], x[2], '') for x in level3.index],
-        names=['month', '타입', '대분류', '소분류', '내용']
-    )
-    all_levels.append(level3)
+    Returns:
+        pd.DataFrame: 계층 키별로 합산된 부분 집계
+    """
+    non_empty = [p for p in partials if len(p) > 0]
+    if not non_empty:
+        return pd.DataFrame()
+    if len(non_empty) == 1:
+        return non_empty[0]
 
-    # Level 4: 월별 + 대분류 + 소분류 + 내용별 지출 (최상세 레벨)
-    level4 = expense_df.groupby(['month', '대분류', '소분류', '내용'])['금액'].agg(['sum', 'count', 'mean'])
-    level4.index = pd.MultiIndex.from_tuples(
-        [(x[0], '지출', x[1], x[2], x[3]) for x in level4.index],
-        names=['month', '타입', '대분류', '소분류', '내용']
-    )
-    all_levels.append(level4)
+    # 스케치는 모든 파티션에 있을 때만 병합 (하나라도 없으면 분위수를 보장할 수 없음)
+    stacked = pd.concat(non_empty)
+    if not all(SKETCH_COLUMN in p.columns for p in non_empty):
+        stacked = stacked[PARTIAL_COLUMNS]
+    return _group_partial(stacked)
+
+
+def _group_partial(stacked: pd.DataFrame) -> pd.DataFrame:
+    """중복 계층 키가 있는 부분 집계를 키별로 합산 (스케치 컬럼이 있으면 스케치도 병합)"""
+    index_names = list(stacked.index.names)
+    merged = stacked[PARTIAL_COLUMNS].groupby(level=index_names, sort=False).sum()
+
+    if SKETCH_COLUMN in stacked.columns:
+        sketch_groups = stacked[SKETCH_COLUMN].groupby(level=index_names, sort=False)
+        keys, sketches = [], []
+        for key, group in sketch_groups:
+            keys.append(key)
+            sketches.append(merge_sketches(group.tolist()))
+        merged[SKETCH_COLUMN] = pd.Series(
+            sketches, index=pd.MultiIndex.from_tuples(keys, names=index_names)
+        ).reindex(merged.index)
 
-    # 모든 레벨 합치기
-    combined = pd.concat(all_levels)
-    combined.columns = ['금액합계', '거래건수', '평균금액']
+    return merged
+
+
+def finalize_partial_summary(partial: pd.DataFrame, quantiles: Optional[List[float]] = None) -> pd.DataFrame:
+    """
+    부분 집계에 평균금액(및 분위수)을 추가하고 최종 출력 순서로 정렬
+
+    Args:
+        partial: 병합이 끝난 부분 집계
+        quantiles: 추가할 분위수 리스트 (예: [0.5, 0.9], 스케치 컬럼 필요)
+
+    Returns:
+        pd.DataFrame: create_hierarchical_summary와 동일한 형태의 집계 결과
+            (구성원별 부분 집계면 가구 합계(member=HOUSEHOLD) 노드 포함)
+    """
+    if len(partial) == 0:
+        return pd.DataFrame()
+
+    if MEMBER_LEVEL in partial.index.names:
+        partial = add_household_total(partial)
+
+    combined = _add_mean_column(partial)
+    if quantiles:
+        combined = _add_quantile_columns(combined, partial, quantiles)
+
+    combined = _sort_summary(combined)
+
+    # 숫자 포맷팅
+    # combined['금액합계'] = combined['금액합계'].apply(lambda x: f"{int(x):,}")
+    # combined['거래건수'] = combined['거래건수'].apply(lambda x: f"{x:.1f}")
+    # combined['평균금액'] = combined['평균금액'].apply(lambda x: f"{int(x):,}")
 
     return combined
 
 
-def create_hierarchical_summary(df: pd.DataFrame) -> pd.DataFrame:
+def _sort_summary(combined: pd.DataFrame) -> pd.DataFrame:
+    """최종 출력 순서로 정렬: month(또는 period)는 내림차순, 나머지 레벨은 오름차순"""
+    index_names = list(combined.index.names)
+    return combined.sort_index(
+        level=index_names,
+        ascending=[False] + [True] * (len(index_names) - 1)
+    )
+
+
+def add_household_total(partial: pd.DataFrame) -> pd.DataFrame:
+    """
+    구성원별 부분 집계에 가구 합계(member=HOUSEHOLD) 노드를 추가
+
+    가구 합계는 원본 거래를 다시 그룹핑하지 않고 구성원별 부분 집계를 member 레벨 기준으로 합산합니다.
+
+    Args:
+        partial: MultiIndex(month, member, 타입, 대분류, 소분류, 내용) 부분 집계 (가구 합계 노드 미포함)
+
+    Returns:
+        pd.DataFrame: 구성원별 노드 + 가구 합계 노드
+    """
+    household = pd.concat({HOUSEHOLD: collapse_members(partial)}, names=[MEMBER_LEVEL])
+    household = household.reorder_levels(MEMBER_HIERARCHY_LEVELS)
+    return pd.concat([partial, household])
+
+
+def collapse_members(partial: pd.DataFrame) -> pd.DataFrame:
+    """
+    구성원별 부분 집계를 member 레벨 기준으로 합산하여 가구 합계 부분 집계로 변환
+
+    Args:
+        partial: MultiIndex(month, member, 타입, 대분류, 소분류, 내용) 부분 집계 (가구 합계 노드 미포함)
+
+    Returns:
+        pd.DataFrame: MultiIndex(month, 타입, 대분류, 소분류, 내용) 부분 집계 (스케치가 있으면 병합)
+    """
+    if MEMBER_LEVEL not in partial.index.names:
+        return partial
+    return _group_partial(partial.droplevel(MEMBER_LEVEL))
+
+
+def select_member(pdf_agg: pd.DataFrame, member: str = HOUSEHOLD) -> pd.DataFrame:
+    """
+    구성원별 집계에서 한 구성원(기본값: 가구 합계)의 노드만 골라 member 레벨을 제거
+
+    Args:
+        pdf_agg: create_hierarchical_summary(..., by_member=True) 결과
+        member: 구성원 이름 또는 HOUSEHOLD
+
+    Returns:
+        pd.DataFrame: MultiIndex(month, 타입, 대분류, 소분류, 내용) 집계 결과 (by_member=False 결과와 같은 형태)
+    """
+    if MEMBER_LEVEL not in pdf_agg.index.names:
+        return pdf_agg
+    members = pdf_agg.index.get_level_values(MEMBER_LEVEL)
+    return pdf_agg[members == member].droplevel(MEMBER_LEVEL)
+
+
+def create_hierarchical_summary(
+    df: pd.DataFrame,
+    quantiles: Optional[List[float]] = None,
+    by_member: bool = False
+) -> pd.DataFrame:
     """
     MultiIndex를 사용한 계층적 집계 (월별로 수입과 지출을 분리하여 분석)
 
     Args:
         df: target_data DataFrame (month 컬럼 포함)
+        quantiles: 노드별로 추가할 금액 분위수 리스트 (예: [0.5, 0.9], None이면 생략)
+        by_member: 구성원별 노드와 가구 합계(HOUSEHOLD) 노드를 함께 집계할지 여부 (member 컬럼 필요)
+
+    Returns:
+        pd.DataFrame: MultiIndex로 계층화된 집계 결과 (월별, by_member면 month 다음에 member 레벨)
+    """
+    return finalize_partial_summary(create_partial_summary(df, bool(quantiles), by_member), quantiles)
+
+
+def fold_partials(partials: Iterable[pd.DataFrame], memory_limit_mb: Optional[float] = None) -> pd.DataFrame:
+    """
+    같은 달의 부분 집계(파일 chunk 등)를 도착하는 대로 병합
+
+    같은 달 부분 집계는 계층 키가 겹치므로, 누적 크기가 한도를 넘을 때 병합하면 크기가 줄어듭니다.
+    병합한 뒤에도 한도를 넘으면 더 줄일 방법이 없으므로 MemoryError를 발생시킵니다.
+
+    Args:
+        partials: 같은 달의 create_partial_summary 결과 iterator
+        memory_limit_mb: 누적 부분 집계가 사용할 수 있는 메모리 한도 (MB, None이면 제한 없음)
+
+    Returns:
+        pd.DataFrame: 병합된 부분 집계
+
+    Raises:
+        MemoryError: 한 달 부분 집계가 병합 후에도 한도를 넘는 경우
+    """
+    limit_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+
+    pending = []
+    pending_bytes = 0
+    for partial in partials:
+        if len(partial) == 0:
+            continue
+        pending.append(partial)
+        pending_bytes += _partial_memory_usage(partial)
+        if limit_bytes is None or pending_bytes <= limit_bytes:
+            continue
+
+        # 누적 부분 집계가 한도를 넘으면 중간 병합
+        if len(pending) > 1:
+            pending = [merge_partial_summaries(pending)]
+            pending_bytes = _partial_memory_usage(pending[0])
+        if pending_bytes > limit_bytes:
+            raise MemoryError(
+                f'한 달 부분 집계({pending_bytes / 1024 / 1024:.3g}MB)가 메모리 한도'
+                f'({memory_limit_mb:.3g}MB)를 넘습니다. memory_limit_mb를 늘려 주세요.'
+            )
+    return merge_partial_summaries(pending)
+
+
+def _iter_month_pieces(partials: Iterable[pd.DataFrame]) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """부분 집계 스트림을 (month, 해당 달 부분 집계) 조각으로 나눔 (여러 달이 섞인 부분 집계는 달별로 분리)"""
+    for partial in partials:
+        if len(partial) == 0:
+            continue
+        months = partial.index.get_level_values('month')
+        if (months == months[0]).all():
+            yield months[0], partial
+        else:
+            for month, piece in partial.groupby(level='month', sort=False):
+                yield month, piece
+
+
+def create_hierarchical_summary_from_partials(
+    partials: Iterable[pd.DataFrame],
+    memory_limit_mb: Optional[float] = None,
+    quantiles: Optional[List[float]] = None
+) -> pd.DataFrame:
+    """
+    부분 집계 스트림을 월 단위로 병합/확정하여 최종 계층적 집계를 생성
+
+    노드는 월별로 독립적이므로 같은 달의 부분 집계만 병합하고(fold_partials),
+    다음 달이 시작되면 이전 달을 finalize(평균/분위수 계산, 스케치 해제)하여 병합 대상에서 뺍니다.
+    메모리 한도는 아직 확정되지 않은 한 달치 부분 집계에 적용됩니다.
+    결과는 전체 데이터를 한 번에 집계한 것과 동일합니다.
+
+    Args:
+        partials: create_partial_summary 결과 iterator, 같은 달은 연속해서 도착해야 함
+            (예: iter_month_partials 결과)
+        memory_limit_mb: 확정 전 한 달 부분 집계가 사용할 수 있는 메모리 한도 (MB, None이면 제한 없음)
+        quantiles: 노드별로 추가할 금액 분위수 리스트
 
     Returns:
         pd.DataFrame: MultiIndex로 계층화된 집계 결과 (월별)
+
+    Raises:
+        MemoryError: 한 달 부분 집계가 병합 후에도 한도를 넘는 경우
+        ValueError: 이미 확정한 달의 부분 집계가 다시 도착한 경우
+    """
+    finalized = []
+    finalized_months = set()
+    # 같은 달 조각끼리 묶어서 병합 -> finalize, 다음 달로 넘어가면 이전 달 부분 집계는 더 이상 보관하지 않음
+    for month, pieces in groupby(_iter_month_pieces(partials), key=itemgetter(0)):
+        if month in finalized_months:
+            raise ValueError(f'{month} 부분 집계가 다른 달 이후에 다시 도착했습니다 (같은 달은 연속해야 함)')
+        month_partial = fold_partials((piece for _, piece in pieces), memory_limit_mb)
+        finalized.append(finalize_partial_summary(month_partial, quantiles))
+        finalized_months.add(month)
+
+    print(f'create_hierarchical_summary_from_partials: {len(finalized)}개월 집계 완료')
+    finalized = [f for f in finalized if len(f) > 0]
+    if not finalized:
+        return pd.DataFrame()
+    return _sort_summary(pd.concat(finalized))
+
+
+def _partial_memory_usage(partial: pd.DataFrame) -> int:
+    """부분 집계의 메모리 사용량 (스케치 배열 크기 포함, bytes)"""
+    usage = int(partial[PARTIAL_COLUMNS].memory_usage(deep=True).sum())
+    if SKETCH_COLUMN in partial.columns:
+        usage += sum(means.nbytes + weights.nbytes for means, weights in partial[SKETCH_COLUMN])
+    return usage
+
+
+def create_window_summary(
+    partial: pd.DataFrame,
+    months: List[str],
+    label: Optional[str] = None,
+    quantiles: Optional[List[float]] = None
+) -> pd.DataFrame:
     """
-    # 수입 요약
-    income_summary = create_income_summary(df)
+    월별 부분 집계에서 여러 달을 하나의 기간으로 묶은 집계를 생성 (원본 거래 재조회 없음)
 
-    # 지출 요약
-    expense_summary = create_expense_summary(df)
+    금액합계/거래건수는 합산하고 평균금액은 합계/건수로 다시 계산하며,
+    분위수는 월별 스케치를 병합하여 계산합니다.
 
-    # 결과 합치기
-    if len(income_summary) > 0 and len(expense_summary) > 0:
-        combined = pd.concat([income_summary, expense_summary])
-    elif len(income_summary) > 0:
-        combined = income_summary
-    elif len(expense_summary) > 0:
-        combined = expense_summary
-    else:
+    Args:
+        partial: 월별 부분 집계 (MultiIndex에 month 레벨 포함)
+        months: 묶을 월 리스트 (yyyy-mm)
+        label: 결과 month 레벨에 들어갈 기간 이름 (기본값: '시작월~종료월')
+        quantiles: 추가할 분위수 리스트 (예: [0.5, 0.9])
+
+    Returns:
+        pd.DataFrame: month 레벨이 기간 이름으로 바뀐 계층적 집계 결과
+    """
+    months = sorted(months)
+    if label is None:
+        label = f'{months[0]}~{months[-1]}'
+
+    window = partial[partial.index.get_level_values('month').isin(months)]
+    if len(window) == 0:
         return pd.DataFrame()
+    window = window.rename(index=dict.fromkeys(months, label), level='month')
+    return finalize_partial_summary(_group_partial(window), quantiles)
 
-    # 정렬: month는 내림차순, 나머지는 오름차순
-    combined = combined.sort_index(
-        level=['month', '타입', '대분류', '소분류', '내용'],
-        ascending=[False, True, True, True, True]
-    )
 
-    # 숫자 포맷팅
-    # combined['금액합계'] = combined['금액합계'].apply(lambda x: f"{int(x):,}")
-    # combined['거래건수'] = combined['거래건수'].apply(lambda x: f"{x:.1f}")
-    # combined['평균금액'] = combined['평균금액'].apply(lambda x: f"{int(x):,}")
+def get_period_label(month: str, period: str, target_month: Optional[date] = None) -> Optional[str]:
+    """
+    월(yyyy-mm)이 속하는 기간 이름
+
+    target_month를 주면 모든 기간을 target_month까지 지난 개월 수만큼만 묶어서, 진행 중인 기간과
+    비교 기간이 같은 개월 수를 비교하도록 합니다 (예: target_month가 10월이면 분기는 각 분기의 첫 1개월,
+    연은 1~10월). 일부 개월만 묶인 기간은 이름에 포함한 월 범위를 붙입니다.
+
+    Args:
+        month: 월 (yyyy-mm)
+        period: 'quarter' (예: 2025-Q3, 2025-Q4 (10~10월)), 'year' (예: 2025, 2025 (01~10월)),
+            'ytd' (예: 2025-01~2025-10)
+        target_month: 기준 월 (ytd에는 필수)
+
+    Returns:
+        Optional[str]: 기간 이름 (기간 안에서 target_month의 위치보다 뒤의 달이면 None)
+    """
+    year, month_num = int(month[:4]), int(month[5:7])
+    if period == 'quarter':
+        quarter = (month_num - 1) // 3 + 1
+        if target_month is None or target_month.month % 3 == 0:
+            return f'{year}-Q{quarter}'
+        # 분기 안에서 target_month까지 지난 개월 수만큼만 포함
+        first_month = (quarter - 1) * 3 + 1
+        last_month = first_month + (target_month.month - 1) % 3
+        if month_num > last_month:
+            return None
+        return f'{year}-Q{quarter} ({first_month:02d}~{last_month:02d}월)'
+    if period == 'year':
+        if target_month is None or target_month.month == 12:
+            return str(year)
+        if month_num > target_month.month:
+            return None
+        return f'{year} (01~{target_month.month:02d}월)'
+    if period == 'ytd':
+        if target_month is None:
+            raise ValueError('ytd 집계에는 target_month가 필요합니다.')
+        if month_num > target_month.month:
+            return None
+        return f'{year}-01~{year}-{target_month.month:02d}'
+    raise ValueError(f'지원하지 않는 period입니다: {period} (가능: {list(PERIOD_TYPES)})')
+
+
+def get_comparison_periods(period: str, target_month: date) -> List[str]:
+    """
+    target_month가 속한 기간과 비교 대상 기간 이름 (분기: 전분기, 연: 전년, ytd: 전년 같은 기간)
+
+    두 기간은 같은 개월 수를 포함합니다 (get_period_label 참고).
+
+    Args:
+        period: 'quarter', 'year', 'ytd'
+        target_month: 분석 대상 월
+
+    Returns:
+        List[str]: [현재 기간, 비교 기간]
+    """
+    previous = relativedelta(months=3) if period == 'quarter' else relativedelta(years=1)
+    return [
+        get_period_label(month.strftime('%Y-%m'), period, target_month)
+        for month in [target_month, target_month - previous]
+    ]
+
+
+def create_period_summary(
+    pdf_agg: pd.DataFrame,
+    period: str,
+    target_month: Optional[date] = None
+) -> pd.DataFrame:
+    """
+    월별 계층 집계에서 분기/연/YTD 계층 집계를 생성 (원본 거래 재조회 없음)
+
+    월별 금액합계/거래건수를 기간별로 합산하고 평균금액은 합계/건수로 다시 계산합니다.
+    target_month를 주면 target_month 이후의 달은 제외하고, 진행 중인 분기/연도와 비교 기간이 같은 개월 수가
+    되도록 모든 기간을 target_month까지 지난 개월 수만큼만 합산합니다 (get_period_label 참고).
+    분위수 컬럼은 월별 값을 합칠 수 없으므로 포함하지 않습니다 (기간 분위수는 create_window_summary 사용).
+
+    Args:
+        pdf_agg: create_hierarchical_summary 결과 또는 월별 부분 집계 (by_member 결과도 가능)
+        period: 'quarter', 'year', 'ytd'
+        target_month: 기준 월 (ytd에는 필수)
+
+    Returns:
+        pd.DataFrame: month 레벨이 period 레벨(기간 이름)로 바뀐 계층적 집계 결과 (period 내림차순)
+    """
+    if len(pdf_agg) == 0:
+        return pd.DataFrame()
+
+    # 월 수만큼만 기간 이름을 계산한 뒤 인덱스 레벨 값을 한 번에 치환
+    months = pdf_agg.index.get_level_values('month')
+    labels = {month: get_period_label(month, period, target_month) for month in months.unique()}
+    last_month = target_month.strftime('%Y-%m') if target_month is not None else None
+    labels = {
+        month: label for month, label in labels.items()
+        if label is not None and (last_month is None or month <= last_month)
+    }
+
+    rows = pdf_agg.loc[months.isin(list(labels)), PARTIAL_COLUMNS]
+    if len(rows) == 0:
+        return pd.DataFrame()
+    rows = rows.rename(index=labels, level='month').rename_axis(index={'month': PERIOD_LEVEL})
+    return _sort_summary(_add_mean_column(_group_partial(rows)))
+
+
+def load_stored_partial(
+    config: Dict[str, Any],
+    date_str: str,
+    with_sketch: bool = False,
+    by_member: bool = False
+) -> Optional[pd.DataFrame]:
+    """
+    월별 집계 저장소(agg_path)의 부분 집계가 그대로 쓸 수 있으면 반환
+
+    Args:
+        config: 설정 딕셔너리 (prepro_path, prepro_file_name, agg_path, agg_file_name)
+        date_str: 월 (yyyymm)
+        with_sketch: 분위수 스케치 컬럼이 필요한지 여부
+        by_member: member 레벨이 있어야 하는지 여부
+
+    Returns:
+        Optional[pd.DataFrame]: agg 파일이 prepro 파일보다 최신이고 필요한 스케치 컬럼과 member 레벨을
+            가지고 있으면 저장된 부분 집계, 아니면 None
+    """
+    prepro_file_path = get_store_file_path(config, 'prepro', date_str)
+    agg_file_path = get_store_file_path(config, 'agg', date_str)
+    if not (
+        os.path.exists(agg_file_path) and os.path.exists(prepro_file_path) and
+        os.path.getmtime(agg_file_path) >= os.path.getmtime(prepro_file_path)
+    ):
+        return None
+
+    partial = pd.read_pickle(agg_file_path)
+    has_sketch = not with_sketch or SKETCH_COLUMN in partial.columns
+    has_member = (MEMBER_LEVEL in partial.index.names) == by_member
+    if len(partial) == 0 or (has_sketch and has_member):
+        return partial
+    return None
+
+
+def save_month_partials(
+    partial: pd.DataFrame,
+    config: Dict[str, Any],
+    skip: Optional[Iterable[str]] = None
+) -> int:
+    """
+    memory 모드에서 한 번에 만든 부분 집계를 월별로 나누어 월별 집계 저장소(agg_path)에 저장
+
+    저장소의 부분 집계가 이미 최신인 달은 다시 쓰지 않으므로, 다음 chunked 실행과 query 조회, 여러 달 분위수
+    (create_window_summary)가 원본 거래를 다시 읽지 않고 월별 스케치를 병합할 수 있습니다.
+
+    Args:
+        partial: create_partial_summary 결과 (여러 달, 가구 합계 노드 미포함)
+        config: 설정 딕셔너리 (agg_path가 없으면 저장하지 않음)
+        skip: 저장하지 않을 월 (yyyymm, 예: prepro 파일을 저장 중인 hand-off 월)
+
+    Returns:
+        int: 새로 저장한 월 수
+    """
+    if not config.get('agg_path') or len(partial) == 0:
+        return 0
+
+    skip = set(skip or ())
+    with_sketch = SKETCH_COLUMN in partial.columns
+    by_member = MEMBER_LEVEL in partial.index.names
+    saved = 0
+    for month, month_partial in partial.groupby(level='month', sort=False):
+        date_str = month.replace('-', '')
+        if date_str in skip or load_stored_partial(config, date_str, with_sketch, by_member) is not None:
+            continue
+        save_file(month_partial, config, 'agg', date_str=date_str)
+        saved += 1
+    return saved
+
+
+def iter_month_partials(
+    config: Dict[str, Any],
+    memory_limit_mb: Optional[float] = None,
+    with_sketch: bool = False,
+    by_member: bool = False,
+    handoff: Optional[Dict[str, pd.DataFrame]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    prepro 파일(월)별 부분 집계를 월별 집계 저장소(agg_path)에서 읽거나 새로 만들어 반환
+
+    agg 파일이 prepro 파일보다 최신이고 필요한 스케치 컬럼과 member 레벨을 가지고 있으면 거래 데이터를 다시 읽지 않고
+    저장된 부분 집계를 사용합니다. 그렇지 않으면 prepro 파일을 chunk 단위로 집계한 뒤 저장합니다.
+
+    Args:
+        config: 설정 딕셔너리 (prepro_path, prepro_file_name, agg_path, agg_file_name)
+        memory_limit_mb: prepro chunk 하나가 사용할 수 있는 메모리 한도 (MB)
+        with_sketch: 분위수 스케치 포함 여부
+        by_member: 구성원별 부분 집계 여부 (가구 합계 노드는 저장하지 않고 finalize에서 추가)
+        handoff: prepro 파일 대신 사용할 월별 DataFrame (yyyymm: as_prepro_frame 결과, 저장 중인 target_month 등)
+
+    Yields:
+        pd.DataFrame: 월별 부분 집계
+    """
+    handoff = handoff or {}
+    for prepro_file_path in find_prepro_files(config, caller='iter_month_partials', handoff=handoff):
+        date_str = extract_file_date(prepro_file_path, config['prepro_file_name'])
+        agg_file_path = get_store_file_path(config, 'agg', date_str)
+
+        if date_str in handoff:
+            # 방금 정제한 월은 메모리에서 바로 집계 (prepro 파일이 저장 중이므로 agg 파일도 저장하지 않음,
+            # 저장하더라도 prepro 파일보다 오래된 것으로 판정되어 다음 실행에서 다시 만들어짐)
+            print(f'  - 메모리에서 전달받은 월 집계: {date_str}')
+            yield create_partial_summary(handoff[date_str], with_sketch, by_member)
+            continue
+
+        partial = load_stored_partial(config, date_str, with_sketch, by_member)
+        if partial is not None:
+            print(f'  - 저장된 월별 집계 사용: {os.path.basename(agg_file_path)}')
+            yield partial
+            continue
 
-    return combined
\ No newline at end of file
+        # chunk별 부분 집계를 도착하는 대로 병합 (chunk 전체를 모아 두지 않음)
+        partial = fold_partials(
+            (
+                create_partial_summary(chunk, with_sketch, by_member)
+                for chunk in read_prepro_file_chunks(prepro_file_path, memory_limit_mb)
+            ),
+            memory_limit_mb
+        )
+        save_file(partial, config, 'agg', date_str=date_str)
+        yield partial
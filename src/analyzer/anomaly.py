@@ -0,0 +1,165 @@
+"""
+월별 계층 집계(create_hierarchical_summary 결과) 위에서 지출 이상치와 예산 초과를 탐지하는 모듈
+
+모든 대분류/소분류/내용 노드를 (노드 x 월) 행렬 하나로 펼친 뒤,
+target_month 직전 window 개월의 이력과 비교하는 연산을 노드 전체에 대해 한 번에 수행합니다.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Tuple
+
+# 정규분포 가정 시 MAD / MeanAD를 표준편차 척도로 맞추는 계수
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+
+def create_monthly_spending_matrix(pdf_agg: pd.DataFrame) -> pd.DataFrame:
+    """
+    지출 노드별 월별 지출액 행렬을 생성 (지출은 양수로 변환)
+
+    Args:
+        pdf_agg: create_hierarchical_summary 결과 (MultiIndex: month, 타입, 대분류, 소분류, 내용)
+
+    Returns:
+        pd.DataFrame: index=(대분류, 소분류, 내용), columns=연속된 월(yyyy-mm, 오름차순)
+            - 노드가 처음 등장한 달 이전은 NaN, 이후 거래가 없는 달은 0
+    """
+    expense = pdf_agg[
+        (pdf_agg.index.get_level_values('타입') == '지출') &
+        (pdf_agg.index.get_level_values('대분류') != '')
+    ]
+    if len(expense) == 0:
+        return pd.DataFrame()
+
+    spending = (-expense['금액합계']).droplevel('타입')
+    matrix = spending.unstack('month')
+
+    # 거래가 전혀 없는 달도 포함하도록 월 컬럼을 연속 구간으로 맞춤
+    months = pd.period_range(min(matrix.columns), max(matrix.columns), freq='M').strftime('%Y-%m')
+    matrix = matrix.reindex(columns=months)
+
+    # 첫 등장 이후의 빈 달은 지출 0, 첫 등장 이전은 이력 없음(NaN)
+    started = matrix.notna().cumsum(axis=1) > 0
+    return matrix.fillna(0).where(started)
+
+
+def _trailing_statistics(history: np.ndarray, method: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    노드별 이력 구간(행=노드, 열=월)에서 기준값과 변동폭을 계산
+
+    Args:
+        history: target_month 직전 window 개월 지출 행렬 (이력 없는 달은 NaN)
+        method: 'zscore' (평균/표준편차) 또는 'mad' (중앙값/MAD)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (기준금액, 변동폭)
+    """
+    if method == 'mad':
+        center = np.nanmedian(history, axis=1)
+        deviation = np.abs(history - center[:, None])
+        spread = np.nanmedian(deviation, axis=1) * MAD_SCALE
+        # 절반 이상의 달이 같은 값(주로 0)이면 MAD가 0이 되므로 평균 절대편차로 대체
+        spread = np.where(spread == 0, np.nanmean(deviation, axis=1) * MEAN_AD_SCALE, spread)
+    elif method == 'zscore':
+        center = np.nanmean(history, axis=1)
+        spread = np.nanstd(history, axis=1, ddof=1)
+    else:
+        raise ValueError(f"지원하지 않는 anomaly method입니다: {method}")
+    return center, spread
+
+
+def detect_spending_anomalies(pdf_agg: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    target_month 지출이 직전 이력에서 크게 벗어난 노드와 예산을 초과한 노드를 찾는 함수
+
+    Args:
+        pdf_agg: create_hierarchical_summary 결과
+        config: 설정 딕셔너리
+            - target_month: 분석 대상 월
+            - anomaly.window_months: 비교할 직전 개월 수 (기본값: 6)
+            - anomaly.min_history_months: 이상치 판정에 필요한 최소 이력 개월 수 (기본값: 3)
+            - anomaly.method: 'zscore' 또는 'mad' (기본값: 'mad')
+            - anomaly.threshold: 이상치로 판정할 점수 절댓값 (기본값: 3.0)
+            - anomaly.min_change: 이상치로 판정할 최소 변동 금액 (기본값: 0)
+            - budgets: 월 예산 ({'식비': 800000, '식비/카페': 100000} 형태, 대분류 또는 대분류/소분류)
+
+    Returns:
+        pd.DataFrame: 이상치 또는 예산 초과로 판정된 노드 (지출금액 내림차순)
+            - 점수: 부호 있는 이상치 점수 (출력 시 회계 형식 대신 소수점 둘째 자리까지 표시)
+            - 예산사용률(%): 예산 대비 지출금액 (퍼센트)
+    """
+    anomaly_config = config.get('anomaly') or {}
+    window_months = anomaly_config.get('window_months', 6)
+    min_history_months = anomaly_config.get('min_history_months', 3)
+    method = anomaly_config.get('method', 'mad')
+    threshold = anomaly_config.get('threshold', 3.0)
+    min_change = anomaly_config.get('min_change', 0)
+    budgets = config.get('budgets') or {}
+
+    target_month_ym = config['target_month'].strftime('%Y-%m')
+
+    matrix = create_monthly_spending_matrix(pdf_agg)
+    if len(matrix) == 0 or target_month_ym not in matrix.columns:
+        print(f"detect_spending_anomalies: {target_month_ym} 지출 데이터가 없습니다.")
+        return pd.DataFrame()
+
+    # target_month 직전 window 개월 이력을 노드 전체에 대해 한 번에 추출
+    target_idx = matrix.columns.get_loc(target_month_ym)
+    values = matrix.to_numpy(dtype='float64')
+    history = values[:, max(0, target_idx - window_months):target_idx]
+    current = values[:, target_idx]
+
+    # target_month에 존재하는 노드만 대상 (첫 등장 이후면 거래가 없어도 0으로 비교)
+    active = ~np.isnan(current)
+    history_months = (~np.isnan(history)).sum(axis=1)
+
+    if history.shape[1] > 0:
+        # 이력이 전부 NaN인 노드의 'All-NaN slice' / 'Mean of empty slice' 경고는 NaN 결과로 처리되므로 무시
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            center, spread = _trailing_statistics(history, method)
+    else:
+        center = spread = np.full(len(matrix), np.nan)
+
+    # 변동폭이 0인 노드(매달 같은 금액)도 변화가 있으면 잡히도록 최소 1원으로 보정
+    # (np.maximum은 NaN을 유지하므로 변동폭을 계산할 수 없는 노드의 점수는 NaN으로 남음)
+    with np.errstate(all='ignore'):
+        score = (current - center) / np.maximum(spread, 1.0)
+    enough_history = history_months >= min_history_months
+    is_anomaly = (
+        active & enough_history &
+        (np.abs(score) >= threshold) &
+        (np.abs(current - center) >= min_change)
+    )
+
+    result = matrix.index.to_frame(index=False)
+    result.insert(0, 'month', target_month_ym)
+    result['지출금액'] = current
+    result['기준금액'] = center
+    result['변동폭'] = spread
+    result['이력개월수'] = history_months
+    result['점수'] = np.where(enough_history, score, np.nan)
+    result['이상여부'] = np.where(is_anomaly, np.where(score > 0, '증가', '감소'), '')
+
+    # 예산: '대분류' 키는 대분류 노드, '대분류/소분류' 키는 소분류 노드에 매칭
+    node_keys = np.where(
+        result['소분류'] == '',
+        result['대분류'],
+        result['대분류'] + '/' + result['소분류']
+    )
+    node_keys = np.where(result['내용'] == '', node_keys, None)
+    result['예산'] = pd.Series(node_keys).map(budgets).astype('float64')
+    # 출력 엑셀의 회계 형식(#,##0)에서도 보이도록 퍼센트 단위
+    result['예산사용률(%)'] = result['지출금액'] / result['예산'] * 100
+    is_over_budget = active & (result['예산사용률(%)'] > 100).to_numpy()
+    result['예산초과'] = np.where(is_over_budget, '초과', '')
+
+    flagged = result[is_anomaly | is_over_budget]
+    flagged = flagged.sort_values('지출금액', ascending=False).reset_index(drop=True)
+
+    print(f'detect_spending_anomalies: {target_month_ym} 기준 {len(matrix)}개 노드 중 '
+          f'이상치 {int(is_anomaly.sum())}건, 예산 초과 {int(is_over_budget.sum())}건')
+    return flagged
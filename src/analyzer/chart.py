@@ -0,0 +1,195 @@
+"""
+집계 결과로 차트(PNG)를 그리고 출력 엑셀 파일의 charts 시트에 삽입하는 모듈
+
+- 차트는 headless backend(Agg)로 process pool에서 병렬로 그립니다.
+- 차트 입력 데이터의 해시를 파일명에 넣어 chart_path에 캐시하므로, 데이터가 바뀌지 않은 차트는 다시 그리지 않습니다.
+"""
+
+import glob
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+from openpyxl.drawing.image import Image
+from dateutil.relativedelta import relativedelta
+
+# 차트 그리는 방식이 바뀌면 올려서 기존 캐시를 무효화
+CHART_VERSION = 1
+CHART_ROW_SPAN = 32  # charts 시트에서 차트 하나가 차지하는 행 수
+DEFAULT_FONT_FAMILY = ['AppleGothic', 'Malgun Gothic', 'NanumGothic', 'DejaVu Sans']
+
+ChartSpec = Tuple[str, str, str, pd.DataFrame]  # (이름, 종류, 제목, 데이터)
+
+
+def build_chart_specs(
+    pdf_agg: pd.DataFrame,
+    pdf_asset: Optional[pd.DataFrame],
+    config: Dict[str, Any]
+) -> List[ChartSpec]:
+    """
+    차트별 입력 데이터를 준비하는 함수
+
+    Args:
+        pdf_agg: create_hierarchical_summary 결과
+        pdf_asset: create_asset_pivot 결과 (pivot table, 없으면 None 또는 빈 DataFrame)
+        config: 설정 딕셔너리 (target_month, chart.trend_months)
+
+    Returns:
+        List[ChartSpec]: (이름, 종류, 제목, 데이터) 리스트
+    """
+    chart_config = config.get('chart') or {}
+    trend_months = chart_config.get('trend_months', 12)
+    target_month_ym = config['target_month'].strftime('%Y-%m')
+    start_month_ym = (config['target_month'] - relativedelta(months=trend_months - 1)).strftime('%Y-%m')
+
+    specs = []
+    months = pdf_agg.index.get_level_values('month')
+    in_window = (months >= start_month_ym) & (months <= target_month_ym)
+
+    # 1. 월별 수입 vs 지출 추이 (지출은 절댓값)
+    pdf_type = pdf_agg[in_window & (pdf_agg.index.get_level_values('대분류') == '')]
+    if len(pdf_type) > 0:
+        pdf_trend = pdf_type['금액합계'].droplevel(['대분류', '소분류', '내용']).unstack('타입').abs()
+        pdf_trend = pdf_trend.sort_index().fillna(0)
+        specs.append(('monthly_trend', 'line', f'월별 수입/지출 ({start_month_ym} ~ {target_month_ym})', pdf_trend))
+
+    # 2. target_month 지출 대분류 비중
+    pdf_large = pdf_agg[
+        (months == target_month_ym) &
+        (pdf_agg.index.get_level_values('타입') == '지출') &
+        (pdf_agg.index.get_level_values('대분류') != '') &
+        (pdf_agg.index.get_level_values('소분류') == '')
+    ]
+    if len(pdf_large) > 0:
+        pdf_breakdown = pdf_large['금액합계'].abs().droplevel(['month', '타입', '소분류', '내용'])
+        pdf_breakdown = pdf_breakdown.sort_values(ascending=False).to_frame('지출')
+        specs.append(('category_breakdown', 'barh', f'{target_month_ym} 대분류별 지출', pdf_breakdown))
+
+    # 3. 자산 카테고리별 추이
+    if pdf_asset is not None and len(pdf_asset) > 0:
+        pdf_asset_trend = pdf_asset.groupby(level='카테고리').sum().T.sort_index()
+        specs.append(('asset_trend', 'area', '카테고리별 자산 추이', pdf_asset_trend))
+
+    return specs
+
+
+def hash_chart_data(kind: str, title: str, data: pd.DataFrame, font_family: Union[str, List[str]]) -> str:
+    """차트 종류/제목/폰트/데이터(인덱스, 컬럼 포함)로 캐시 키 해시를 계산"""
+    hasher = hashlib.sha256()
+    hasher.update(f'{CHART_VERSION}|{kind}|{title}|{font_family}'.encode('utf-8'))
+    hasher.update('|'.join(map(str, data.columns)).encode('utf-8'))
+    hasher.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return hasher.hexdigest()[:16]
+
+
+def _render_chart(
+    kind: str,
+    title: str,
+    data: pd.DataFrame,
+    file_path: str,
+    font_family: Union[str, List[str]]
+) -> str:
+    """
+    차트 하나를 PNG로 저장 (process pool worker에서 실행)
+
+    Args:
+        kind: 'line', 'barh', 'area'
+        title: 차트 제목
+        data: index가 x축(또는 항목), 컬럼이 계열인 DataFrame
+        file_path: 저장할 PNG 경로
+        font_family: 한글 표시용 폰트 이름 (리스트면 설치된 첫 폰트 사용)
+
+    Returns:
+        str: 저장된 PNG 경로
+    """
+    # worker마다 headless backend를 먼저 지정한 뒤 pyplot을 import
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_theme(style='whitegrid', rc={'font.family': font_family, 'axes.unicode_minus': False})
+    fig, ax = plt.subplots(figsize=(12, 6), dpi=100)
+
+    if kind == 'line':
+        data.plot(ax=ax, marker='o')
+    elif kind == 'barh':
+        sns.barplot(x=data.iloc[:, 0].to_numpy(), y=data.index.astype(str), ax=ax, orient='h', color='#4C72B0')
+    elif kind == 'area':
+        data.plot.area(ax=ax)
+    else:
+        plt.close(fig)
+        raise ValueError(f'지원하지 않는 차트 종류입니다: {kind}')
+
+    ax.set_title(title)
+    ax.set_xlabel('')
+    ax.set_ylabel('')
+    if kind == 'barh':
+        ax.xaxis.set_major_formatter(matplotlib.ticker.StrMethodFormatter('{x:,.0f}'))
+    else:
+        ax.yaxis.set_major_formatter(matplotlib.ticker.StrMethodFormatter('{x:,.0f}'))
+    fig.tight_layout()
+
+    # 다른 프로세스가 덜 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = file_path + '.tmp'
+    fig.savefig(tmp_path, format='png')
+    plt.close(fig)
+    os.replace(tmp_path, file_path)
+    return file_path
+
+
+def render_charts(specs: List[ChartSpec], config: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    차트를 캐시 확인 후 필요한 것만 process pool에서 그리는 함수
+
+    Args:
+        specs: build_chart_specs 결과
+        config: 설정 딕셔너리 (chart_path, chart.max_workers, chart.font_family)
+
+    Returns:
+        List[Tuple[str, str]]: specs 순서의 (차트 이름, PNG 경로) 리스트
+    """
+    chart_config = config.get('chart') or {}
+    chart_path = config['chart_path']
+    font_family = chart_config.get('font_family', DEFAULT_FONT_FAMILY)
+    max_workers = chart_config.get('max_workers')
+    os.makedirs(chart_path, exist_ok=True)
+
+    results = []
+    pending = []
+    for name, kind, title, data in specs:
+        file_path = os.path.join(chart_path, f'{name}_{hash_chart_data(kind, title, data, font_family)}.png')
+        results.append((name, file_path))
+
+        if os.path.exists(file_path):
+            print(f'render_charts: 캐시 사용 - {os.path.basename(file_path)}')
+            continue
+
+        # 같은 이름의 이전 버전 차트 정리
+        for stale_path in glob.glob(os.path.join(chart_path, f'{name}_*.png')):
+            os.remove(stale_path)
+        pending.append((kind, title, data, file_path, font_family))
+
+    if pending:
+        workers = min(len(pending), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_render_chart, *args) for args in pending]
+            # 제출 순서대로 결과 확인 (worker 예외는 여기서 그대로 전달)
+            for future in futures:
+                print(f'render_charts: 생성 완료 - {os.path.basename(future.result())}')
+
+    return results
+
+
+def add_charts_to_workbook(wb, chart_files: List[Tuple[str, str]], sheet_name: str = 'charts') -> None:
+    """열려 있는 workbook에 PNG 차트들을 세로로 배치한 시트를 추가 (기존 시트는 교체, 저장은 호출한 쪽에서)"""
+    if sheet_name in wb.sheetnames:
+        del wb[sheet_name]
+    sheet = wb.create_sheet(sheet_name)
+
+    for i, (name, chart_file) in enumerate(chart_files):
+        row = i * CHART_ROW_SPAN + 1
+        sheet.cell(row=row, column=1, value=name)
+        sheet.add_image(Image(chart_file), f'A{row + 1}')
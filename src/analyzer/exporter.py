@@ -0,0 +1,264 @@
+"""
+출력 시트를 config에 지정된 형식(excel, parquet, csv, html)으로 내보내는 모듈
+
+시트마다 exporters.sheets에 형식 리스트를 지정할 수 있고, 지정하지 않은 시트는 exporters.default를 따릅니다.
+parquet/csv는 시트마다 바로 저장하고, 한 파일에 여러 시트가 들어가는 excel/html은 create_output_session으로
+만든 OutputSession에 시트를 모아 두었다가 write_outputs에서 한 번에 저장합니다
+(엑셀 workbook을 시트마다 다시 열고 저장하지 않고, 서식도 한 번만 적용).
+excel을 쓰지 않는 시트 구성(예: 대시보드용 parquet만)이면 엑셀 파일 생성과 서식 작업을 모두 건너뜁니다.
+
+출력 위치 (output_file_name이 output_latest.xlsx인 경우):
+    - excel: {output_path}/output_latest.xlsx (시트별)
+    - parquet, csv: {output_path}/output_latest/{시트명}.parquet|.csv
+    - html: {output_path}/output_latest.html (시트별 섹션을 담은 단일 파일)
+"""
+
+import base64
+import html
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.analyzer.chart import add_charts_to_workbook
+from src.analyzer.output_processor import (
+    apply_accounting_format_in_workbook, auto_adjust_column_width_in_workbook, set_font_size_in_workbook
+)
+from src.utils.config import resolve_sheet_formats
+
+# 회계 형식(#,##0, 절댓값) 대신 부호를 유지하고 소수점 둘째 자리까지 표시하는 컬럼 (spending_alerts의 이상치 점수)
+DECIMAL_COLUMNS = ('점수',)
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: -apple-system, 'Apple SD Gothic Neo', 'Malgun Gothic', sans-serif; margin: 24px; }}
+table {{ border-collapse: collapse; font-size: 13px; margin-bottom: 32px; }}
+th, td {{ border: 1px solid #ddd; padding: 4px 8px; }}
+th {{ background: #f4f4f4; }}
+td {{ text-align: right; }}
+img {{ max-width: 100%; margin-bottom: 24px; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{sections}
+</body>
+</html>
+"""
+
+
+@dataclass
+class OutputSession:
+    """
+    한 번의 실행에서 write_outputs 전까지 모아 두는 출력
+
+    Attributes:
+        config: 설정 딕셔너리 (output_path, output_file_name, exporters)
+        excel: 시트명별 (DataFrame, include_index)
+        html: 시트명별 html 섹션 본문
+        charts: excel charts 시트에 넣을 (시트명, (차트 이름, PNG 경로) 리스트)
+    """
+    config: Dict[str, Any]
+    excel: Dict[str, Tuple[pd.DataFrame, bool]] = field(default_factory=dict)
+    html: Dict[str, str] = field(default_factory=dict)
+    charts: Optional[Tuple[str, List[Tuple[str, str]]]] = None
+
+
+def create_output_session(config: Dict[str, Any]) -> OutputSession:
+    """이전 실행의 엑셀/HTML 출력 파일을 지우고 (이전 시트가 남지 않도록) 새 출력 세션을 반환"""
+    excel_file_path = os.path.join(config['output_path'], config['output_file_name'])
+    for file_path in [excel_file_path, get_output_file_path(config, '.html')]:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    return OutputSession(config)
+
+
+def get_sheet_formats(config: Dict[str, Any], sheet_name: str) -> List[str]:
+    """시트에 적용할 출력 형식 리스트 (exporters.sheets.<시트명> -> exporters.default -> ['excel'])"""
+    formats = resolve_sheet_formats(config, sheet_name)
+    unknown = [f for f in formats if f not in EXPORTERS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {unknown} (가능: {list(EXPORTERS)})")
+    return list(formats)
+
+
+def get_output_file_path(config: Dict[str, Any], extension: str) -> str:
+    """output_file_name의 확장자를 바꾼 출력 파일 경로 (예: output_latest.html)"""
+    stem = Path(config['output_file_name']).stem
+    return os.path.join(config['output_path'], stem + extension)
+
+
+def _get_sheet_file_path(config: Dict[str, Any], sheet_name: str, extension: str) -> str:
+    """parquet/csv처럼 시트별로 파일이 나뉘는 형식의 출력 경로"""
+    stem = Path(config['output_file_name']).stem
+    sheet_dir = os.path.join(config['output_path'], stem)
+    os.makedirs(sheet_dir, exist_ok=True)
+    return os.path.join(sheet_dir, sheet_name + extension)
+
+
+def export_excel(df: pd.DataFrame, session: OutputSession, sheet_name: str, include_index: bool) -> bool:
+    """엑셀 출력 (write_outputs에서 다른 시트와 함께 한 번에 저장)"""
+    session.excel[sheet_name] = (df, include_index)
+    print(f"  - Excel 시트 대기: '{sheet_name}' ({len(df)}행)")
+    return True
+
+
+def export_parquet(df: pd.DataFrame, session: OutputSession, sheet_name: str, include_index: bool) -> bool:
+    """parquet 출력 (pyarrow 또는 fastparquet 필요)"""
+    file_path = _get_sheet_file_path(session.config, sheet_name, '.parquet')
+    # parquet 컬럼명은 문자열이어야 하므로 변환 (예: 피벗 테이블의 월 컬럼)
+    df_out = df.rename(columns=str)
+    try:
+        df_out.to_parquet(file_path, index=include_index)
+    except ImportError as e:
+        raise ImportError('parquet 출력에는 pyarrow가 필요합니다: pip install pyarrow') from e
+    print(f'  - Parquet 저장 완료: {file_path} ({len(df)}행)')
+    return True
+
+
+def export_csv(df: pd.DataFrame, session: OutputSession, sheet_name: str, include_index: bool) -> bool:
+    """CSV 출력 (엑셀에서 바로 열 수 있도록 utf-8-sig)"""
+    file_path = _get_sheet_file_path(session.config, sheet_name, '.csv')
+    df.to_csv(file_path, index=include_index, encoding='utf-8-sig')
+    print(f'  - CSV 저장 완료: {file_path} ({len(df)}행)')
+    return True
+
+
+def _format_decimal(value: Any) -> str:
+    return '' if pd.isna(value) else f'{value:.2f}'
+
+
+def export_html(df: pd.DataFrame, session: OutputSession, sheet_name: str, include_index: bool) -> bool:
+    """단일 파일 HTML 리포트에 시트를 표로 추가 (write_outputs에서 한 번에 저장)"""
+    table = df.to_html(
+        index=include_index, na_rep='', border=0,
+        float_format=lambda x: f'{x:,.0f}',
+        formatters={col: _format_decimal for col in DECIMAL_COLUMNS if col in df.columns}
+    )
+    session.html[sheet_name] = f'<h2>{html.escape(sheet_name)}</h2>\n{table}\n'
+    return True
+
+
+Exporter = Callable[[pd.DataFrame, OutputSession, str, bool], bool]
+EXPORTERS: Dict[str, Exporter] = {
+    'excel': export_excel,
+    'parquet': export_parquet,
+    'csv': export_csv,
+    'html': export_html,
+}
+
+
+def export_sheet(
+    df: pd.DataFrame,
+    session: OutputSession,
+    sheet_name: str,
+    include_index: bool = False
+) -> bool:
+    """
+    DataFrame을 시트에 지정된 모든 형식으로 내보내는 함수
+
+    Args:
+        df: 저장할 DataFrame
+        session: create_output_session 결과 (excel/html 시트를 모아 두는 세션)
+        sheet_name: 시트 이름 (형식 선택 및 파일명에 사용)
+        include_index: DataFrame의 인덱스를 포함할지 여부
+
+    Returns:
+        bool: 모든 형식의 저장 성공 여부
+    """
+    if df.empty:
+        print(f"Warning: Empty DataFrame provided for sheet '{sheet_name}'")
+        return False
+
+    formats = get_sheet_formats(session.config, sheet_name)
+    print(f"export_sheet: '{sheet_name}' -> {formats}")
+    results = [EXPORTERS[fmt](df, session, sheet_name, include_index) for fmt in formats]
+    return all(results)
+
+
+def export_charts(chart_files: List[Tuple[str, str]], session: OutputSession, sheet_name: str = 'charts') -> bool:
+    """
+    차트 PNG를 시트에 지정된 형식으로 내보내는 함수 (excel: charts 시트, html: base64 이미지 섹션)
+
+    parquet/csv 형식은 차트를 담을 수 없으므로 chart_path의 PNG 파일을 그대로 사용합니다.
+    excel/html은 다른 시트와 함께 write_outputs에서 저장합니다.
+    """
+    if not chart_files:
+        print(f"Warning: No charts provided for sheet '{sheet_name}'")
+        return False
+
+    formats = get_sheet_formats(session.config, sheet_name)
+    if 'excel' in formats:
+        session.charts = (sheet_name, chart_files)
+    if 'html' in formats:
+        images = []
+        for name, chart_file in chart_files:
+            with open(chart_file, 'rb') as file:
+                encoded = base64.b64encode(file.read()).decode('ascii')
+            images.append(f'<img alt="{html.escape(name)}" src="data:image/png;base64,{encoded}">')
+        session.html[sheet_name] = f'<h2>{html.escape(sheet_name)}</h2>\n' + '\n'.join(images) + '\n'
+    return True
+
+
+def write_outputs(session: OutputSession, font_size: int = 15) -> bool:
+    """
+    세션에 모아 둔 excel 시트와 html 섹션을 각각 한 번에 파일로 저장
+
+    엑셀은 하나의 ExcelWriter 세션에서 모든 시트를 쓰고, 저장하기 전에 데이터 시트의 서식
+    (글자 크기, 회계 형식, 컬럼 너비)을 한 번만 적용한 뒤 charts 시트를 추가합니다.
+    html은 모든 섹션을 담은 문서를 한 번 렌더링합니다.
+
+    Args:
+        session: create_output_session 결과
+        font_size: 엑셀 데이터 시트의 글자 크기 (포인트)
+
+    Returns:
+        bool: 저장 성공 여부 (저장할 시트가 없으면 True)
+
+    Raises:
+        Exception: 엑셀 또는 html 파일 저장에 실패한 경우
+    """
+    config = session.config
+    excel_sheets, html_sections, charts = session.excel, session.html, session.charts
+
+    if excel_sheets or charts:
+        output_file_path = os.path.join(config['output_path'], config['output_file_name'])
+        try:
+            os.makedirs(config['output_path'], exist_ok=True)
+            with pd.ExcelWriter(output_file_path, engine='openpyxl') as writer:
+                for sheet_name, (df, include_index) in excel_sheets.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=include_index)
+
+                # 파일을 다시 열지 않고 저장 전의 workbook에 서식 적용 (차트 시트는 제외)
+                wb = writer.book
+                set_font_size_in_workbook(wb, font_size)
+                apply_accounting_format_in_workbook(wb, decimal_columns=DECIMAL_COLUMNS)
+                auto_adjust_column_width_in_workbook(wb)
+                if charts:
+                    add_charts_to_workbook(wb, charts[1], charts[0])
+            print(f"Excel saved successfully to '{output_file_path}' ({len(excel_sheets)}개 시트"
+                  f"{', 차트 ' + str(len(charts[1])) + '개' if charts else ''})")
+        except Exception as e:
+            # 이전 save_file(..., 'output')과 같이 저장 실패는 호출한 쪽(파이프라인 종료 코드)까지 전달
+            print(f"Error saving Excel output: {e}")
+            raise
+
+    if html_sections:
+        file_path = get_output_file_path(config, '.html')
+        rendered = ''.join(
+            f'<!-- sheet:{name} -->\n{body}<!-- /sheet:{name} -->\n'
+            for name, body in html_sections.items()
+        )
+        os.makedirs(config['output_path'], exist_ok=True)
+        title = html.escape(Path(config['output_file_name']).stem)
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(HTML_TEMPLATE.format(title=title, sections=rendered))
+        print(f'  - HTML 저장 완료: {file_path} ({len(html_sections)}개 섹션)')
+
+    return True
@@ -0,0 +1,249 @@
+"""
+진행 중인 target_month의 월말 금액합계를 예상하는 모듈
+
+prepro 월별 데이터로 (타입, 대분류, 소분류) 노드 x 일자(1~31일) 누적 금액 곡선(daily profile)을 만들어
+profile 저장소에 월별로 캐시합니다. 월말 예상 금액은 기준일까지의 실적에, 직전 개월들에서 같은 날 이후에
+쓴 금액의 평균을 더해서 모든 노드에 대해 한 번에 계산합니다.
+"""
+
+import calendar
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from src.analyzer.aggregator import create_partial_summary
+from src.preprocessor.cleaner import get_store_file_path, read_prepro_file_chunks, save_file
+
+PROFILE_DAYS = 31
+PROFILE_LEVELS = ['타입', '대분류', '소분류']
+SUMMARY_KEYS = ['타입', '대분류', '소분류', '내용']
+
+
+def create_daily_profile(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    한 달치 prepro 데이터의 노드별 일자 누적 금액합계
+
+    create_partial_summary의 month 자리에 일자를 넣어 집계하므로 노드 구성은 pdf_agg와 같습니다.
+
+    Args:
+        df: 한 달치 prepro DataFrame
+
+    Returns:
+        pd.DataFrame: index=(타입, 대분류, 소분류), columns=1~31일, 값=해당 일까지의 누적 금액합계 (지출은 음수)
+    """
+    days = pd.to_datetime(df['날짜']).dt.day
+    partial = create_partial_summary(df.assign(month=days.to_numpy()))
+    if len(partial) == 0:
+        return pd.DataFrame(columns=range(1, PROFILE_DAYS + 1))
+
+    # 내용 레벨은 제외하고 대분류/소분류 노드만 사용
+    node_sums = partial.loc[partial.index.get_level_values('내용') == '', '금액합계'].droplevel('내용')
+    daily = node_sums.unstack('month', fill_value=0)
+    daily = daily.reindex(columns=range(1, PROFILE_DAYS + 1), fill_value=0)
+    return daily.cumsum(axis=1)
+
+
+def load_month_profile(config: Dict[str, Any], date_str: str) -> Optional[pd.DataFrame]:
+    """
+    월별 daily profile을 profile 저장소에서 읽거나 prepro 파일로 새로 만들어 저장
+
+    profile 파일이 prepro 파일보다 최신이면 거래 데이터를 다시 읽지 않습니다.
+
+    Args:
+        config: 설정 딕셔너리 (prepro_path, prepro_file_name, profile_path, profile_file_name)
+        date_str: 월 (yyyymm)
+
+    Returns:
+        Optional[pd.DataFrame]: create_daily_profile 결과 (prepro 파일이 없으면 None)
+    """
+    prepro_file_path = get_store_file_path(config, 'prepro', date_str)
+    if not os.path.exists(prepro_file_path):
+        return None
+
+    profile_file_path = get_store_file_path(config, 'profile', date_str)
+    if (
+        os.path.exists(profile_file_path) and
+        os.path.getmtime(profile_file_path) >= os.path.getmtime(prepro_file_path)
+    ):
+        print(f'  - 저장된 일별 누적 곡선 사용: {os.path.basename(profile_file_path)}')
+        return pd.read_pickle(profile_file_path)
+
+    df = pd.concat(read_prepro_file_chunks(prepro_file_path), ignore_index=True)
+    profile = create_daily_profile(df)
+    save_file(profile, config, 'profile', date_str=date_str)
+    return profile
+
+
+def project_month_end(
+    target_profile: pd.DataFrame,
+    history_profiles: List[pd.DataFrame],
+    as_of_day: int,
+    days_in_month: int
+) -> pd.DataFrame:
+    """
+    기준일까지의 실적과 직전 개월들의 일자 누적 곡선으로 노드별 월말 금액합계를 예상
+
+    예상 = 기준일까지의 실적 + 직전 개월들에서 기준일 다음 날부터 월말까지 쓴 금액의 평균
+    (직전 개월 이력이 없으면 기준일까지의 일 평균으로 선형 환산)
+
+    Args:
+        target_profile: target_month의 create_daily_profile 결과
+        history_profiles: 직전 개월들의 create_daily_profile 결과 리스트
+        as_of_day: 기준일 (1~31)
+        days_in_month: target_month의 일 수
+
+    Returns:
+        pd.DataFrame: index=(타입, 대분류, 소분류), columns=['실적', '예상']
+    """
+    nodes = pd.MultiIndex.from_tuples([], names=PROFILE_LEVELS)
+    for profile in [target_profile] + history_profiles:
+        if len(profile) > 0:
+            nodes = nodes.union(profile.index)
+
+    actual = target_profile.reindex(nodes, fill_value=0)[as_of_day].to_numpy(dtype='float64')
+    if history_profiles:
+        # (개월, 노드, 일) 누적 곡선에서 모든 노드의 남은 기간 금액을 한 번에 계산
+        # (이력 월에 없는 노드는 그 달 금액 0)
+        cube = np.stack([
+            profile.reindex(nodes, fill_value=0).to_numpy(dtype='float64') for profile in history_profiles
+        ])
+        remaining = cube[:, :, days_in_month - 1] - cube[:, :, as_of_day - 1]
+        projected = actual + remaining.mean(axis=0)
+    else:
+        projected = actual * days_in_month / as_of_day
+
+    return pd.DataFrame({'실적': actual, '예상': projected}, index=nodes)
+
+
+def get_projection_as_of(
+    pdf_prepro_target: pd.DataFrame,
+    config: Dict[str, Any],
+    today: Optional[date] = None
+) -> Optional[date]:
+    """
+    target_month 월말 예상의 기준일 (예상이 필요 없으면 None)
+
+    Args:
+        pdf_prepro_target: clean_data 결과 (target_month 거래)
+        config: 설정 딕셔너리 (target_month, projection.enabled, projection.as_of)
+        today: 오늘 날짜 (기본값: date.today())
+
+    Returns:
+        Optional[date]: 기준일 (비활성화, 거래 없음, 지난 달, 기준일이 말일이면 None)
+    """
+    projection_config = config.get('projection') or {}
+    if not projection_config.get('enabled', True) or pdf_prepro_target is None or len(pdf_prepro_target) == 0:
+        return None
+
+    target_month = config['target_month'].replace(day=1)
+    days_in_month = calendar.monthrange(target_month.year, target_month.month)[1]
+    today = today or date.today()
+
+    as_of = projection_config.get('as_of')
+    if isinstance(as_of, str):
+        as_of = date.fromisoformat(as_of)
+    if as_of is None:
+        # 이미 끝난 달은 실제 금액합계를 그대로 비교
+        if (today.year, today.month) != (target_month.year, target_month.month):
+            return None
+        as_of = min(pd.to_datetime(pdf_prepro_target['날짜']).max().date(), today)
+    as_of_day = min(max(as_of.day, 1), days_in_month)
+    if as_of_day == days_in_month:
+        return None
+    return target_month.replace(day=as_of_day)
+
+
+def load_history_profiles(config: Dict[str, Any]) -> List[pd.DataFrame]:
+    """
+    target_month 직전 개월들의 daily profile 리스트 (최근 달부터, prepro 파일이 없거나 거래가 없는 달은 제외)
+
+    Args:
+        config: 설정 딕셔너리 (target_month, projection.history_months)
+
+    Returns:
+        List[pd.DataFrame]: load_month_profile 결과 리스트
+    """
+    target_month = config['target_month'].replace(day=1)
+    history_months = (config.get('projection') or {}).get('history_months', 6)
+    history_profiles = []
+    for i in range(1, history_months + 1):
+        profile = load_month_profile(config, (target_month - relativedelta(months=i)).strftime('%Y%m'))
+        if profile is not None and len(profile) > 0:
+            history_profiles.append(profile)
+    return history_profiles
+
+
+def project_target_month(
+    pdf_prepro_target: pd.DataFrame,
+    config: Dict[str, Any],
+    today: Optional[date] = None,
+    history_profiles: Optional[List[pd.DataFrame]] = None
+) -> Optional[pd.DataFrame]:
+    """
+    target_month가 진행 중이면 노드별 기준일 실적과 월말 예상 금액합계를 계산
+
+    Args:
+        pdf_prepro_target: clean_data 결과 (target_month 거래)
+        config: 설정 딕셔너리
+            - target_month: 분석 대상 월
+            - projection.enabled: 예상 계산 여부 (기본값: True)
+            - projection.history_months: 일자 누적 곡선을 참고할 직전 개월 수 (기본값: 6)
+            - projection.as_of: 기준일 (비우면 target_month가 이번 달일 때 마지막 거래일, 지난 달이면 예상 생략)
+        today: 오늘 날짜 (기본값: date.today())
+        history_profiles: 미리 읽어 둔 load_history_profiles 결과 (None이면 여기서 읽음)
+
+    Returns:
+        Optional[pd.DataFrame]: index=(타입, 대분류, 소분류, 내용), columns=['실적', '예상'],
+            attrs['as_of']에 기준일 (예상을 생략하면 None)
+    """
+    as_of = get_projection_as_of(pdf_prepro_target, config, today)
+    if as_of is None:
+        return None
+
+    days_in_month = calendar.monthrange(as_of.year, as_of.month)[1]
+    history_months = (config.get('projection') or {}).get('history_months', 6)
+    print(f'project_target_month: {as_of:%Y-%m} {as_of.day}일 기준, 직전 {history_months}개월 곡선으로 월말 예상')
+    if history_profiles is None:
+        history_profiles = load_history_profiles(config)
+
+    # 누적 곡선의 기준일 값이 실적이므로 기준일 이후 거래는 자동으로 제외됨
+    projection = project_month_end(
+        create_daily_profile(pdf_prepro_target), history_profiles, as_of.day, days_in_month
+    )
+    projection['내용'] = ''
+    projection = projection.set_index('내용', append=True)
+    projection.attrs['as_of'] = as_of
+    print(f'  - {len(projection)}개 노드, 이력 {len(history_profiles)}개월')
+    return projection
+
+
+def add_projection_columns(
+    pdf_summary: pd.DataFrame,
+    projection: Optional[pd.DataFrame],
+    target_month_ym: str
+) -> pd.DataFrame:
+    """
+    target_month 비교 표(split_and_join_summary_by_month 결과) 오른쪽에 기준일 실적과 월말 예상 컬럼을 추가
+
+    Args:
+        pdf_summary: 타입/대분류/소분류/내용 컬럼을 가진 비교 표
+        projection: project_target_month 결과 (None이면 그대로 반환)
+        target_month_ym: target_month (yyyy-mm)
+
+    Returns:
+        pd.DataFrame: '실적_{yyyy-mm}(~dd일)', '예상_{yyyy-mm}' 컬럼이 추가된 비교 표
+    """
+    if projection is None or len(pdf_summary) == 0:
+        return pdf_summary
+
+    as_of = projection.attrs['as_of']
+    columns = {'실적': f'실적_{target_month_ym}(~{as_of.day}일)', '예상': f'예상_{target_month_ym}'}
+    keys = [key for key in SUMMARY_KEYS if key in pdf_summary.columns]
+    projected = projection[['실적', '예상']].rename(columns=columns).reset_index()
+    result = pdf_summary.merge(projected, on=keys, how='left')
+    result.index = pdf_summary.index
+    return result
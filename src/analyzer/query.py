@@ -0,0 +1,295 @@
+"""
+계층 집계(pdf_agg)와 prepro 이력을 한 번만 불러와서 조회하는 모듈
+
+월 범위, 타입, 카테고리 경로(대분류 > 소분류 > 내용)로 필터/드릴다운/롤업/Top-N 조회를 수행합니다.
+조회는 정렬된 MultiIndex 슬라이싱으로 처리하고, 정규화된 조회 조건을 키로 결과를 LRU 캐시에 보관합니다.
+
+Example:
+    python -m src.analyzer.query --last 6 --type 지출 --path 식비 --level 소분류
+    python -m src.analyzer.query --start 2025-01 --end 2025-12 --level 내용 --rollup --top 20
+    python -m src.analyzer.query -i   # 한 줄에 하나씩 조회 조건 입력 (데이터는 한 번만 로드)
+"""
+
+import argparse
+import shlex
+import sys
+from contextlib import redirect_stdout
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from src.analyzer.aggregator import (
+    HIERARCHY_LEVELS, PARTIAL_COLUMNS, collapse_members, create_window_summary, finalize_partial_summary,
+    iter_month_partials
+)
+from src.preprocessor.cleaner import read_prepro
+from src.utils.config import ConfigError, load_config
+
+NODE_LEVELS = ['타입', '대분류', '소분류', '내용']
+QUERY_CACHE_SIZE = 256
+
+# 한 번 로드된 집계/월별 부분 집계/이력 (load_cube로 교체)
+_STATE: Dict[str, Any] = {'config': None, 'cube': None, 'partial': None, 'prepro': None}
+
+
+def load_cube(config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    월별 집계 저장소(agg_path)의 부분 집계로 계층 집계를 만들고 조회용으로 보관 (이전 조회 캐시는 비움)
+
+    저장소의 부분 집계가 prepro 파일보다 최신인 달은 원본 거래를 다시 읽지 않고, 없거나 오래된 달만
+    prepro 파일에서 다시 집계하여 저장합니다 (iter_month_partials). 원본 거래 조회(transactions)에 필요한
+    prepro 이력은 처음 조회할 때 읽습니다.
+    config의 quantiles가 있으면 월별 부분 집계에 스케치를 포함하여, 롤업 조회에서도 월별 스케치를 병합한
+    기간 분위수를 계산합니다.
+
+    Args:
+        config: 설정 딕셔너리
+
+    Returns:
+        pd.DataFrame: 조회용 계층 집계 (MultiIndex 오름차순 정렬)
+    """
+    quantiles = config.get('quantiles') or None
+    # main 실행이 저장한 구성원별 부분 집계를 그대로 재사용하고, 조회는 가구 합계 기준
+    partials = [
+        collapse_members(partial)
+        for partial in iter_month_partials(config, with_sketch=bool(quantiles), by_member=True)
+        if len(partial) > 0
+    ]
+    if not partials:
+        raise FileNotFoundError(f"prepro 파일이 없습니다: {config['prepro_path']}")
+    # 월별 부분 집계는 서로 다른 달이므로 이어 붙이기만 함 (분위수를 쓰지 않으면 스케치는 보관하지 않음)
+    partial = pd.concat(partials)
+    if not quantiles:
+        partial = partial[PARTIAL_COLUMNS]
+
+    # 슬라이싱을 위해 모든 레벨 오름차순으로 정렬 (lexsort)
+    _STATE['cube'] = finalize_partial_summary(partial, quantiles).sort_index()
+    _STATE['partial'] = partial.sort_index()
+    _STATE['prepro'] = None
+    _STATE['config'] = config
+    _execute_query.cache_clear()
+    return _STATE['cube']
+
+
+def normalize_query(
+    start_month: Optional[str] = None,
+    end_month: Optional[str] = None,
+    type_: Optional[str] = None,
+    path: Optional[Sequence[str]] = None,
+    level: Optional[str] = None,
+    rollup: bool = False,
+    top_n: Optional[int] = None,
+    transactions: bool = False
+) -> Tuple:
+    """
+    조회 조건을 캐시 키로 쓸 수 있는 튜플로 정규화
+
+    Args:
+        start_month: 시작 월 (yyyy-mm, 포함)
+        end_month: 종료 월 (yyyy-mm, 포함)
+        type_: 타입 ('수입' 또는 '지출')
+        path: 카테고리 경로 (예: ['식비'] 또는 ['식비', '카페'])
+        level: 조회할 레벨 ('타입', '대분류', '소분류', '내용', 기본값: 경로의 마지막 레벨)
+        rollup: 월 범위를 하나로 합산할지 여부
+        top_n: 금액합계 절댓값 기준 상위 N개만 반환
+        transactions: 집계 대신 조건에 맞는 원본 거래를 반환
+
+    Returns:
+        Tuple: 정규화된 조회 조건
+    """
+    path = tuple(p.strip() for p in (path or ()) if p and p.strip())
+    if len(path) > len(NODE_LEVELS) - 1:
+        raise ValueError(f'카테고리 경로는 최대 {len(NODE_LEVELS) - 1}단계입니다: {path}')
+    if path and not type_:
+        # 수입은 대분류까지만 있으므로 하위 경로 조회는 지출로 간주
+        type_ = '지출'
+
+    default_level = NODE_LEVELS[len(path)] if type_ or path else '타입'
+    level = level or default_level
+    if level not in NODE_LEVELS:
+        raise ValueError(f'지원하지 않는 level입니다: {level} (가능: {NODE_LEVELS})')
+    if NODE_LEVELS.index(level) < len(path):
+        raise ValueError(f'level({level})은 경로 {path}보다 상위일 수 없습니다.')
+
+    start_month = _normalize_month(start_month)
+    end_month = _normalize_month(end_month)
+    if start_month and end_month and start_month > end_month:
+        start_month, end_month = end_month, start_month
+
+    return (
+        start_month, end_month, type_ or None, path, level,
+        bool(rollup), int(top_n) if top_n else None, bool(transactions)
+    )
+
+
+def _normalize_month(month: Optional[str]) -> Optional[str]:
+    """'2025-1', '202501', '2025-01-15' 등을 'yyyy-mm'으로 정규화"""
+    if not month:
+        return None
+    return pd.Period(str(month).strip(), freq='M').strftime('%Y-%m')
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _execute_query(query_key: Tuple) -> pd.DataFrame:
+    """정규화된 조회 조건으로 집계/이력을 조회 (결과는 LRU 캐시)"""
+    start_month, end_month, type_, path, level, rollup, top_n, transactions = query_key
+
+    if transactions:
+        return _query_transactions(start_month, end_month, type_, path, top_n)
+
+    cube = _STATE['cube']
+    depth = NODE_LEVELS.index(level)
+
+    # 월 범위 / 타입 / 경로는 인덱스 슬라이스, 대상 레벨보다 깊은 레벨은 '' (해당 레벨 노드)
+    keys = [slice(start_month, end_month), type_ if type_ else slice(None)]
+    keys += list(path)
+    keys += [slice(None)] * (depth - len(path))
+    keys += [''] * (len(NODE_LEVELS) - 1 - depth)
+    keys = keys[:len(HIERARCHY_LEVELS)]
+    try:
+        result = cube.loc[tuple(keys), :]
+    except KeyError:
+        # 존재하지 않는 타입/경로는 빈 결과
+        return cube.iloc[:0]
+
+    # 대상 레벨 자체가 빈 값인 상위 노드(드릴다운의 부모)는 제외
+    if depth > 0:
+        result = result[result.index.get_level_values(level) != '']
+
+    if rollup and len(result) > 0:
+        # 조회된 노드의 월별 부분 집계를 합산 (분위수는 월별 스케치를 병합)
+        months = list(result.index.get_level_values('month').unique())
+        quantiles = _STATE['config'].get('quantiles') or None
+        result = create_window_summary(_STATE['partial'].loc[result.index], months, quantiles=quantiles)
+        result = result.droplevel('month')
+
+    if top_n:
+        result = result.sort_values('금액합계', key=lambda x: x.abs(), ascending=False).head(top_n)
+
+    return result
+
+
+def _query_transactions(
+    start_month: Optional[str],
+    end_month: Optional[str],
+    type_: Optional[str],
+    path: Tuple[str, ...],
+    top_n: Optional[int]
+) -> pd.DataFrame:
+    """조건에 맞는 prepro 원본 거래를 조회 (prepro 이력은 처음 조회할 때 한 번만 읽음)"""
+    if _STATE['prepro'] is None:
+        _STATE['prepro'] = read_prepro(_STATE['config'])
+    pdf = _STATE['prepro']
+    mask = pd.Series(True, index=pdf.index)
+    if start_month:
+        mask &= pdf['month'] >= start_month
+    if end_month:
+        mask &= pdf['month'] <= end_month
+    if type_ == '지출':
+        mask &= pdf['타입'].isin(['지출', '이체'])
+    elif type_:
+        mask &= pdf['타입'] == type_
+    for column, value in zip(NODE_LEVELS[1:], path):
+        mask &= pdf[column] == value
+
+    result = pdf[mask]
+    if top_n:
+        result = result.sort_values('금액', key=lambda x: x.abs(), ascending=False).head(top_n)
+    return result
+
+
+def query(**kwargs) -> pd.DataFrame:
+    """
+    계층 집계를 조회 (인자는 normalize_query 참고, 결과는 캐시의 복사본)
+
+    Example:
+        load_cube(config)
+        query(start_month='2025-05', end_month='2025-10', type_='지출', path=['식비'], level='소분류')
+        query(start_month='2025-01', end_month='2025-12', level='내용', rollup=True, top_n=20)
+    """
+    if _STATE['cube'] is None:
+        raise RuntimeError('load_cube(config)를 먼저 호출하세요.')
+    return _execute_query(normalize_query(**kwargs)).copy()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """query CLI 인자 정의"""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.analyzer.query',
+        description='계층 집계 조회 (월 범위 / 타입 / 카테고리 경로 / 드릴다운 / 롤업 / Top-N)'
+    )
+    parser.add_argument('--config', default='config/config.yaml', help='config 파일 경로')
+    parser.add_argument('--start', help='시작 월 (yyyy-mm)')
+    parser.add_argument('--end', help='종료 월 (yyyy-mm)')
+    parser.add_argument('--last', type=int, help='config의 target_month까지 최근 N개월')
+    parser.add_argument('--type', dest='type_', choices=['수입', '지출'], help='타입')
+    parser.add_argument('--path', help="카테고리 경로 ('/' 구분, 예: 식비/카페)")
+    parser.add_argument('--level', choices=NODE_LEVELS, help='조회할 레벨 (드릴다운)')
+    parser.add_argument('--rollup', action='store_true', help='월 범위를 하나로 합산')
+    parser.add_argument('--top', type=int, help='금액합계 절댓값 기준 상위 N개')
+    parser.add_argument('--transactions', action='store_true', help='원본 거래 조회')
+    parser.add_argument('-i', '--interactive', action='store_true', help='표준입력으로 여러 조회 수행')
+    return parser
+
+
+def _query_from_args(args: argparse.Namespace, config: Dict[str, Any]) -> pd.DataFrame:
+    """CLI 인자를 조회 조건으로 변환하여 조회"""
+    start_month, end_month = args.start, args.end
+    if args.last:
+        target_month = config['target_month']
+        end_month = target_month.strftime('%Y-%m')
+        start_month = (target_month - relativedelta(months=args.last - 1)).strftime('%Y-%m')
+
+    return query(
+        start_month=start_month,
+        end_month=end_month,
+        type_=args.type_,
+        path=args.path.split('/') if args.path else None,
+        level=args.level,
+        rollup=args.rollup,
+        top_n=args.top,
+        transactions=args.transactions
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """query CLI 진입점"""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+    except ConfigError as e:
+        print(e, file=sys.stderr)
+        return 2
+    # 로드/조회 중 진행 상황 출력은 stderr로 보내고 stdout에는 조회 결과만 출력
+    with redirect_stdout(sys.stderr):
+        load_cube(config)
+
+    if not args.interactive:
+        with redirect_stdout(sys.stderr):
+            result = _query_from_args(args, config)
+        print(result.to_string())
+        return 0
+
+    # 대화형: 같은 인자 형식으로 한 줄씩 조회 (집계는 재사용, 같은 조회는 캐시에서 반환)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            line_args = parser.parse_args(shlex.split(line))
+            with redirect_stdout(sys.stderr):
+                result = _query_from_args(line_args, config)
+            print(result.to_string())
+        except SystemExit:
+            continue
+        except (KeyError, ValueError) as e:
+            print(f'조회 실패: {e}', file=sys.stderr)
+    print(f'query cache: {_execute_query.cache_info()}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
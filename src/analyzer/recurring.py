@@ -0,0 +1,191 @@
+"""
+prepro 거래 이력에서 정기결제(구독, 고정 월납/연납)를 찾는 모듈
+
+(구성원, 결제수단, 정규화된 내용)별 일 단위 결제를 날짜순으로 정렬한 뒤,
+결제 간격과 금액 변동 통계를 전체 그룹에 대해 한 번에(정렬 + bincount/reduceat) 계산합니다.
+파티션 단위로 일별 결제만 남겨서 모으므로 여러 해, 여러 구성원의 이력도 한 번에 올리지 않습니다.
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import date
+from typing import Any, Dict, Iterable
+
+from dateutil.relativedelta import relativedelta
+
+MERCHANT_KEYS = ['member', '결제수단', '가맹점']
+# 주기 이름: (최소 간격(일), 최대 간격(일), 다음 결제까지 개월 수, 최소 결제 횟수, 미결제 유예 기간(일))
+CADENCES = {
+    '월간': (25, 35, 1, 3, 7),
+    '연간': (350, 380, 12, 2, 30),
+}
+
+
+def normalize_merchant(content: pd.Series) -> pd.Series:
+    """
+    같은 가맹점의 표기 차이를 없앤 내용 (NFC 정규화, 괄호 안 부가정보/승인번호 제거, 공백 정리, 소문자)
+
+    Example:
+        '넷플릭스 ', 'NETFLIX(정기결제)', '넷플릭스 20250105' -> '넷플릭스', 'netflix', '넷플릭스'
+    """
+    # 같은 내용이 반복되므로 고유값만 정규화한 뒤 원래 위치로 펼침
+    codes, uniques = pd.factorize(content.fillna(''))
+    normalized = pd.Series(uniques, dtype=str).str.normalize('NFC').str.casefold()
+    normalized = normalized.str.replace(r'\(.*?\)|\[.*?\]', ' ', regex=True)
+    normalized = normalized.str.replace(r'(?:^|\s)[\d*#-]{4,}(?=\s|$)', ' ', regex=True)
+    normalized = normalized.str.replace(r'\s+', ' ', regex=True).str.strip()
+    return pd.Series(normalized.to_numpy()[codes], index=content.index)
+
+
+def _reduce_daily(charges: pd.DataFrame) -> pd.DataFrame:
+    """(구성원, 결제수단, 가맹점, 날짜)별로 금액을 합산하고 내용/대분류/소분류는 그날 마지막 거래 값을 사용"""
+    group_ids = charges.groupby(MERCHANT_KEYS + ['날짜'], sort=False).ngroup().to_numpy()
+    # 문자열 컬럼의 groupby 'last' 대신 그룹별 마지막 행 위치로 한 번에 추출
+    last_rows = pd.Series(np.arange(len(charges))).groupby(group_ids).max().to_numpy()
+    daily = charges.iloc[last_rows].reset_index(drop=True)
+    daily['금액'] = np.bincount(group_ids, weights=charges['금액'].to_numpy(dtype='float64'))
+    return daily
+
+
+def collect_daily_charges(partitions: Iterable[pd.DataFrame], end_date: date) -> pd.DataFrame:
+    """
+    prepro 파티션들에서 지출 거래를 (구성원, 결제수단, 가맹점, 날짜)별 일 결제로 줄여서 모음
+
+    Args:
+        partitions: prepro 데이터 파티션 iterator (예: iter_prepro 결과)
+        end_date: 이 날짜 이전(미포함)의 거래만 사용
+
+    Returns:
+        pd.DataFrame: MERCHANT_KEYS + 날짜 순으로 정렬된 일 결제 (금액은 양수, 내용/대분류/소분류는 그날 마지막 거래)
+    """
+    frames = []
+    for df in partitions:
+        expense = df[df['타입'].isin(['지출', '이체']) & (df['금액'] < 0)]
+        if len(expense) == 0:
+            continue
+        charges = pd.DataFrame({
+            'member': expense['member'],
+            '결제수단': expense['결제수단'].fillna(''),
+            '가맹점': normalize_merchant(expense['내용']),
+            '날짜': pd.to_datetime(expense['날짜']).dt.normalize(),
+            '금액': -expense['금액'],
+            '내용': expense['내용'],
+            '대분류': expense['대분류'].fillna(''),
+            '소분류': expense['소분류'].fillna(''),
+        })
+        charges = charges[(charges['가맹점'] != '') & (charges['날짜'] < pd.Timestamp(end_date))]
+        if len(charges) > 0:
+            frames.append(_reduce_daily(charges))
+
+    if not frames:
+        return pd.DataFrame()
+    # 같은 날 결제가 여러 파티션에 나뉘어 있을 수 있으므로 한 번 더 합산한 뒤 가맹점/날짜순 정렬
+    daily = _reduce_daily(pd.concat(frames, ignore_index=True)) if len(frames) > 1 else frames[0]
+    return daily.sort_values(MERCHANT_KEYS + ['날짜'], kind='stable').reset_index(drop=True)
+
+
+def detect_recurring_payments(partitions: Iterable[pd.DataFrame], config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    거래 이력에서 월간/연간 주기로 비슷한 금액이 결제되는 정기결제를 찾는 함수
+
+    Args:
+        partitions: prepro 데이터 파티션 iterator (member 컬럼 포함)
+        config: 설정 딕셔너리
+            - target_month: 분석 대상 월 (이 달 말일까지의 이력 사용, 미결제 판정 기준일)
+            - recurring.regularity: 주기 구간 안에 드는 결제 간격의 최소 비율 (기본값: 0.75)
+            - recurring.amount_tolerance: 같은 금액으로 볼 직전 결제 대비 변동률 (기본값: 0.1)
+
+    Returns:
+        pd.DataFrame: 정기결제 목록 (주기, 최근/다음 결제일, 최근 가격 변경, 상태, 월환산금액 내림차순)
+    """
+    recurring_config = config.get('recurring') or {}
+    regularity = recurring_config.get('regularity', 0.75)
+    amount_tolerance = recurring_config.get('amount_tolerance', 0.1)
+
+    target_month = config['target_month'].replace(day=1)
+    end_date = target_month + relativedelta(months=1)
+    as_of = pd.Timestamp(end_date) - pd.Timedelta(days=1)
+
+    charges = collect_daily_charges(partitions, end_date)
+    if len(charges) == 0:
+        print('detect_recurring_payments: 지출 이력이 없습니다.')
+        return pd.DataFrame()
+
+    # 정렬된 일 결제에서 그룹 경계와 직전 결제 대비 간격/금액 변동을 한 번에 계산
+    codes = charges.groupby(MERCHANT_KEYS, sort=False).ngroup().to_numpy()
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+    counts = ends - starts + 1
+    pairs = counts - 1
+
+    days = charges['날짜'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    amounts = charges['금액'].to_numpy(dtype='float64')
+    has_prev = np.r_[False, codes[1:] == codes[:-1]]
+    interval = np.where(has_prev, np.diff(days, prepend=days[0]), np.nan)
+    prev_amount = np.where(has_prev, np.r_[np.nan, amounts[:-1]], np.nan)
+    with np.errstate(all='ignore'):
+        changed = has_prev & (np.abs(amounts - prev_amount) > amount_tolerance * prev_amount)
+
+    group_count = len(starts)
+    median_interval = pd.Series(interval).groupby(codes).median().to_numpy()
+    change_count = np.bincount(codes, weights=changed, minlength=group_count)
+    # 가격 변경이 한 번 있어도 정기결제로 보되, 변경이 잦으면 제외
+    amount_stable = change_count <= np.maximum(1, np.floor((1 - regularity) * pairs))
+
+    cadence = np.full(group_count, '', dtype=object)
+    for name, (min_days, max_days, _, min_count, _) in CADENCES.items():
+        in_window = has_prev & (interval >= min_days) & (interval <= max_days)
+        with np.errstate(all='ignore'):
+            regular = np.bincount(codes, weights=in_window, minlength=group_count) / pairs >= regularity
+        matched = (
+            (cadence == '') & (counts >= min_count) & regular & amount_stable &
+            (median_interval >= min_days) & (median_interval <= max_days)
+        )
+        cadence[matched] = name
+
+    # 그룹별 최근 가격 변경 위치 (변경이 없으면 -1)
+    change_pos = np.maximum.reduceat(np.where(changed, np.arange(len(codes)), -1), starts)
+
+    result = charges.loc[ends, MERCHANT_KEYS + ['내용', '대분류', '소분류']].reset_index(drop=True)
+    result['주기'] = cadence
+    result['결제횟수'] = counts
+    result['첫결제일'] = charges['날짜'].to_numpy()[starts]
+    result['최근결제일'] = charges['날짜'].to_numpy()[ends]
+    result['간격중앙값(일)'] = median_interval
+    result['최근금액'] = amounts[ends]
+
+    has_change = change_pos >= 0
+    safe_pos = np.where(has_change, change_pos, 0)
+    result['가격변경일'] = pd.Series(charges['날짜'].to_numpy()[safe_pos]).where(has_change)
+    result['변경전금액'] = np.where(has_change, prev_amount[safe_pos], np.nan)
+    result['변경후금액'] = np.where(has_change, amounts[safe_pos], np.nan)
+    # 출력 엑셀의 회계 형식(#,##0)에서도 보이도록 퍼센트 단위
+    result['변동률(%)'] = (result['변경후금액'] / result['변경전금액'] - 1) * 100
+
+    result = result[result['주기'] != ''].reset_index(drop=True)
+    if len(result) == 0:
+        print('detect_recurring_payments: 정기결제로 판정된 결제가 없습니다.')
+        return result
+
+    # 주기별로 다음 결제 예정일(월 단위 이동, 말일 보정)과 월환산금액 계산
+    next_date = pd.Series(pd.NaT, index=result.index, dtype='datetime64[ns]')
+    grace = pd.Series(0, index=result.index)
+    months = pd.Series(1, index=result.index)
+    for name, (_, _, cadence_months, _, grace_days) in CADENCES.items():
+        mask = result['주기'] == name
+        next_date[mask] = result.loc[mask, '최근결제일'] + pd.DateOffset(months=cadence_months)
+        grace[mask] = grace_days
+        months[mask] = cadence_months
+    result['다음결제예정일'] = next_date
+    result['상태'] = np.where(as_of > next_date + pd.to_timedelta(grace, unit='D'), '미결제', '활성')
+    result['월환산금액'] = result['최근금액'] / months
+
+    for column in ['첫결제일', '최근결제일', '가격변경일', '다음결제예정일']:
+        result[column] = result[column].dt.date
+    result = result.rename(columns={'가맹점': '가맹점(정규화)'})
+    # 활성 -> 미결제 순, 같은 상태 안에서는 월환산금액이 큰 순서
+    result = result.sort_values(['상태', '월환산금액'], ascending=[False, False]).reset_index(drop=True)
+
+    print(f'detect_recurring_payments: {group_count}개 가맹점 중 정기결제 {len(result)}건 '
+          f'(가격 변경 {int(result["가격변경일"].notna().sum())}건, 미결제 {int((result["상태"] == "미결제").sum())}건)')
+    return result
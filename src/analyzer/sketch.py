@@ -0,0 +1,104 @@
+"""
+병합 가능한 분위수 스케치 (merging t-digest) 모듈
+
+스케치는 (centroid 평균 배열, centroid 가중치 배열) 튜플로 표현합니다.
+월별/파티션별로 만든 스케치를 merge_sketches로 합치면 원본 거래를 다시 읽지 않고
+여러 달에 걸친 중앙값, p90 등의 분위수를 근사할 수 있습니다.
+"""
+
+import numpy as np
+from typing import Iterable, Optional, Tuple
+
+Sketch = Tuple[np.ndarray, np.ndarray]
+
+# 압축 계수: 클수록 centroid가 많아지고 정확도가 올라감 (centroid 수는 대략 compression 이하)
+DEFAULT_COMPRESSION = 100
+
+
+def _compress(means: np.ndarray, weights: np.ndarray, compression: float) -> Sketch:
+    """
+    정렬된 centroid들을 t-digest k1 scale function 기준으로 묶어서 압축
+
+    Args:
+        means: centroid 평균 배열
+        weights: centroid 가중치 배열
+        compression: 압축 계수
+
+    Returns:
+        Sketch: 압축된 (평균, 가중치)
+    """
+    order = np.argsort(means, kind='stable')
+    means = means[order]
+    weights = weights[order]
+
+    # centroid 수가 압축 계수 이하이면 그대로 유지 (작은 노드는 정확한 분위수)
+    if len(means) <= compression:
+        return means, weights
+
+    # 각 centroid 중심의 누적 분위 -> k 값 -> 같은 정수 k 구간끼리 하나의 centroid로 병합
+    total = weights.sum()
+    q_mid = (np.cumsum(weights) - weights / 2) / total
+    k = compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+    cluster = np.floor(k).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+
+    merged_weights = np.add.reduceat(weights, starts)
+    merged_means = np.add.reduceat(means * weights, starts) / merged_weights
+    return merged_means, merged_weights
+
+
+def build_sketch(values: Iterable[float], compression: float = DEFAULT_COMPRESSION) -> Sketch:
+    """
+    금액 값들로부터 분위수 스케치를 생성
+
+    Args:
+        values: 금액 값 (NaN은 무시)
+        compression: 압축 계수
+
+    Returns:
+        Sketch: (평균, 가중치) 튜플
+    """
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    return _compress(values, np.ones(len(values)), compression)
+
+
+def merge_sketches(sketches: Iterable[Optional[Sketch]], compression: float = DEFAULT_COMPRESSION) -> Sketch:
+    """
+    여러 스케치를 하나로 병합
+
+    Args:
+        sketches: 병합할 스케치들 (None은 무시)
+        compression: 압축 계수
+
+    Returns:
+        Sketch: 병합된 스케치
+    """
+    sketches = [s for s in sketches if s is not None]
+    if not sketches:
+        return np.empty(0), np.empty(0)
+    if len(sketches) == 1:
+        return sketches[0]
+    means = np.concatenate([s[0] for s in sketches])
+    weights = np.concatenate([s[1] for s in sketches])
+    return _compress(means, weights, compression)
+
+
+def sketch_quantile(sketch: Optional[Sketch], q: float) -> float:
+    """
+    스케치에서 분위수를 계산 (가중치가 모두 1이면 numpy의 linear 보간과 동일)
+
+    Args:
+        sketch: 분위수 스케치
+        q: 0~1 사이 분위
+
+    Returns:
+        float: 분위수 값 (빈 스케치는 NaN)
+    """
+    if sketch is None or len(sketch[0]) == 0:
+        return np.nan
+    means, weights = sketch
+    # 각 centroid가 차지하는 순위 구간의 중심 (0부터 시작하는 순위 기준)
+    centers = np.cumsum(weights) - weights / 2 - 0.5
+    rank = q * (weights.sum() - 1)
+    return float(np.interp(rank, centers, means))
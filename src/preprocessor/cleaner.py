@@ -2,13 +2,21 @@
 DataFrame 데이터 정제 및 전처리 모듈
 """
 
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import date, datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import os
 import glob
+import unicodedata
 from pathlib import Path
 
+# prepro CSV의 계층 컬럼은 파일/chunk마다 추론 결과가 달라지지 않도록 문자열로 고정
+PREPRO_DTYPES = {'month': str, 'member': str, '타입': str, '대분류': str, '소분류': str, '내용': str, '결제수단': str}
+PREPRO_SAMPLE_ROWS = 1000
+# member 컬럼이 없는 이전 prepro 파일의 행에 채우는 구성원 이름
+UNKNOWN_MEMBER = '미지정'
+
 
 def convert_datetime64_to_datetime(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -58,17 +66,25 @@ def convert_datetime64_to_datetime(df: pd.DataFrame) -> pd.DataFrame:
     return result_df
 
 
-def save_file(df: pd.DataFrame, config: Dict[str, Any], file_type: str = 'temp') -> bool:
+def save_file(
+    df: pd.DataFrame,
+    config: Dict[str, Any],
+    file_type: str = 'temp',
+    date_str: Optional[str] = None
+) -> bool:
     """
-    DataFrame을 파일 확장자에 따라 CSV 또는 Excel로 저장합니다.
+    DataFrame을 파일 확장자에 따라 CSV, Excel 또는 pickle로 저장합니다.
 
     Args:
         df (pd.DataFrame): 저장할 DataFrame
         config (Dict[str, Any]): 설정 딕셔너리
-        file_type (str): 저장할 파일 타입 ('temp', 'prepro', 'output')
+        file_type (str): 저장할 파일 타입 ('temp', 'prepro', 'agg', 'profile')
             - 'temp': temp_path, temp_file_name 설정 사용
             - 'prepro': prepro_path, prepro_file_name 설정 사용
-            - 'output': output_path, output_file_name 설정 사용
+            - 'agg': agg_path, agg_file_name 설정 사용 (월별 부분 집계 저장소)
+            - 'profile': profile_path, profile_file_name 설정 사용 (월별 일자 누적 곡선 저장소)
+            최종 출력 파일(output_file_name)은 src.analyzer.exporter의 export_sheet/write_outputs로 저장
+        date_str (Optional[str]): prepro/agg/profile 파일명의 {date}에 들어갈 yyyymm (기본값: target_month)
 
     Returns:
         bool: 저장 성공 여부
@@ -77,6 +93,7 @@ def save_file(df: pd.DataFrame, config: Dict[str, Any], file_type: str = 'temp')
         파일 확장자에 따라 자동으로 저장 형식 결정:
         - .csv: CSV 형식으로 저장
         - .xlsx, .xls: Excel 형식으로 저장
+        - .pkl: pickle 형식으로 저장 (인덱스와 스케치 등 object 컬럼 유지)
 
     Example:
         # 임시 파일로 저장 (CSV)
@@ -84,9 +101,6 @@ def save_file(df: pd.DataFrame, config: Dict[str, Any], file_type: str = 'temp')
 
         # 전처리 파일로 저장 (CSV)
         success = save_file(df, config, 'prepro')
-
-        # 최종 출력 파일로 저장 (Excel)
-        success = save_file(df, config, 'output')
     """
     target_month_str = config['target_month'] # yyyy-mm-dd
     try:
@@ -95,20 +109,18 @@ def save_file(df: pd.DataFrame, config: Dict[str, Any], file_type: str = 'temp')
             base_path = config['temp_path']
             file_name_template = config['temp_file_name']
             current_date = datetime.now().strftime("%Y%m_%H%M") # yyyymm_hhmm
-        elif file_type == 'prepro':
-            base_path = config['prepro_path']
-            file_name_template = config['prepro_file_name']
+        elif file_type in ('prepro', 'agg', 'profile'):
+            base_path = config[f'{file_type}_path']
+            file_name_template = config[f'{file_type}_file_name']
             # target_month_str이 이미 datetime.date 객체이므로 바로 포맷팅
-            if isinstance(target_month_str, str):
+            if date_str is not None:
+                current_date = date_str
+            elif isinstance(target_month_str, str):
                 target_date = datetime.strptime(target_month_str, '%Y-%m-%d')
                 current_date = target_date.strftime('%Y%m')
             else:
                 # 이미 datetime.date 객체인 경우
                 current_date = target_month_str.strftime('%Y%m')
-        elif file_type == 'output':
-            base_path = config['output_path']
-            file_name_template = config['output_file_name']
-            current_date = None
         else:
             print(f"지원하지 않는 file_type입니다: {file_type}")
             return False
@@ -137,6 +149,10 @@ def save_file(df: pd.DataFrame, config: Dict[str, Any], file_type: str = 'temp')
                 header=True, sheet_name='processed_data'
             )
             print(f'  - Excel 저장 완료: {file_path}')
+        elif file_extension == '.pkl':
+            # pickle 파일로 저장 (MultiIndex 유지)
+            df.to_pickle(file_path)
+            print(f'  - pickle 저장 완료: {file_path}')
         else:
             # 기본값: CSV로 저장
             df.to_csv(file_path, index=False, encoding='utf-8-sig')
@@ -150,38 +166,80 @@ def save_file(df: pd.DataFrame, config: Dict[str, Any], file_type: str = 'temp')
         raise
 
 
-def read_prepro(config: Dict[str, Any]) -> Optional[pd.DataFrame]:
-    """config의 prepro_path에서 prepro_file_name 패턴에 맞는 모든 CSV 파일을 읽어서 concat합니다."""
-    try:
-        prepro_path = config['prepro_path']
-        prepro_file_pattern = config['prepro_file_name']
+def extract_file_date(file_path: str, file_name_template: str) -> str:
+    """파일명 템플릿(예: prepro_{date}.csv)과 실제 파일 경로에서 {date} 부분(yyyymm)을 추출합니다."""
+    prefix, suffix = file_name_template.split('{date}')
+    file_name = os.path.basename(file_path)
+    return file_name[len(prefix):len(file_name) - len(suffix)]
 
-        # {date} 패턴을 glob 패턴으로 변경 (예: prepro_*.csv)
-        glob_pattern = prepro_file_pattern.replace('{date}', '*')
-        search_pattern = os.path.join(prepro_path, glob_pattern)
 
-        print(f'read_prepro: prepro 파일을 검색합니다.')
-        print(f'  - 검색 경로: {prepro_path}')
-        print(f'  - 파일 패턴: {glob_pattern}')
+def get_store_file_path(config: Dict[str, Any], file_type: str, date_str: str) -> str:
+    """prepro/agg/profile 저장소에서 해당 월(yyyymm) 파일의 경로를 반환합니다."""
+    file_name = config[f'{file_type}_file_name'].replace('{date}', date_str)
+    return os.path.join(config[f'{file_type}_path'], file_name)
 
-        # 패턴에 맞는 파일 찾기
-        matching_files = glob.glob(search_pattern)
-        matching_files.sort()  # 파일명 순으로 정렬
 
-        if not matching_files:
-            print(f'  - 매칭되는 파일이 없습니다: {search_pattern}')
-            return None
+def find_prepro_files(
+    config: Dict[str, Any],
+    caller: str = 'read_prepro',
+    handoff: Optional[Dict[str, pd.DataFrame]] = None
+) -> List[str]:
+    """
+    config의 prepro_path에서 prepro_file_name 패턴에 맞는 파일 경로를 파일명 순으로 반환합니다.
+
+    handoff 월(yyyymm)의 파일은 아직 저장 중이거나 저장 전이어도 같은 순서 위치에 포함합니다.
+    """
+    prepro_path = config['prepro_path']
+    prepro_file_pattern = config['prepro_file_name']
+
+    # {date} 패턴을 glob 패턴으로 변경 (예: prepro_*.csv)
+    glob_pattern = prepro_file_pattern.replace('{date}', '*')
+    search_pattern = os.path.join(prepro_path, glob_pattern)
 
+    print(f'{caller}: prepro 파일을 검색합니다.')
+    print(f'  - 검색 경로: {prepro_path}')
+    print(f'  - 파일 패턴: {glob_pattern}')
+
+    # 패턴에 맞는 파일 찾기
+    matching_files = set(glob.glob(search_pattern))
+    matching_files.update(get_store_file_path(config, 'prepro', date_str) for date_str in handoff or {})
+    matching_files = sorted(matching_files)  # 파일명 순으로 정렬
+
+    if not matching_files:
+        print(f'  - 매칭되는 파일이 없습니다: {search_pattern}')
+    else:
         print(f'  - 찾은 파일 수: {len(matching_files)}개')
+    return matching_files
+
+
+def read_prepro(
+    config: Dict[str, Any],
+    handoff: Optional[Dict[str, pd.DataFrame]] = None
+) -> Optional[pd.DataFrame]:
+    """
+    config의 prepro_path에서 prepro_file_name 패턴에 맞는 모든 CSV 파일을 읽어서 concat합니다.
+
+    handoff(yyyymm: as_prepro_frame 결과)에 있는 월은 파일을 다시 읽지 않고 메모리의 DataFrame을 사용합니다.
+    """
+    try:
+        handoff = handoff or {}
+        matching_files = find_prepro_files(config, handoff=handoff)
+        if not matching_files:
+            return None
 
         # 각 파일을 DataFrame으로 읽기
         dataframes = []
         for file_path in matching_files:
             file_name = os.path.basename(file_path)
+            date_str = extract_file_date(file_path, config['prepro_file_name'])
+            if date_str in handoff:
+                print(f'  - 메모리에서 전달받음: {file_name} {handoff[date_str].shape}')
+                dataframes.append(handoff[date_str])
+                continue
             print(f'  - 파일 읽는 중: {file_name}')
 
             try:
-                df_temp = pd.read_csv(file_path, encoding='utf-8-sig')
+                df_temp = fill_member_column(pd.read_csv(file_path, encoding='utf-8-sig', dtype=PREPRO_DTYPES))
                 dataframes.append(df_temp)
                 print(f'    파일 읽기 성공: {df_temp.shape}')
             except Exception as e:
@@ -208,6 +266,172 @@ def read_prepro(config: Dict[str, Any]) -> Optional[pd.DataFrame]:
         raise
 
 
+def iter_prepro(
+    config: Dict[str, Any],
+    memory_limit_mb: Optional[float] = None,
+    handoff: Optional[Dict[str, pd.DataFrame]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    prepro 파일들을 한 번에 모두 올리지 않고 파티션 단위로 읽어서 반환합니다.
+
+    Args:
+        config (Dict[str, Any]): 설정 딕셔너리
+        memory_limit_mb (Optional[float]): 파티션 하나가 사용할 수 있는 메모리 한도 (MB)
+            - None: 파일 하나를 하나의 파티션으로 읽음
+            - 값 지정: 파일 앞부분으로 행당 메모리를 추정하여 한도 이내의 행 수로 나누어 읽음
+        handoff (Optional[Dict[str, pd.DataFrame]]): 파일 대신 사용할 월별 DataFrame (yyyymm: as_prepro_frame 결과)
+
+    Yields:
+        pd.DataFrame: prepro 데이터 파티션 (read_prepro와 동일한 dtype)
+    """
+    handoff = handoff or {}
+    matching_files = find_prepro_files(config, caller='iter_prepro', handoff=handoff)
+
+    for file_path in matching_files:
+        date_str = extract_file_date(file_path, config['prepro_file_name'])
+        if date_str in handoff:
+            # 이미 메모리에 있는 월은 그대로 하나의 파티션으로 사용
+            yield handoff[date_str]
+        else:
+            yield from read_prepro_file_chunks(file_path, memory_limit_mb)
+
+
+def read_prepro_file_chunks(file_path: str, memory_limit_mb: Optional[float] = None) -> Iterator[pd.DataFrame]:
+    """
+    prepro 파일 하나를 메모리 한도 이내의 chunk로 나누어 읽습니다.
+
+    read_prepro와 같이 읽을 수 없는 파일(열기 실패, 형식 오류)은 건너뜁니다.
+    chunk를 이미 반환한 뒤 중간에 실패하면 파일 일부만 집계되지 않도록 예외를 그대로 발생시킵니다.
+
+    Args:
+        file_path (str): prepro CSV 파일 경로
+        memory_limit_mb (Optional[float]): chunk 하나가 사용할 수 있는 메모리 한도 (MB, None이면 파일 전체)
+
+    Yields:
+        pd.DataFrame: prepro 데이터 chunk
+    """
+    file_name = os.path.basename(file_path)
+
+    if not memory_limit_mb:
+        print(f'  - 파일 읽는 중: {file_name}')
+        try:
+            df = pd.read_csv(file_path, encoding='utf-8-sig', dtype=PREPRO_DTYPES)
+        except Exception as e:
+            print(f'    X 파일 읽기 실패 ({file_name}): {e}')
+            return
+        yield fill_member_column(df)
+        return
+
+    # 샘플로 행당 메모리 사용량을 추정하여 chunk 크기 결정
+    try:
+        df_sample = pd.read_csv(file_path, encoding='utf-8-sig', dtype=PREPRO_DTYPES, nrows=PREPRO_SAMPLE_ROWS)
+    except Exception as e:
+        print(f'    X 파일 읽기 실패 ({file_name}): {e}')
+        return
+    if len(df_sample) == 0:
+        return
+    bytes_per_row = df_sample.memory_usage(deep=True).sum() / len(df_sample)
+    chunk_rows = max(1, int(memory_limit_mb * 1024 * 1024 / bytes_per_row))
+    print(f'  - 파일 읽는 중: {file_name} (chunk {chunk_rows}행)')
+
+    with pd.read_csv(
+        file_path, encoding='utf-8-sig', dtype=PREPRO_DTYPES, chunksize=chunk_rows
+    ) as reader:
+        for chunk in reader:
+            yield fill_member_column(chunk)
+
+
+def as_prepro_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    clean_data 결과를 prepro CSV를 다시 읽은 것과 같은 계층 컬럼 dtype으로 맞춥니다.
+
+    저장한 prepro 파일을 다시 읽지 않고 집계/정기결제 탐지에 바로 넘겨줄 때(hand-off) 사용하며,
+    결측값은 그대로 두고 나머지 값만 문자열로 바꿔서 read_csv(dtype=PREPRO_DTYPES)와 같은 그룹 키를 만듭니다.
+
+    Args:
+        df (pd.DataFrame): clean_data 결과
+
+    Returns:
+        pd.DataFrame: PREPRO_DTYPES 컬럼이 문자열로 변환된 DataFrame (member 결측은 UNKNOWN_MEMBER)
+    """
+    result_df = df.copy()
+    for col in PREPRO_DTYPES:
+        if col in result_df.columns:
+            values = result_df[col]
+            result_df[col] = values.astype(str).where(values.notna())
+    return fill_member_column(result_df)
+
+
+def fill_member_column(df: pd.DataFrame) -> pd.DataFrame:
+    """member 컬럼이 없거나 비어 있는 행(구성원 구분 이전의 prepro 파일)을 UNKNOWN_MEMBER로 채웁니다."""
+    if 'member' not in df.columns:
+        df['member'] = UNKNOWN_MEMBER
+    elif df['member'].isna().any():
+        df['member'] = df['member'].fillna(UNKNOWN_MEMBER)
+    return df
+
+
+def get_file_member(file_name: str, members: Optional[Dict[str, str]] = None) -> str:
+    """
+    입력 파일의 가구 구성원 이름을 반환합니다.
+
+    Args:
+        file_name (str): 입력 파일명 (예: 홍길동_2025-01-01~2025-12-31.xlsx)
+        members (Optional[Dict[str, str]]): config의 members (파일명: 구성원 이름)
+
+    Returns:
+        str: members에 지정된 이름, 없으면 파일명의 첫 '_' 앞부분 (예: 홍길동)
+
+    Note:
+        macOS에서 복사한 파일명은 한글 자모가 분리된(NFD) 형태일 수 있으므로 NFC로 맞춰서 비교합니다.
+    """
+    normalized = {unicodedata.normalize('NFC', k): v for k, v in (members or {}).items()}
+    file_name = unicodedata.normalize('NFC', file_name)
+    if file_name in normalized:
+        return str(normalized[file_name])
+    return Path(file_name).stem.split('_')[0]
+
+
+def build_filter_masks(
+    df: pd.DataFrame,
+    target_month: date,
+    target_month_next: date,
+    income_sources: List[str],
+    payment_methods: List[str],
+    exclude_large_cat: List[str]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    clean_data의 필터 규칙을 원본 DataFrame에 대해 boolean mask로 평가합니다.
+
+    Args:
+        df (pd.DataFrame): 원본 가계부 데이터 (복사하지 않음)
+        target_month (date): 분석 시작일
+        target_month_next (date): 분석 종료일 (미포함)
+        income_sources (List[str]): 포함할 수입 대분류 리스트
+        payment_methods (List[str]): 포함할 결제수단 리스트
+        exclude_large_cat (List[str]): 제외할 대분류 카테고리 리스트
+
+    Returns:
+        Tuple[np.ndarray, ...]: (기간, 카테고리, 수입, 지출/이체) 규칙별 mask
+    """
+    dates = pd.to_datetime(df['날짜'])
+    mask_period = (
+        (dates >= pd.Timestamp(target_month)) &
+        (dates < pd.Timestamp(target_month_next))
+    ).to_numpy()
+    mask_category = ~df['대분류'].isin(exclude_large_cat).to_numpy()
+    mask_income = (
+        (df['타입'] == '수입') &
+        (df['대분류'].isin(income_sources))
+    ).to_numpy()
+    mask_expense = (
+        (df['타입'].isin(['지출', '이체'])) &
+        (df['결제수단'].isin(payment_methods))
+    ).to_numpy()
+
+    return mask_period, mask_category, mask_income, mask_expense
+
+
 def clean_data(config: Dict[str, Any]) -> pd.DataFrame:
     """
     Excel 파일을 읽어서 가계부 데이터를 정제하고 필터링한 후 CSV로 저장합니다.
@@ -226,6 +450,7 @@ def clean_data(config: Dict[str, Any]) -> pd.DataFrame:
             - payment_methods: 포함할 결제수단 리스트
             - exclude_large_cat: 제외할 대분류 카테고리 리스트
             - target_month: 분석 시작 날짜 (YYYY-MM-DD 문자열)
+            - members: 입력 파일별 구성원 이름 (선택, 없으면 파일명의 첫 '_' 앞부분)
 
     Returns:
         pd.DataFrame: 정제되고 필터링된 가계부 데이터
@@ -233,14 +458,13 @@ def clean_data(config: Dict[str, Any]) -> pd.DataFrame:
     Process:
         0. 파일 경로 생성 및 Excel 파일 읽기
         1. config에서 설정값들 추출 및 날짜 변환
-        2. 필요한 컬럼만 추출
-        3. datetime 컬럼을 date 타입으로 변환
-        4. 지정된 기간의 데이터만 필터링
-        5. 제외할 대분류 카테고리 제거
-        6. 수입 데이터 필터링 (타입='수입', 대분류 in income_sources)
-        7. 지출 데이터 필터링 (타입 in ['지출','이체'], 결제수단 in payment_methods)
-        8. 수입과 지출 데이터 합치기
-        9. 전처리된 데이터를 CSV 파일로 저장
+        2. 필터 규칙을 단일 mask로 평가
+           - 지정된 기간의 데이터만 유지
+           - 제외할 대분류 카테고리 제거
+           - 수입 데이터 (타입='수입', 대분류 in income_sources)
+           - 지출 데이터 (타입 in ['지출','이체'], 결제수단 in payment_methods)
+        3. 수입 -> 지출 순서로 필요한 컬럼과 행을 한 번에 추출 (month, 원본 파일의 member 컬럼 추가)
+        4. datetime 컬럼을 date 타입으로 변환
     """
 
     # Step 0: 파일 경로 생성 및 Excel 파일 읽기
@@ -256,6 +480,7 @@ def clean_data(config: Dict[str, Any]) -> pd.DataFrame:
     print(f'  - 시트명: {sheet_name}')
 
     dataframes = []
+    file_members = []
     for file_name in input_file_names:
         input_file_path = os.path.join(config['input_path'], file_name)
         print(f'  - 파일 경로: {input_file_path}')
@@ -263,7 +488,8 @@ def clean_data(config: Dict[str, Any]) -> pd.DataFrame:
         try:
             df_temp = pd.read_excel(input_file_path, sheet_name=sheet_name)
             dataframes.append(df_temp)
-            print(f'    파일 읽기 성공: {df_temp.shape}')
+            file_members.append(get_file_member(file_name, config.get('members')))
+            print(f'    파일 읽기 성공: {df_temp.shape} (구성원: {file_members[-1]})')
         except Exception as e:
             print(f'    X 파일 읽기 실패: {e}')
             raise
@@ -275,6 +501,8 @@ def clean_data(config: Dict[str, Any]) -> pd.DataFrame:
     else:
         df = pd.concat(dataframes, axis=0, ignore_index=True)
         print(f'  - 다중 파일 병합 완료: {df.shape}')
+    # 병합된 행 순서대로 원본 파일의 구성원 이름 (concat 순서와 동일)
+    row_members = np.repeat(np.array(file_members, dtype=object), [len(d) for d in dataframes])
 
     # Step 1: config에서 설정값들 추출
     print('clean_data: config에서 설정값들을 추출합니다.')
@@ -297,9 +525,8 @@ def clean_data(config: Dict[str, Any]) -> pd.DataFrame:
     else:
         target_month_next = target_month_next.replace(month=target_month_next.month + 1)
 
-    # target_month 컬럼을 yyyy-mm 형식으로 추가
+    # target_month 컬럼은 최종 추출 이후에 yyyy-mm 형식으로 추가
     target_month_yyyy_mm = target_month.strftime('%Y-%m')
-    df['month'] = target_month_yyyy_mm
 
     print(f'  - 분석 기간: {target_month} ~ {target_month_next}')
     print(f'  - 컬럼: {len(column_names)}개')
@@ -307,52 +534,36 @@ def clean_data(config: Dict[str, Any]) -> pd.DataFrame:
     print(f'  - 결제수단: {payment_methods}')
     print(f'  - 제외 카테고리: {exclude_large_cat}')
 
-    # Step 1: 컬럼 서브셋 생성 - 분석에 필요한 컬럼만 추출 (target_month 컬럼 포함)
-    print(f'clean_data: raw xlsx을 {column_names + ["month"]} 으로 subset 합니다.')
-    df_clnd = df[column_names + ["month"]]
-    print(f'  - 원본 {df.shape} - 서브셋 {df_clnd.shape}')
-
-    # Step 2: datetime 컬럼을 date 타입으로 변환
+    # Step 2: 필터 규칙을 하나의 boolean mask로 컴파일 - 원본 프레임을 복사하지 않고 한 번만 평가
+    print('clean_data: 필터 규칙(기간/제외 카테고리/수입원/결제수단)을 단일 mask로 평가합니다.')
+    mask_period, mask_category, mask_income, mask_expense = build_filter_masks(
+        df, target_month, target_month_next, income_sources, payment_methods, exclude_large_cat
+    )
+    mask_base = mask_period & mask_category
+    mask_in = mask_base & mask_income
+    mask_out = mask_base & mask_expense
+
+    # 규칙별 제외 건수 로그 (기존 단계별 로그와 동일한 건수)
+    original_count = len(df)
+    period_count = int(mask_period.sum())
+    base_count = int(mask_base.sum())
+    print(f'  - 기간 필터링: {original_count}건 - {period_count}건')
+    print(f'  - 카테고리 필터링: {period_count}건 - {base_count}건')
+    print(f'  - 수입 데이터: {int(mask_in.sum())}건')
+    print(f'  - 지출/이체 데이터: {int(mask_out.sum())}건')
+
+    # Step 3: 수입 -> 지출 순서로 행 위치를 모아 필요한 컬럼과 함께 한 번에 추출
+    print(f'clean_data: raw xlsx에서 {column_names + ["month", "member"]} 컬럼으로 최종 추출합니다.')
+    row_positions = np.concatenate([np.flatnonzero(mask_in), np.flatnonzero(mask_out)])
+    column_positions = [df.columns.get_loc(col) for col in column_names]
+    df_concat = df.iloc[row_positions, column_positions].reset_index(drop=True)
+    df_concat['month'] = target_month_yyyy_mm
+    df_concat['member'] = row_members[row_positions]
+    print(f'  - 원본 {df.shape} - 추출 {df_concat.shape}')
+
+    # Step 4: datetime 컬럼을 date 타입으로 변환 (필터링된 행에만 수행)
     print('clean_data: datetime64[ns] - datetime.date 변환을 수행합니다.')
-    df_clnd = convert_datetime64_to_datetime(df_clnd)
-
-    # Step 3: 대상 기간 필터링 - 지정된 월 범위의 데이터만 유지
-    print(f'clean_data: target date만 남깁니다. {target_month} ~ {target_month_next}')
-    original_count = len(df_clnd)
-    df_clnd = df_clnd[
-        (df_clnd['날짜'] >= target_month) &
-        (df_clnd['날짜'] < target_month_next)
-    ].copy()
-    print(f'  - 기간 필터링: {original_count}건 - {len(df_clnd)}건')
-
-    # Step 4: 제외 대분류 카테고리 필터링
-    print(f'clean_data: 대분류 카테고리가 {exclude_large_cat}인 케이스를 제거합니다.')
-    category_filtered_count = len(df_clnd)
-    df_clnd = df_clnd[
-        (df_clnd['대분류'].isin(exclude_large_cat) == False)
-    ].copy()
-    print(f'  - 카테고리 필터링: {category_filtered_count}건 - {len(df_clnd)}건')
-
-    # Step 5: 수입 데이터 필터링 - 지정된 수입원만 포함
-    print(f'clean_data: 수입이 {income_sources}인 케이스만 남깁니다.')
-    df_in = df_clnd[
-        (df_clnd['타입'] == '수입') &
-        (df_clnd['대분류'].isin(income_sources))
-    ].copy()
-    print(f'  - 수입 데이터: {len(df_in)}건')
-
-    # Step 6: 지출/이체 데이터 필터링 - 지정된 결제수단만 포함
-    print(f'clean_data: {payment_methods}로 지출한 내역과 이체만 남깁니다.')
-    df_out = df_clnd[
-        (df_clnd['타입'].isin(['지출', '이체'])) &
-        (df_clnd['결제수단'].isin(payment_methods))
-    ].copy()
-    print(f'  - 지출/이체 데이터: {len(df_out)}건')
-
-    # Step 7: 수입과 지출 데이터 합치기
-    print('clean_data: 수입과 지출 데이터를 합칩니다.')
-    df_concat = pd.concat([df_in, df_out], axis=0)
-    df_concat = df_concat.reset_index(drop=True)
+    df_concat = convert_datetime64_to_datetime(df_concat)
 
     print(f'clean_data: 최종 정제 완료. 총 {len(df_concat)}건의 데이터')
 
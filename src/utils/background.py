@@ -0,0 +1,95 @@
+"""
+파이프라인 단계 사이의 파일 I/O를 계산과 겹쳐 실행하는 background executor 모듈
+
+- prepro 저장, asset.xlsx 읽기, 이력 파티션/일자 누적 곡선 미리 읽기처럼 다음 계산과 독립적인 I/O를
+  크기가 제한된 thread pool에서 실행합니다.
+- 결과와 예외는 호출한 쪽이 정한 지점(result, wait_all)에서 제출 순서대로 확인하므로,
+  I/O가 끝나는 순서와 관계없이 실행 순서와 오류 전달이 항상 같습니다.
+- background_io.enabled가 false면 submit 시점에 바로 실행하여 기존 순차 실행과 동일하게 동작합니다.
+- 이 모듈은 표준 라이브러리만 import합니다.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_MAX_WORKERS = 2
+_DONE = object()
+
+
+class BackgroundIO:
+    """
+    크기가 제한된 thread pool에 I/O 작업을 제출하고 제출 순서대로 결과를 확인하는 executor
+
+    Example:
+        with BackgroundIO(max_workers=2) as background:
+            asset = background.submit(create_asset_pivot, config)
+            ...  # 계산
+            pdf_asset = asset.result()  # 예외는 여기서 그대로 전달
+    """
+
+    def __init__(self, enabled: bool = True, max_workers: Optional[int] = None):
+        self.enabled = enabled
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or DEFAULT_MAX_WORKERS) if enabled else None
+        self._futures: List[Future] = []
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """작업을 제출 (비활성화 상태면 바로 실행하고, 예외도 기존 순차 실행처럼 바로 발생)"""
+        if self._executor is None:
+            future = Future()
+            future.set_result(fn(*args, **kwargs))
+        else:
+            future = self._executor.submit(fn, *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def prefetch(self, iterable: Iterable[Any]) -> Iterator[Any]:
+        """
+        iterable을 순서대로 반환하면서 다음 항목 하나를 미리 읽음
+
+        항목을 만드는 next() 호출은 한 번에 하나만 실행되므로 generator도 그대로 사용할 수 있고,
+        미리 읽는 항목이 하나뿐이라 메모리 사용량은 순차 실행보다 파티션 하나만큼만 늘어납니다.
+        """
+        iterator = iter(iterable)
+        if self._executor is None:
+            yield from iterator
+            return
+
+        future = self._executor.submit(next, iterator, _DONE)
+        while True:
+            item = future.result()
+            if item is _DONE:
+                return
+            future = self._executor.submit(next, iterator, _DONE)
+            yield item
+
+    def wait_all(self) -> None:
+        """제출한 작업을 모두 기다리고 제출 순서상 첫 번째 예외를 발생 (나머지 작업도 끝까지 기다림)"""
+        error = None
+        for future in self._futures:
+            exception = future.exception()
+            if exception is not None and error is None:
+                error = exception
+        self._futures.clear()
+        if error is not None:
+            raise error
+
+    def shutdown(self) -> None:
+        """진행 중인 작업이 끝날 때까지 기다린 뒤 thread pool 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'BackgroundIO':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        # 메인 흐름의 예외가 있어도 쓰는 중인 파일이 잘리지 않도록 작업 완료까지 기다림
+        self.shutdown()
+
+
+def create_background_io(config: Dict[str, Any]) -> BackgroundIO:
+    """config의 background_io 설정(enabled, max_workers)으로 BackgroundIO 생성"""
+    background_config = config.get('background_io') or {}
+    return BackgroundIO(
+        enabled=background_config.get('enabled', False),
+        max_workers=background_config.get('max_workers')
+    )
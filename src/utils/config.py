@@ -0,0 +1,310 @@
+"""
+config.yaml 로드 / 검증 / 캐시 모듈
+
+- 파이프라인 시작 전에 타입이 지정된 스키마로 config를 검증하여, 잘못된 설정이 무거운 import나
+  데이터 처리 중간의 TypeError가 아닌 ConfigError로 바로 드러나도록 합니다.
+- 검증된 config는 원본 파일의 mtime/크기를 키로 pickle 캐시에 저장하므로, config가 바뀌지 않았다면
+  yaml 파싱과 검증을 건너뜁니다.
+- 이 모듈은 표준 라이브러리만 import합니다 (yaml은 캐시 미스일 때만 로드).
+"""
+
+import os
+import pickle
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CACHE_VERSION = 3
+EXECUTION_MODES = ('memory', 'chunked')
+ANOMALY_METHODS = ('mad', 'zscore')
+EXPORT_FORMATS = ('excel', 'parquet', 'csv', 'html')
+PERIOD_SUMMARIES = ('quarter', 'year', 'ytd')
+# 전처리/집계에서 직접 참조하는 컬럼 (column_names에 반드시 포함)
+REQUIRED_COLUMNS = ('날짜', '타입', '대분류', '소분류', '내용', '금액', '결제수단')
+
+
+class ConfigError(ValueError):
+    """config.yaml을 읽을 수 없거나 스키마와 맞지 않을 때 발생하는 예외"""
+
+
+@dataclass(frozen=True)
+class Field:
+    """config 항목 하나의 스키마"""
+    types: Tuple[type, ...]
+    required: bool = True
+    item_type: Optional[type] = None  # list 항목 타입
+    choices: Optional[Tuple[Any, ...]] = None
+    check: Optional[Callable[[Any], Optional[str]]] = None  # 추가 검증, 오류 메시지 반환
+    fields: Optional[Dict[str, 'Field']] = None  # dict 항목의 하위 스키마
+    default: Any = None  # 선택 항목이 없을 때 validate_config가 채우는 값
+
+
+def _check_template(value: str) -> Optional[str]:
+    return None if value.count('{date}') == 1 else "'{date}'를 정확히 한 번 포함해야 합니다"
+
+
+def _check_columns(value: List[str]) -> Optional[str]:
+    missing = [col for col in REQUIRED_COLUMNS if col not in value]
+    return f'필수 컬럼이 없습니다: {missing}' if missing else None
+
+
+def _check_positive(value: float) -> Optional[str]:
+    return None if value > 0 else '0보다 커야 합니다'
+
+
+def _check_non_negative(value: float) -> Optional[str]:
+    return None if value >= 0 else '0 이상이어야 합니다'
+
+
+def _check_ratio(value: float) -> Optional[str]:
+    return None if 0 < value <= 1 else '0보다 크고 1 이하여야 합니다'
+
+
+def _check_date(value: Any) -> Optional[str]:
+    if isinstance(value, date):
+        return None
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return f'YYYY-MM-DD 형식이어야 합니다 (현재: {value})'
+    return None
+
+
+def _check_quantiles(value: List[float]) -> Optional[str]:
+    invalid = [q for q in value if not 0 < q < 1]
+    return f'0과 1 사이여야 합니다: {invalid}' if invalid else None
+
+
+def _check_budgets(value: Dict[str, Any]) -> Optional[str]:
+    invalid = [k for k, v in value.items() if not isinstance(v, (int, float)) or isinstance(v, bool)]
+    return f'예산은 숫자여야 합니다: {invalid}' if invalid else None
+
+
+def _check_members(value: Dict[str, Any]) -> Optional[str]:
+    invalid = [k for k, v in value.items() if not isinstance(v, str) or not v]
+    return f'구성원 이름은 비어 있지 않은 문자열이어야 합니다: {invalid}' if invalid else None
+
+
+def _check_periods(value: List[str]) -> Optional[str]:
+    unknown = [p for p in value if p not in PERIOD_SUMMARIES]
+    return f'지원하지 않는 기간입니다: {unknown} (가능: {list(PERIOD_SUMMARIES)})' if unknown else None
+
+
+def _check_exporters(value: Dict[str, Any]) -> Optional[str]:
+    format_lists = [value.get('default', [])] + list((value.get('sheets') or {}).values())
+    used = [f for formats in format_lists for f in ([formats] if isinstance(formats, str) else formats or [])]
+    unknown = sorted(set(used) - set(EXPORT_FORMATS))
+    return f'지원하지 않는 출력 형식입니다: {unknown} (가능: {list(EXPORT_FORMATS)})' if unknown else None
+
+
+CONFIG_SCHEMA: Dict[str, Field] = {
+    'target_month': Field((date, str)),
+    'input_path': Field((str,)),
+    'output_path': Field((str,)),
+    'temp_path': Field((str,)),
+    'prepro_path': Field((str,)),
+    'agg_path': Field((str,), required=False, default='data/agg'),
+    'chart_path': Field((str,), required=False, default='data/chart'),
+    'profile_path': Field((str,), required=False, default='data/profile'),
+    'input_file_names': Field((list, str), item_type=str),
+    'members': Field((dict,), required=False, check=_check_members),
+    'member_summary': Field((bool,), required=False),
+    'sheet_name': Field((str,)),
+    'asset_file_name': Field((str,)),
+    'column_names': Field((list,), item_type=str, check=_check_columns),
+    'payment_methods': Field((list,), item_type=str),
+    'income_sources': Field((list,), item_type=str),
+    'exclude_large_cat': Field((list,), item_type=str),
+    'execution_mode': Field((str,), required=False, choices=EXECUTION_MODES),
+    'memory_limit_mb': Field((int, float), required=False, check=_check_positive),
+    'background_io': Field((dict,), required=False, fields={
+        'enabled': Field((bool,), required=False),
+        'max_workers': Field((int,), required=False, check=_check_positive),
+    }),
+    'quantiles': Field((list,), required=False, item_type=float, check=_check_quantiles),
+    'anomaly': Field((dict,), required=False, fields={
+        'window_months': Field((int,), required=False, check=_check_positive),
+        'min_history_months': Field((int,), required=False, check=_check_positive),
+        'method': Field((str,), required=False, choices=ANOMALY_METHODS),
+        'threshold': Field((float,), required=False, check=_check_positive),
+        'min_change': Field((float,), required=False, check=_check_non_negative),
+    }),
+    'budgets': Field((dict,), required=False, check=_check_budgets),
+    'recurring': Field((dict,), required=False, fields={
+        'enabled': Field((bool,), required=False),
+        'regularity': Field((float,), required=False, check=_check_ratio),
+        'amount_tolerance': Field((float,), required=False, check=_check_non_negative),
+    }),
+    'projection': Field((dict,), required=False, fields={
+        'enabled': Field((bool,), required=False),
+        'history_months': Field((int,), required=False, check=_check_positive),
+        'as_of': Field((date, str), required=False, check=_check_date),
+    }),
+    'period_summaries': Field((list,), required=False, item_type=str, check=_check_periods),
+    'chart': Field((dict,), required=False, fields={
+        'enabled': Field((bool,), required=False),
+        'trend_months': Field((int,), required=False, check=_check_positive),
+        'max_workers': Field((int,), required=False, check=_check_positive),
+        'font_family': Field((list, str), required=False, item_type=str),
+    }),
+    'output_file_name': Field((str,)),
+    'exporters': Field((dict,), required=False, check=_check_exporters),
+    'temp_file_name': Field((str,), check=_check_template),
+    'prepro_file_name': Field((str,), check=_check_template),
+    'agg_file_name': Field((str,), required=False, check=_check_template, default='agg_{date}.pkl'),
+    'profile_file_name': Field((str,), required=False, check=_check_template, default='profile_{date}.pkl'),
+}
+
+
+def _is_instance(value: Any, types: Tuple[type, ...]) -> bool:
+    """bool은 int의 하위 타입이므로 숫자 항목에서 제외하고, int는 float 항목으로 허용"""
+    if isinstance(value, bool):
+        return bool in types
+    if float in types and isinstance(value, int):
+        return True
+    return isinstance(value, types)
+
+
+def _validate_fields(values: Dict[str, Any], schema: Dict[str, Field], prefix: str, errors: List[str]) -> None:
+    """
+    스키마의 항목을 검증하여 오류 메시지를 errors에 추가 (하위 스키마가 있는 dict 항목은 재귀적으로 검증)
+
+    Args:
+        values: 검증할 mapping (config 또는 config의 dict 항목)
+        schema: 항목 이름별 Field
+        prefix: 오류 메시지의 항목 이름 앞에 붙일 경로 (예: 'anomaly.')
+        errors: 오류 메시지 리스트
+    """
+    for key, field in schema.items():
+        name = prefix + key
+        if values.get(key) is None:
+            if field.required:
+                errors.append(f'{name}: 필수 항목이 없습니다')
+            continue
+
+        value = values[key]
+        if not _is_instance(value, field.types):
+            expected = ' 또는 '.join(t.__name__ for t in field.types)
+            errors.append(f'{name}: {expected} 타입이어야 합니다 (현재: {type(value).__name__})')
+            continue
+        if field.item_type is not None and isinstance(value, list):
+            invalid = [v for v in value if not _is_instance(v, (field.item_type,))]
+            if invalid:
+                errors.append(f'{name}: 항목은 {field.item_type.__name__} 타입이어야 합니다: {invalid}')
+                continue
+        if field.choices is not None and value not in field.choices:
+            errors.append(f'{name}: {list(field.choices)} 중 하나여야 합니다 (현재: {value})')
+            continue
+        if field.check is not None:
+            message = field.check(value)
+            if message:
+                errors.append(f'{name}: {message}')
+        if field.fields is not None:
+            _validate_fields(value, field.fields, f'{name}.', errors)
+
+
+def validate_config(config: Any) -> Dict[str, Any]:
+    """
+    config를 스키마로 검증하고 정규화된 복사본을 반환
+
+    Args:
+        config: yaml에서 읽은 config
+
+    Returns:
+        Dict[str, Any]: 검증된 config (target_month는 date, input_file_names는 리스트로 정규화,
+            없는 선택 항목 중 기본값이 있는 항목(agg_path 등 저장소 경로)은 기본값으로 채움)
+
+    Raises:
+        ConfigError: 모든 오류를 모아서 한 번에 보고
+    """
+    if not isinstance(config, dict):
+        raise ConfigError(f'config는 key: value 형식의 mapping이어야 합니다 (현재: {type(config).__name__})')
+
+    errors = []
+    _validate_fields(config, CONFIG_SCHEMA, '', errors)
+
+    result = dict(config)
+    target_month = config.get('target_month')
+    if isinstance(target_month, str):
+        try:
+            result['target_month'] = datetime.strptime(target_month, '%Y-%m-%d').date()
+        except ValueError:
+            errors.append(f'target_month: YYYY-MM-DD 형식이어야 합니다 (현재: {target_month})')
+    if isinstance(config.get('input_file_names'), str):
+        result['input_file_names'] = [config['input_file_names']]
+    # 검증을 통과한 config가 실행 중간에 KeyError로 실패하지 않도록, 항상 읽는 선택 항목은 기본값으로 채움
+    for key, field in CONFIG_SCHEMA.items():
+        if field.default is not None and result.get(key) is None:
+            result[key] = field.default
+
+    if errors:
+        raise ConfigError('config 검증 실패\n' + '\n'.join(f'  - {e}' for e in errors))
+    return result
+
+
+def _get_cache_path(config_path: str) -> str:
+    """config 파일 옆의 숨김 캐시 파일 경로 (예: config/.config.yaml.cache)"""
+    directory, file_name = os.path.split(os.path.abspath(config_path))
+    return os.path.join(directory, f'.{file_name}.cache')
+
+
+def load_config(config_path: str, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    config 파일을 읽고 검증하여 반환 (mtime/크기가 같으면 캐시 사용)
+
+    Args:
+        config_path: config.yaml 경로
+        use_cache: 캐시 사용 여부
+
+    Returns:
+        Dict[str, Any]: 검증된 config
+
+    Raises:
+        ConfigError: 파일이 없거나, 파싱에 실패했거나, 검증에 실패한 경우
+    """
+    try:
+        stat = os.stat(config_path)
+    except FileNotFoundError:
+        raise ConfigError(f'config 파일을 찾을 수 없습니다: {config_path}') from None
+
+    cache_key = (CACHE_VERSION, os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
+    cache_path = _get_cache_path(config_path)
+
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as file:
+                cached_key, cached_config = pickle.load(file)
+            if cached_key == cache_key:
+                return cached_config
+        except Exception:
+            # 손상되었거나 이전 버전의 캐시는 무시하고 다시 생성
+            pass
+
+    # 캐시 미스일 때만 yaml 로드
+    import yaml
+    try:
+        with open(config_path, 'r', encoding='utf-8') as file:
+            raw_config = yaml.safe_load(file)
+    except (yaml.YAMLError, ValueError) as e:
+        # ValueError: 2025-13-01처럼 날짜 형식이지만 존재하지 않는 날짜
+        raise ConfigError(f'YAML 파싱 오류: {e}') from None
+
+    config = validate_config(raw_config)
+
+    if use_cache:
+        try:
+            with open(cache_path, 'wb') as file:
+                pickle.dump((cache_key, config), file)
+        except OSError as e:
+            print(f'config 캐시 저장 실패 (무시): {e}')
+    return config
+
+
+def resolve_sheet_formats(config: Dict[str, Any], sheet_name: str) -> List[str]:
+    """시트에 적용할 출력 형식 리스트 (exporters.sheets.<시트명> -> exporters.default -> ['excel'])"""
+    exporter_config = config.get('exporters') or {}
+    sheet_formats = (exporter_config.get('sheets') or {}).get(sheet_name)
+    formats = sheet_formats if sheet_formats is not None else exporter_config.get('default', ['excel'])
+    if isinstance(formats, str):
+        formats = [formats]
+    return list(formats)
@@ -0,0 +1,90 @@
+"""테스트용 합성 가계부 데이터와 config"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+INCOME_SOURCES = ['급여', '상여금']
+PAYMENT_METHODS = ['카드A', '카드B']
+EXPENSE_CATEGORIES = {'식비': ['외식', '카페', '배달'], '교통': ['택시', '버스'], '쇼핑': ['온라인', '']}
+
+
+def make_raw_transactions(n: int = 600, seed: int = 0, start: str = '2025-08-01', days: int = 120) -> pd.DataFrame:
+    """뱅크샐러드 가계부 내역 시트와 같은 컬럼의 원본 데이터 (필터에 걸리는 행 포함)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days * 24 * 60, n), unit='min')
+    types = rng.choice(['수입', '지출', '이체'], n, p=[0.15, 0.75, 0.1])
+    large = np.where(
+        types == '수입',
+        rng.choice(INCOME_SOURCES + ['이자'], n),
+        rng.choice(list(EXPENSE_CATEGORIES) + ['미분류'], n)
+    )
+    small = [
+        rng.choice(EXPENSE_CATEGORIES[cat]) if cat in EXPENSE_CATEGORIES else ''
+        for cat in large
+    ]
+    amounts = np.where(types == '수입', 1, -1) * rng.integers(1, 200, n) * 1000
+    return pd.DataFrame({
+        '날짜': dates.normalize(),
+        '시간': dates.strftime('%H:%M'),
+        '타입': types,
+        '대분류': large,
+        '소분류': pd.Series(small).replace('', np.nan),
+        '내용': rng.choice(['가게1', '가게2', '가게3', '가게4'], n),
+        '금액': amounts,
+        '화폐': 'KRW',
+        '결제수단': rng.choice(PAYMENT_METHODS + ['현금'], n),
+        '메모': np.nan,
+    })
+
+
+def make_prepro(months, rows_per_month: int = 200, seed: int = 0, members=('가', '나')) -> pd.DataFrame:
+    """read_prepro 결과와 같은 형태의 여러 달 prepro 데이터"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for month in months:
+        start = pd.Timestamp(f'{month}-01')
+        days_in_month = start.days_in_month
+        n = rows_per_month
+        types = rng.choice(['수입', '지출', '이체'], n, p=[0.1, 0.8, 0.1])
+        large = np.where(types == '수입', rng.choice(INCOME_SOURCES, n), rng.choice(list(EXPENSE_CATEGORIES), n))
+        small = [rng.choice(EXPENSE_CATEGORIES[cat]) if cat in EXPENSE_CATEGORIES else '' for cat in large]
+        frames.append(pd.DataFrame({
+            '날짜': (start + pd.to_timedelta(rng.integers(0, days_in_month, n), unit='D')).strftime('%Y-%m-%d'),
+            '타입': types,
+            '대분류': large,
+            # 실제 prepro와 같이 소분류가 없으면 NaN ('' 는 계층 집계의 빈 하위 레벨과 겹침)
+            '소분류': pd.Series(small).replace('', np.nan),
+            '내용': rng.choice(['가게1', '가게2', '가게3'], n),
+            '금액': np.where(types == '수입', 1, -1) * rng.integers(1, 100, n) * 1000,
+            '결제수단': rng.choice(PAYMENT_METHODS, n),
+            'month': month,
+            'member': rng.choice(list(members), n),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """tmp_path 아래 저장소를 사용하는 최소 config"""
+    return {
+        'target_month': pd.Timestamp('2025-10-01').date(),
+        'input_path': str(tmp_path / 'input'),
+        'output_path': str(tmp_path / 'output'),
+        'temp_path': str(tmp_path / 'temp'),
+        'prepro_path': str(tmp_path / 'prepro'),
+        'agg_path': str(tmp_path / 'agg'),
+        'profile_path': str(tmp_path / 'profile'),
+        'input_file_names': ['가_2025.xlsx'],
+        'sheet_name': '가계부 내역',
+        'asset_file_name': 'asset.xlsx',
+        'column_names': ['날짜', '시간', '타입', '대분류', '소분류', '내용', '금액', '화폐', '결제수단', '메모'],
+        'payment_methods': PAYMENT_METHODS,
+        'income_sources': INCOME_SOURCES,
+        'exclude_large_cat': ['미분류'],
+        'output_file_name': 'output.xlsx',
+        'temp_file_name': 'temp_{date}.csv',
+        'prepro_file_name': 'prepro_{date}.csv',
+        'agg_file_name': 'agg_{date}.pkl',
+        'profile_file_name': 'profile_{date}.pkl',
+    }
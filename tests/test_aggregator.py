@@ -0,0 +1,111 @@
+import os
+import re
+
+import pandas as pd
+import pytest
+
+from src.analyzer.aggregator import (
+    HOUSEHOLD, create_hierarchical_summary, create_hierarchical_summary_from_partials, create_partial_summary,
+    fold_partials, iter_month_partials, save_month_partials
+)
+from src.preprocessor.cleaner import read_prepro, save_file
+from tests.conftest import make_prepro
+
+MONTHS = ['2025-07', '2025-08', '2025-09', '2025-10']
+QUANTILES = [0.5, 0.9]
+
+
+def _write_prepro(config, rows_per_month=80):
+    pdf = make_prepro(MONTHS, rows_per_month=rows_per_month, seed=3)
+    for month, df in pdf.groupby('month'):
+        save_file(df, config, 'prepro', date_str=month.replace('-', ''))
+    return pdf
+
+
+def test_category_totals_equal_transaction_sums():
+    pdf = make_prepro(MONTHS, rows_per_month=200, seed=6)
+    result = create_hierarchical_summary(pdf, by_member=True)
+    assert result.index.is_unique
+
+    # 소분류가 없는 거래(NaN)도 대분류 합계에 한 번만 포함
+    large = result[(result.index.get_level_values('대분류') != '') & (result.index.get_level_values('소분류') == '')]
+    large = large['금액합계'].droplevel(['소분류', '내용'])
+    # 이체는 지출로 집계
+    raw = pdf.assign(타입=pdf['타입'].replace('이체', '지출'))
+    by_member = raw.groupby(['month', 'member', '타입', '대분류'])['금액'].sum()
+    household = pd.concat({HOUSEHOLD: raw.groupby(['month', '타입', '대분류'])['금액'].sum()}, names=['member'])
+    expected = pd.concat([by_member, household.reorder_levels(by_member.index.names)])
+    pd.testing.assert_series_equal(
+        large.sort_index(), expected.sort_index(), check_names=False, check_index_type=False
+    )
+
+
+def test_chunked_equals_memory_when_limit_splits_months(config, capsys):
+    rows_per_month = 2000
+    _write_prepro(config, rows_per_month)
+
+    expected = create_hierarchical_summary(read_prepro(config), QUANTILES, by_member=True)
+    capsys.readouterr()
+
+    partials = iter_month_partials(config, memory_limit_mb=0.06, with_sketch=True, by_member=True)
+    result = create_hierarchical_summary_from_partials(partials, 0.06, QUANTILES)
+
+    chunk_rows = [int(n) for n in re.findall(r'chunk (\d+)행', capsys.readouterr().out)]
+    assert len(chunk_rows) == len(MONTHS)
+    assert all(n < rows_per_month for n in chunk_rows)
+    exact_columns = ['금액합계', '거래건수', '평균금액']
+    pd.testing.assert_frame_equal(
+        result[exact_columns], expected[exact_columns], check_index_type=False, check_column_type=False
+    )
+    # 분위수는 chunk별 스케치를 병합한 근사값
+    pd.testing.assert_frame_equal(
+        result.drop(columns=exact_columns), expected.drop(columns=exact_columns),
+        check_index_type=False, check_column_type=False, rtol=0.05
+    )
+
+
+def test_chunked_reuses_agg_store(config):
+    _write_prepro(config)
+    list(iter_month_partials(config, with_sketch=True))
+    agg_files = sorted(os.listdir(config['agg_path']))
+    assert len(agg_files) == len(MONTHS)
+
+    # prepro보다 최신인 저장소 파일은 그대로 사용
+    stored = list(iter_month_partials(config, with_sketch=True))
+    for agg_file, partial in zip(agg_files, stored):
+        pd.testing.assert_frame_equal(partial, pd.read_pickle(os.path.join(config['agg_path'], agg_file)))
+
+
+def test_memory_mode_partials_are_reused_by_chunked_mode(config):
+    pdf = _write_prepro(config)
+    partial = create_partial_summary(pdf, with_sketch=True, by_member=True)
+    assert save_month_partials(partial, config, skip={'202510'}) == len(MONTHS) - 1
+    assert save_month_partials(partial, config) == 1
+    assert save_month_partials(partial, config) == 0
+
+    stored = pd.concat(iter_month_partials(config, with_sketch=True, by_member=True))
+    pd.testing.assert_frame_equal(stored.sort_index(), partial.sort_index(), check_index_type=False)
+
+
+def test_fold_partials_raises_when_month_does_not_fit():
+    df = make_prepro(['2025-10'], rows_per_month=500, seed=4)
+    chunks = [create_partial_summary(chunk, with_sketch=True) for chunk in (df[:250], df[250:])]
+    with pytest.raises(MemoryError, match='memory_limit_mb'):
+        fold_partials(chunks, memory_limit_mb=0.001)
+
+
+def test_from_partials_rejects_non_contiguous_months():
+    df = make_prepro(['2025-09', '2025-10'], rows_per_month=50, seed=5)
+    partials = [create_partial_summary(df[df['month'] == month]) for month in ['2025-09', '2025-10', '2025-09']]
+    with pytest.raises(ValueError, match='2025-09'):
+        create_hierarchical_summary_from_partials(partials)
+
+
+def test_unreadable_prepro_file_is_skipped_in_both_modes(config):
+    _write_prepro(config)
+    with open(os.path.join(config['prepro_path'], 'prepro_202506.csv'), 'wb') as file:
+        file.write(b'')
+
+    expected = create_hierarchical_summary(read_prepro(config))
+    result = create_hierarchical_summary_from_partials(iter_month_partials(config, memory_limit_mb=0.005))
+    pd.testing.assert_frame_equal(result, expected, check_index_type=False, check_column_type=False)
@@ -0,0 +1,87 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from src.analyzer.aggregator import create_hierarchical_summary
+from src.analyzer.anomaly import detect_spending_anomalies
+from tests.conftest import make_prepro
+
+
+def _detect(pdf_prepro, config, **anomaly):
+    config['anomaly'] = {'window_months': 6, 'min_history_months': 1, 'threshold': 0.0, **anomaly}
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        return detect_spending_anomalies(create_hierarchical_summary(pdf_prepro), config)
+
+
+MONTHS = ['2025-04', '2025-05', '2025-06', '2025-07', '2025-08', '2025-09', '2025-10']
+
+
+def _make_spikes():
+    """외식은 target_month에 급증, 택시는 급감하고 나머지 달은 비슷한 금액인 prepro"""
+    eating_out = [100000, 110000, 90000, 105000, 95000, 100000, 500000]
+    taxi = [200000, 210000, 190000, 205000, 195000, 200000, 10000]
+    rows = []
+    for month, eating_out_amount, taxi_amount in zip(MONTHS, eating_out, taxi):
+        rows.append((f'{month}-10', '식비', '외식', '가게1', -eating_out_amount, month))
+        rows.append((f'{month}-12', '교통', '택시', '가게2', -taxi_amount, month))
+    pdf = pd.DataFrame(rows, columns=['날짜', '대분류', '소분류', '내용', '금액', 'month'])
+    return pdf.assign(타입='지출', 결제수단='카드A', member='가')
+
+
+def _node(result, large, small='', content=''):
+    rows = result[(result['대분류'] == large) & (result['소분류'] == small) & (result['내용'] == content)]
+    assert len(rows) == 1
+    return rows.iloc[0]
+
+
+@pytest.mark.parametrize('method', ['mad', 'zscore'])
+def test_spikes_are_flagged_with_direction(config, method):
+    result = _detect(_make_spikes(), config, method=method, threshold=3.0)
+
+    for small, content in [('', ''), ('외식', ''), ('외식', '가게1')]:
+        node = _node(result, '식비', small, content)
+        assert node['이상여부'] == '증가'
+        assert node['점수'] > 3
+    for small, content in [('', ''), ('택시', ''), ('택시', '가게2')]:
+        node = _node(result, '교통', small, content)
+        assert node['이상여부'] == '감소'
+        assert node['점수'] < -3
+
+
+def test_min_change_skips_small_spikes(config):
+    result = _detect(_make_spikes(), config, method='mad', threshold=3.0, min_change=1000000)
+    assert len(result) == 0
+
+
+def test_budget_key_matches_small_category_node(config):
+    config['budgets'] = {'식비/외식': 400000, '교통': 1000000}
+    result = _detect(_make_spikes(), config, method='mad', threshold=1000.0)
+
+    assert list(zip(result['대분류'], result['소분류'], result['내용'])) == [('식비', '외식', '')]
+    node = result.iloc[0]
+    assert (node['예산'], node['예산사용률(%)'], node['예산초과']) == (400000, 125.0, '초과')
+    assert node['이상여부'] == ''
+
+
+def test_nodes_without_history_do_not_warn(config):
+    pdf = make_prepro(['2025-08', '2025-09', '2025-10'], rows_per_month=60, seed=11)
+    # target_month에 처음 등장한 노드는 이력이 전부 NaN
+    new_node = pdf[pdf['month'] == '2025-10'].head(1).assign(대분류='여행', 소분류='항공', 내용='항공사', 타입='지출', 금액=-500000)
+    result = _detect(pd.concat([pdf, new_node], ignore_index=True), config, method='mad')
+
+    assert len(result) > 0
+    assert not (result['대분류'] == '여행').any()
+
+
+def test_undefined_spread_leaves_score_nan(config):
+    # 이력이 한 달뿐이면 표본 표준편차(ddof=1)를 계산할 수 없음
+    pdf = make_prepro(['2025-09', '2025-10'], rows_per_month=60, seed=12)
+    config['budgets'] = {'식비': 1}
+    result = _detect(pdf, config, method='zscore')
+
+    assert result['변동폭'].isna().all()
+    assert result['점수'].isna().all()
+    assert (result['이상여부'] == '').all()
+    assert (result['예산초과'] == '초과').any()
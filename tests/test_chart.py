@@ -0,0 +1,105 @@
+import os
+
+import pandas as pd
+import pytest
+
+import main
+from src.analyzer.aggregator import create_hierarchical_summary
+from src.analyzer.chart import build_chart_specs, hash_chart_data, render_charts
+from tests.conftest import make_prepro
+
+MONTHS = ['2025-07', '2025-08', '2025-09', '2025-10']
+
+
+@pytest.fixture(scope='module')
+def pdf_agg():
+    return create_hierarchical_summary(make_prepro(MONTHS, rows_per_month=40, seed=31))
+
+
+@pytest.fixture
+def pdf_asset():
+    index = pd.MultiIndex.from_tuples([('현금', '통장'), ('현금', '지갑'), ('투자', '주식')], names=['카테고리', '세부항목'])
+    return pd.DataFrame({'2025-09': [100, 10, 50], '2025-10': [120, 5, 70]}, index=index)
+
+
+@pytest.fixture
+def chart_config(config, tmp_path):
+    config['chart_path'] = str(tmp_path / 'chart')
+    config['chart'] = {'trend_months': 3, 'max_workers': 1, 'font_family': 'DejaVu Sans'}
+    return config
+
+
+def test_chart_specs(pdf_agg, pdf_asset, chart_config):
+    specs = {name: (kind, title, data) for name, kind, title, data in build_chart_specs(pdf_agg, pdf_asset, chart_config)}
+    assert list(specs) == ['monthly_trend', 'category_breakdown', 'asset_trend']
+
+    # 추이는 trend_months 개월, 지출은 절댓값
+    kind, title, trend = specs['monthly_trend']
+    assert (kind, list(trend.index)) == ('line', ['2025-08', '2025-09', '2025-10'])
+    expense = pdf_agg['금액합계'].loc[[('2025-10', '지출', '', '', '')]].item()
+    assert trend.loc['2025-10', '지출'] == -expense
+    assert '2025-08 ~ 2025-10' in title
+
+    # 대분류 비중은 target_month 지출 내림차순
+    breakdown = specs['category_breakdown'][2]['지출']
+    assert list(breakdown) == sorted(breakdown, reverse=True)
+    assert breakdown.sum() == -expense
+
+    # 자산은 카테고리별 합계 (월 x 카테고리)
+    asset_trend = specs['asset_trend'][2]
+    assert (asset_trend.loc['2025-10', '현금'], asset_trend.loc['2025-09', '투자']) == (125, 50)
+
+
+def test_asset_chart_skipped_without_assets(pdf_agg, chart_config):
+    names = [spec[0] for spec in build_chart_specs(pdf_agg, pd.DataFrame(), chart_config)]
+    assert names == ['monthly_trend', 'category_breakdown']
+
+
+def test_chart_hash_depends_on_data_and_title():
+    data = pd.DataFrame({'지출': [1.0, 2.0]}, index=['a', 'b'])
+    base = hash_chart_data('barh', '제목', data, 'DejaVu Sans')
+    assert base == hash_chart_data('barh', '제목', data.copy(), 'DejaVu Sans')
+    assert base != hash_chart_data('barh', '제목', data.assign(지출=[1.0, 3.0]), 'DejaVu Sans')
+    assert base != hash_chart_data('barh', '제목', data.set_axis(['a', 'c']), 'DejaVu Sans')
+    assert base != hash_chart_data('barh', '다른 제목', data, 'DejaVu Sans')
+    assert base != hash_chart_data('line', '제목', data, 'DejaVu Sans')
+
+
+def test_unchanged_charts_are_not_redrawn(pdf_agg, pdf_asset, chart_config, monkeypatch):
+    specs = build_chart_specs(pdf_agg, pdf_asset, chart_config)
+    first = render_charts(specs, chart_config)
+    assert all(os.path.exists(file_path) for _, file_path in first)
+
+    # 데이터가 같으면 process pool을 만들지 않고 캐시 파일을 그대로 반환
+    monkeypatch.setattr('src.analyzer.chart.ProcessPoolExecutor', _fail)
+    assert render_charts(specs, chart_config) == first
+
+
+def test_changed_chart_replaces_stale_file(pdf_agg, pdf_asset, chart_config):
+    specs = build_chart_specs(pdf_agg, pdf_asset, chart_config)
+    first = dict(render_charts(specs, chart_config))
+
+    # 자산 데이터만 바뀌면 asset_trend만 다시 그리고 이전 PNG는 지움
+    changed = build_chart_specs(pdf_agg, pdf_asset * 2, chart_config)
+    second = dict(render_charts(changed, chart_config))
+    assert second['monthly_trend'] == first['monthly_trend']
+    assert second['asset_trend'] != first['asset_trend']
+    assert sorted(os.listdir(chart_config['chart_path'])) == sorted(os.path.basename(path) for path in second.values())
+
+
+def test_charts_are_skipped_without_chart_path(config, pdf_agg, monkeypatch, capsys):
+    monkeypatch.setattr('src.analyzer.chart.render_charts', _fail)
+    main.run_charts(config, None, pdf_agg, None)
+    assert 'chart_path' in capsys.readouterr().out
+
+
+def test_chart_failure_does_not_raise(config, pdf_agg, tmp_path, monkeypatch, capsys):
+    config['chart_path'] = str(tmp_path / 'chart')
+    monkeypatch.setattr('src.analyzer.chart.render_charts', _fail)
+    monkeypatch.setattr('src.analyzer.exporter.export_charts', _fail)
+    main.run_charts(config, None, pdf_agg, None)
+    assert '차트 생성 실패' in capsys.readouterr().out
+
+
+def _fail(*args, **kwargs):
+    raise RuntimeError('차트를 그릴 수 없습니다')
@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessor.cleaner import build_filter_masks, clean_data
+from tests.conftest import make_raw_transactions
+
+
+def _chained_filter(df, config):
+    """단일 mask 도입 이전 clean_data의 단계별 필터 (기간 -> 제외 카테고리 -> 수입 / 지출, 수입 -> 지출 순 concat)"""
+    target_month = config['target_month']
+    target_month_next = (pd.Timestamp(target_month) + pd.DateOffset(months=1)).date()
+    dates = pd.to_datetime(df['날짜']).dt.date
+    df_clnd = df[(dates >= target_month) & (dates < target_month_next)]
+    df_clnd = df_clnd[df_clnd['대분류'].isin(config['exclude_large_cat']) == False]
+    df_in = df_clnd[(df_clnd['타입'] == '수입') & (df_clnd['대분류'].isin(config['income_sources']))]
+    df_out = df_clnd[(df_clnd['타입'].isin(['지출', '이체'])) & (df_clnd['결제수단'].isin(config['payment_methods']))]
+    return pd.concat([df_in, df_out], axis=0)
+
+
+def test_build_filter_masks_selects_same_rows_as_chained_filters(config):
+    df = make_raw_transactions(n=2000, seed=1)
+    target_month = config['target_month']
+    target_month_next = (pd.Timestamp(target_month) + pd.DateOffset(months=1)).date()
+
+    mask_period, mask_category, mask_income, mask_expense = build_filter_masks(
+        df, target_month, target_month_next,
+        config['income_sources'], config['payment_methods'], config['exclude_large_cat']
+    )
+    mask_base = mask_period & mask_category
+    row_positions = np.concatenate([
+        np.flatnonzero(mask_base & mask_income), np.flatnonzero(mask_base & mask_expense)
+    ])
+
+    expected = _chained_filter(df, config)
+    assert len(expected) > 0
+    np.testing.assert_array_equal(df.index[row_positions], expected.index)
+
+
+def test_clean_data_matches_chained_filters(config):
+    df = make_raw_transactions(n=500, seed=2)
+    os.makedirs(config['input_path'])
+    df.to_excel(os.path.join(config['input_path'], config['input_file_names'][0]),
+                sheet_name=config['sheet_name'], index=False)
+
+    result = clean_data(config)
+
+    expected = _chained_filter(df, config).reset_index(drop=True)
+    assert list(result.columns) == config['column_names'] + ['month', 'member']
+    assert (result['month'] == '2025-10').all()
+    assert (result['member'] == '가').all()
+    pd.testing.assert_series_equal(result['금액'], expected['금액'], check_dtype=False)
+    pd.testing.assert_series_equal(result['내용'], expected['내용'], check_dtype=False)
+    assert list(pd.to_datetime(result['날짜'])) == list(expected['날짜'])
@@ -0,0 +1,65 @@
+import pytest
+import yaml
+
+from src.utils.config import ConfigError, load_config, validate_config
+
+CONFIG_PATH = 'config/config.yaml'
+
+
+@pytest.fixture
+def raw_config():
+    with open(CONFIG_PATH, encoding='utf-8') as file:
+        return yaml.safe_load(file)
+
+
+def test_repo_config_is_valid():
+    config = load_config(CONFIG_PATH, use_cache=False)
+    assert config['anomaly']['method'] in ('mad', 'zscore')
+
+
+def test_nested_errors_are_reported_together(raw_config):
+    raw_config['anomaly']['method'] = 'foo'
+    raw_config['recurring']['regularity'] = 'high'
+    raw_config['background_io']['enabled'] = 'yes'
+    raw_config['chart']['max_workers'] = '3'
+    raw_config['memory_limit_mb'] = -1
+
+    with pytest.raises(ConfigError) as excinfo:
+        validate_config(raw_config)
+
+    message = str(excinfo.value)
+    for key in ['anomaly.method', 'recurring.regularity', 'background_io.enabled', 'chart.max_workers', 'memory_limit_mb']:
+        assert f'  - {key}:' in message
+    assert "['mad', 'zscore']" in message
+
+
+@pytest.mark.parametrize('section, key, value', [
+    ('anomaly', 'window_months', 0),
+    ('anomaly', 'threshold', -1.0),
+    ('anomaly', 'min_change', -1),
+    ('recurring', 'regularity', 1.5),
+    ('recurring', 'enabled', 1),
+    ('projection', 'history_months', 2.5),
+    ('projection', 'as_of', '2025-10'),
+    ('chart', 'trend_months', True),
+    ('chart', 'font_family', [1]),
+    ('background_io', 'max_workers', 0),
+])
+def test_nested_values_are_checked(raw_config, section, key, value):
+    raw_config[section][key] = value
+    with pytest.raises(ConfigError, match=f'{section}.{key}:'):
+        validate_config(raw_config)
+
+
+def test_nested_values_are_optional(raw_config):
+    raw_config['anomaly'] = {}
+    raw_config['projection'] = {'as_of': '2025-10-20'}
+    validate_config(raw_config)
+
+
+def test_store_paths_default_when_missing(raw_config):
+    for key in ['agg_path', 'chart_path', 'profile_path', 'agg_file_name', 'profile_file_name']:
+        del raw_config[key]
+    config = validate_config(raw_config)
+    assert (config['agg_path'], config['chart_path'], config['profile_path']) == ('data/agg', 'data/chart', 'data/profile')
+    assert (config['agg_file_name'], config['profile_file_name']) == ('agg_{date}.pkl', 'profile_{date}.pkl')
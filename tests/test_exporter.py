@@ -0,0 +1,93 @@
+import os
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from src.analyzer.exporter import create_output_session, export_sheet, get_output_file_path, write_outputs
+
+
+@pytest.fixture
+def export_config(config):
+    config['output_file_name'] = 'output_latest.xlsx'
+    config['exporters'] = {'default': ['excel'], 'sheets': {'summary': ['excel', 'html'], 'asset_summary': ['html']}}
+    return config
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError('엑셀 파일을 다시 열었습니다.')
+
+
+def test_sheets_are_written_in_one_session(export_config, monkeypatch):
+    monkeypatch.setattr('openpyxl.load_workbook', _fail)
+    monkeypatch.setattr('openpyxl.reader.excel.load_workbook', _fail)
+    processed = pd.DataFrame({'month': ['2025-10', '2025-09'], '금액합계': [-1234567, 890]})
+    summary = pd.DataFrame({'타입': ['지출', None], '금액합계': [-50000, None]})
+    asset = pd.DataFrame({'2025-10': [100]}, index=pd.Index(['현금'], name='카테고리'))
+
+    session = create_output_session(export_config)
+    export_sheet(processed, session, 'processed_data')
+    export_sheet(summary, session, 'summary')
+    export_sheet(asset, session, 'asset_summary', include_index=True)
+    output_file_path = os.path.join(export_config['output_path'], export_config['output_file_name'])
+    assert not os.path.exists(output_file_path)
+
+    assert write_outputs(session, font_size=15)
+    monkeypatch.undo()
+
+    wb = load_workbook(output_file_path)
+    assert wb.sheetnames == ['processed_data', 'summary']
+    cell = wb['processed_data']['B2']
+    assert (cell.value, cell.number_format, cell.font.sz) == (1234567, '#,##0', 15)
+    assert wb['summary']['B3'].value is None
+
+    with open(get_output_file_path(export_config, '.html'), encoding='utf-8') as file:
+        report = file.read()
+    assert report.count('<html') == 1
+    assert report.index('<!-- sheet:summary -->') < report.index('<!-- sheet:asset_summary -->')
+    assert '<!-- sheet:processed_data -->' not in report
+
+
+def test_new_session_discards_previous_outputs(export_config):
+    session = create_output_session(export_config)
+    export_sheet(pd.DataFrame({'a': [1]}), session, 'processed_data')
+    export_sheet(pd.DataFrame({'a': [2]}), session, 'summary')
+    write_outputs(session)
+
+    session = create_output_session(export_config)
+    export_sheet(pd.DataFrame({'a': [3]}), session, 'processed_data')
+    write_outputs(session)
+
+    wb = load_workbook(os.path.join(export_config['output_path'], export_config['output_file_name']))
+    assert wb.sheetnames == ['processed_data']
+    assert wb['processed_data']['A2'].value == 3
+    assert not os.path.exists(get_output_file_path(export_config, '.html'))
+
+
+def test_failed_save_is_raised(export_config, tmp_path):
+    # output_path가 디렉터리가 아닌 파일이면 저장 실패
+    output_path = tmp_path / 'not_a_dir'
+    output_path.write_text('')
+    export_config['output_path'] = str(output_path)
+    session = create_output_session(export_config)
+    export_sheet(pd.DataFrame({'a': [1]}), session, 'processed_data')
+
+    with pytest.raises(OSError):
+        write_outputs(session)
+
+
+def test_scores_keep_sign_and_decimals(export_config):
+    export_config['exporters'] = {'default': ['excel', 'html']}
+    alerts = pd.DataFrame({'지출금액': [-120000.0], '점수': [-3.456], '예산사용률(%)': [85.0]})
+    session = create_output_session(export_config)
+    export_sheet(alerts, session, 'spending_alerts')
+    write_outputs(session)
+
+    sheet = load_workbook(os.path.join(export_config['output_path'], export_config['output_file_name']))['spending_alerts']
+    assert (sheet['A2'].value, sheet['A2'].number_format) == (120000, '#,##0')
+    assert (sheet['B2'].value, sheet['B2'].number_format) == (-3.456, '0.00')
+    assert sheet['C2'].value == 85
+
+    with open(get_output_file_path(export_config, '.html'), encoding='utf-8') as file:
+        report = file.read()
+    assert '<td>-3.46</td>' in report
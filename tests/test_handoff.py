@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import main
+from src.analyzer.recurring import detect_recurring_payments
+from src.preprocessor.cleaner import iter_prepro, save_file
+from src.utils.background import BackgroundIO
+from tests.conftest import make_prepro, make_raw_transactions
+
+
+@pytest.fixture
+def pipeline_config(config):
+    # 이력 두 달 + hand-off 월(target_month)에 걸친 월간 구독
+    history = make_prepro(['2025-08', '2025-09'], rows_per_month=80, seed=31)
+    subscription = history.head(2).assign(
+        날짜=['2025-08-05', '2025-09-05'], 타입='지출', 대분류='쇼핑', 소분류='온라인', 내용='구독', 금액=-9900,
+        결제수단='카드A', member='가'
+    )
+    history = pd.concat([history, subscription.assign(month=subscription['날짜'].str[:7])], ignore_index=True)
+    for month, df in history.groupby('month'):
+        save_file(df, config, 'prepro', date_str=month.replace('-', ''))
+
+    raw = make_raw_transactions(n=400, seed=32).astype({'내용': object})
+    columns = ['날짜', '타입', '대분류', '소분류', '내용', '금액', '결제수단']
+    raw.loc[0, columns] = [pd.Timestamp('2025-10-05'), '지출', '쇼핑', '온라인', '구독', -9900, '카드A']
+    # 숫자로 읽히는 내용은 prepro CSV를 다시 읽으면 문자열이므로 hand-off 프레임도 같은 키여야 함
+    raw.loc[1, columns] = [pd.Timestamp('2025-10-06'), '지출', '쇼핑', '온라인', 12345, -5000, '카드B']
+    os.makedirs(config['input_path'])
+    raw.to_excel(
+        os.path.join(config['input_path'], config['input_file_names'][0]), sheet_name=config['sheet_name'], index=False
+    )
+    config['quantiles'] = [0.5, 0.9]
+    return config
+
+
+@pytest.mark.parametrize('background_enabled', [False, True])
+@pytest.mark.parametrize('mode', ['memory', 'chunked'])
+def test_handoff_output_equals_file_read(pipeline_config, tmp_path, mode, background_enabled):
+    config = dict(pipeline_config, execution_mode=mode)
+    with BackgroundIO(enabled=background_enabled) as background:
+        pdf_target, prepro_saved = main.run_cleaning(config, background)
+        handoff = {'202510': pdf_target}
+        member_handoff, agg_handoff, pdf_prepro = main.run_aggregation(config, handoff, background)
+        prepro_saved.result()
+        recurring_handoff = detect_recurring_payments(
+            main.get_history_partitions(config, pdf_prepro, handoff, background), config
+        )
+        background.wait_all()
+    # memory 모드는 집계에서 읽은 이력을 정기결제 탐지에 그대로 사용
+    assert (pdf_prepro is None) == (mode == 'chunked')
+    # hand-off 월은 prepro 파일이 저장 중이므로 agg 저장소에 쓰지 않음
+    assert sorted(os.listdir(config['agg_path'])) == ['agg_202508.pkl', 'agg_202509.pkl']
+
+    # 저장된 prepro 파일만으로 다시 계산 (agg 저장소도 새로 만듦)
+    config_files = dict(config, agg_path=str(tmp_path / 'agg_files'))
+    with BackgroundIO(enabled=False) as background:
+        member_files, agg_files, _ = main.run_aggregation(config_files, {}, background)
+    recurring_files = detect_recurring_payments(iter_prepro(config_files), config_files)
+
+    assert '2025-10' in agg_files.index.get_level_values('month')
+    assert '구독' in set(recurring_handoff['가맹점(정규화)'])
+    pd.testing.assert_frame_equal(member_handoff, member_files)
+    pd.testing.assert_frame_equal(agg_handoff, agg_files)
+    pd.testing.assert_frame_equal(recurring_handoff, recurring_files)
+
+
+def test_memory_mode_does_not_reread_history(pipeline_config, monkeypatch):
+    config = dict(pipeline_config, execution_mode='memory')
+    with BackgroundIO(enabled=False) as background:
+        pdf_target, _ = main.run_cleaning(config, background)
+        handoff = {'202510': pdf_target}
+        _, _, pdf_prepro = main.run_aggregation(config, handoff, background)
+
+        monkeypatch.setattr('src.preprocessor.cleaner.read_prepro_file_chunks', _fail_read)
+        partitions = main.get_history_partitions(config, pdf_prepro, handoff, background)
+        assert len(detect_recurring_payments(partitions, config)) > 0
+
+
+def _fail_read(*args, **kwargs):
+    raise AssertionError('prepro 이력을 다시 읽었습니다.')
+
+
+def test_prefetch_keeps_order_and_reads_one_item_ahead():
+    produced = []
+
+    def items():
+        for i in range(5):
+            produced.append(i)
+            yield i
+
+    with BackgroundIO(enabled=True) as background:
+        consumed = []
+        for item in background.prefetch(items()):
+            time.sleep(0.01)
+            consumed.append(item)
+            # 소비한 항목보다 최대 하나만 미리 읽음
+            assert len(produced) <= len(consumed) + 1
+    assert consumed == list(range(5))
+
+
+def test_errors_surface_in_submission_order():
+    release = threading.Event()
+
+    def slow_failure():
+        release.wait(1)
+        raise ValueError('first')
+
+    def fast_failure():
+        release.set()
+        raise KeyError('second')
+
+    with BackgroundIO(enabled=True, max_workers=2) as background:
+        background.submit(slow_failure)
+        background.submit(fast_failure)
+        with pytest.raises(ValueError, match='first'):
+            background.wait_all()
+
+
+def test_disabled_background_runs_inline():
+    calls = []
+    with BackgroundIO(enabled=False) as background:
+        future = background.submit(calls.append, 1)
+        assert calls == [1] and future.done()
+        with pytest.raises(ZeroDivisionError):
+            background.submit(lambda: 1 / 0)
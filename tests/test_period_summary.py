@@ -0,0 +1,86 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.analyzer.aggregator import (
+    PERIOD_LEVEL, create_hierarchical_summary, create_period_summary, get_comparison_periods, get_period_label
+)
+from tests.conftest import make_prepro
+
+TARGET_MONTH = date(2025, 10, 1)
+MONTHS = [f'{year}-{month:02d}' for year in (2024, 2025) for month in range(1, 13)]
+
+
+@pytest.fixture(scope='module')
+def pdf_agg():
+    return create_hierarchical_summary(make_prepro(MONTHS, rows_per_month=40, seed=21))
+
+
+def _expected_rollup(pdf_agg, months_by_label):
+    """기간 이름별 월 목록으로 월별 행을 직접 합산한 기대값"""
+    frames = {}
+    for label, months in months_by_label.items():
+        rows = pdf_agg[pdf_agg.index.get_level_values('month').isin(months)]
+        frames[label] = rows[['금액합계', '거래건수']].groupby(level=['타입', '대분류', '소분류', '내용']).sum()
+    return pd.concat(frames, names=[PERIOD_LEVEL])
+
+
+@pytest.mark.parametrize('period, months_by_label', [
+    # 진행 중인 분기/연도와 같은 개월 수만 합산
+    ('quarter', {
+        '2025-Q4 (10~10월)': ['2025-10'], '2025-Q3 (07~07월)': ['2025-07'],
+        '2024-Q4 (10~10월)': ['2024-10'], '2024-Q1 (01~01월)': ['2024-01'],
+    }),
+    ('year', {
+        '2025 (01~10월)': [f'2025-{m:02d}' for m in range(1, 11)],
+        '2024 (01~10월)': [f'2024-{m:02d}' for m in range(1, 11)],
+    }),
+    ('ytd', {
+        '2025-01~2025-10': [f'2025-{m:02d}' for m in range(1, 11)],
+        '2024-01~2024-10': [f'2024-{m:02d}' for m in range(1, 11)],
+    }),
+])
+def test_period_rollups_equal_monthly_sums(pdf_agg, period, months_by_label):
+    result = create_period_summary(pdf_agg, period, TARGET_MONTH)
+
+    # target_month 이후의 달과 기간 안에서 target_month의 위치보다 뒤의 달은 포함하지 않음
+    labels = set(result.index.get_level_values(PERIOD_LEVEL))
+    assert set(months_by_label) <= labels
+    if period != 'quarter':
+        assert labels == set(months_by_label)
+
+    result = result.loc[list(months_by_label)]
+    expected = _expected_rollup(pdf_agg, months_by_label).reindex(result.index)
+    pd.testing.assert_frame_equal(result[['금액합계', '거래건수']], expected, check_dtype=False)
+    pd.testing.assert_series_equal(
+        result['평균금액'], result['금액합계'] / result['거래건수'], check_names=False
+    )
+
+
+def test_period_summary_sorted_by_period_descending(pdf_agg):
+    periods = create_period_summary(pdf_agg, 'quarter', TARGET_MONTH).index.get_level_values(PERIOD_LEVEL).unique()
+    assert list(periods) == sorted(periods, reverse=True)
+    assert periods[0] == '2025-Q4 (10~10월)'
+
+
+def test_complete_periods_keep_plain_labels(pdf_agg):
+    # 분기/연도의 마지막 달이 target_month이면 모든 기간을 온전히 합산
+    result = create_period_summary(pdf_agg, 'quarter', date(2025, 9, 1)).loc[['2025-Q3']]
+    expected = _expected_rollup(pdf_agg, {'2025-Q3': ['2025-07', '2025-08', '2025-09']}).reindex(result.index)
+    pd.testing.assert_frame_equal(result[['금액합계', '거래건수']], expected, check_dtype=False)
+    assert get_comparison_periods('year', date(2024, 12, 1)) == ['2024', '2023']
+
+
+def test_comparison_periods():
+    assert get_comparison_periods('quarter', TARGET_MONTH) == ['2025-Q4 (10~10월)', '2025-Q3 (07~07월)']
+    assert get_comparison_periods('quarter', date(2025, 2, 1)) == ['2025-Q1 (01~02월)', '2024-Q4 (10~11월)']
+    assert get_comparison_periods('quarter', date(2025, 6, 1)) == ['2025-Q2', '2025-Q1']
+    assert get_comparison_periods('year', TARGET_MONTH) == ['2025 (01~10월)', '2024 (01~10월)']
+    assert get_comparison_periods('ytd', TARGET_MONTH) == ['2025-01~2025-10', '2024-01~2024-10']
+    assert get_period_label('2024-11', 'ytd', TARGET_MONTH) is None
+    assert get_period_label('2025-08', 'quarter', TARGET_MONTH) is None
+    assert get_period_label('2024-11', 'year', TARGET_MONTH) is None
+    assert get_period_label('2024-11', 'year') == '2024'
+    with pytest.raises(ValueError):
+        get_period_label('2025-01', 'week')
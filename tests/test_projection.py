@@ -0,0 +1,85 @@
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.analyzer.projection import add_projection_columns, get_projection_as_of, project_target_month
+from src.preprocessor.cleaner import save_file
+
+
+def _prepro(rows):
+    """(날짜, 대분류, 소분류, 금액) 목록으로 만든 prepro 데이터"""
+    df = pd.DataFrame(rows, columns=['날짜', '대분류', '소분류', '금액'])
+    return df.assign(
+        타입='지출', 내용='가게', 결제수단='카드A', month=df['날짜'].str[:7], member='가'
+    )
+
+
+@pytest.fixture
+def history(config):
+    for month in ['2025-07', '2025-08', '2025-09']:
+        rows = [(f'{month}-05', '식비', '외식', -10000), (f'{month}-20', '식비', '외식', -30000)]
+        if month == '2025-08':
+            rows.append((f'{month}-25', '교통', '택시', -6000))
+        save_file(_prepro(rows), config, 'prepro', date_str=month.replace('-', ''))
+    return config
+
+
+@pytest.fixture
+def target():
+    # 기준일(10일) 이후 거래는 실적에서 제외되어야 함
+    return _prepro([('2025-10-03', '식비', '외식', -20000), ('2025-10-15', '식비', '외식', -50000)])
+
+
+def test_projection_with_fixed_as_of(history, target):
+    history['projection'] = {'as_of': '2025-10-10', 'history_months': 6}
+    projection = project_target_month(target, history, today=date(2026, 1, 1))
+
+    assert projection.attrs['as_of'] == date(2025, 10, 10)
+    assert projection.loc[('지출', '식비', '외식', ''), '실적'] == -20000
+    # 실적 + 직전 3개월 11일~말일 지출 평균 (-30000)
+    assert projection.loc[('지출', '식비', '외식', ''), '예상'] == -50000
+    # 이력에만 있는 노드는 실적 0 + 평균 (-6000 / 3)
+    assert projection.loc[('지출', '교통', '택시', ''), '실적'] == 0
+    assert projection.loc[('지출', '교통', '택시', ''), '예상'] == pytest.approx(-2000)
+    assert projection.loc[('지출', '', '', ''), '예상'] == pytest.approx(-52000)
+
+    # 직전 개월 누적 곡선은 profile 저장소에 캐시
+    assert sorted(os.listdir(history['profile_path'])) == ['profile_202507.pkl', 'profile_202508.pkl', 'profile_202509.pkl']
+    cached = project_target_month(target, history, today=date(2026, 1, 1))
+    pd.testing.assert_frame_equal(cached, projection)
+
+
+def test_projection_without_history_is_linear(config, target):
+    config['projection'] = {'as_of': date(2025, 10, 10)}
+    projection = project_target_month(target, config, history_profiles=[])
+    assert projection.loc[('지출', '식비', '외식', ''), '예상'] == pytest.approx(-20000 * 31 / 10)
+
+
+def test_no_projection_for_past_month(config, target):
+    assert project_target_month(target, config, today=date(2025, 12, 15)) is None
+    # 기준일이 말일이거나 비활성화면 생략
+    config['projection'] = {'as_of': '2025-10-31'}
+    assert get_projection_as_of(target, config) is None
+    config['projection'] = {'enabled': False, 'as_of': '2025-10-10'}
+    assert get_projection_as_of(target, config) is None
+
+
+def test_as_of_defaults_to_last_transaction_in_current_month(config, target):
+    assert get_projection_as_of(target, config, today=date(2025, 10, 20)) == date(2025, 10, 15)
+    assert get_projection_as_of(target, config, today=date(2025, 10, 12)) == date(2025, 10, 12)
+
+
+def test_add_projection_columns(history, target):
+    history['projection'] = {'as_of': '2025-10-10'}
+    projection = project_target_month(target, history)
+    summary = pd.DataFrame({
+        '타입': ['지출', '지출'], '대분류': ['식비', '교통'], '소분류': ['', ''], '내용': ['', ''],
+        '금액합계_2025-10': [-70000, 0],
+    }, index=[3, 4])
+
+    result = add_projection_columns(summary, projection, '2025-10')
+    assert list(result.index) == [3, 4]
+    assert list(result['실적_2025-10(~10일)']) == [-20000, 0]
+    assert list(result['예상_2025-10']) == pytest.approx([-50000, -2000])
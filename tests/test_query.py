@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzer import query as query_module
+from src.analyzer.query import load_cube, query
+from src.preprocessor.cleaner import read_prepro, save_file
+from tests.conftest import make_prepro
+
+MONTHS = ['2025-08', '2025-09', '2025-10']
+
+
+@pytest.fixture
+def cube_config(config):
+    config['quantiles'] = [0.5, 0.9]
+    pdf = make_prepro(MONTHS, rows_per_month=60, seed=7)
+    for month, df in pdf.groupby('month'):
+        save_file(df, config, 'prepro', date_str=month.replace('-', ''))
+    load_cube(config)
+    yield config
+    query_module._STATE.update({'config': None, 'cube': None, 'partial': None, 'prepro': None})
+    query_module._execute_query.cache_clear()
+
+
+def test_rollup_sums_months_and_merges_sketches(cube_config):
+    result = query(start_month='2025-08', end_month='2025-10', type_='지출', level='대분류', rollup=True)
+
+    pdf = read_prepro(cube_config)
+    expense = pdf[pdf['타입'].isin(['지출', '이체'])]
+    assert result.index.get_level_values('대분류').is_unique
+    for large, row in zip(result.index.get_level_values('대분류'), result.to_dict('records')):
+        amounts = expense.loc[expense['대분류'] == large, '금액'].to_numpy(dtype=float)
+        assert row['금액합계'] == amounts.sum()
+        assert row['거래건수'] == len(amounts)
+        assert row['평균금액'] == pytest.approx(amounts.mean())
+        # 노드 거래 수가 압축 계수 이하라 병합한 스케치의 분위수도 정확함 (지출은 절댓값 기준 분위수)
+        assert row['금액_p50'] == pytest.approx(np.quantile(amounts, 0.5))
+        assert row['금액_p90'] == pytest.approx(np.quantile(amounts, 0.1))
+
+
+def test_rollup_without_quantiles_keeps_sum_columns(cube_config):
+    cube_config['quantiles'] = []
+    result = query(type_='수입', level='대분류', rollup=True)
+    assert list(result.columns) == ['금액합계', '거래건수', '평균금액']
+    assert list(result.index.names) == ['타입', '대분류', '소분류', '내용']
+    monthly = query(type_='수입', level='대분류')
+    expected = monthly['금액합계'].groupby(level='대분류').sum()
+    pd.testing.assert_series_equal(
+        result['금액합계'].droplevel(['타입', '소분류', '내용']), expected, check_index_type=False
+    )
+
+
+def test_load_cube_reuses_agg_store(cube_config, monkeypatch):
+    expected = query(type_='지출', level='소분류').copy()
+
+    # 저장소가 최신이면 prepro 파일을 다시 읽지 않음
+    def fail(*args, **kwargs):
+        raise AssertionError('prepro 파일을 다시 읽었습니다.')
+    monkeypatch.setattr('src.analyzer.aggregator.read_prepro_file_chunks', fail)
+    load_cube(cube_config)
+
+    pd.testing.assert_frame_equal(query(type_='지출', level='소분류'), expected)
+
+
+def test_transactions_load_prepro_on_first_use(cube_config):
+    assert query_module._STATE['prepro'] is None
+    result = query(start_month='2025-09', end_month='2025-09', type_='수입', transactions=True)
+    assert len(result) > 0
+    assert (result['month'] == '2025-09').all()
+    assert (result['타입'] == '수입').all()
+
+
+def test_cli_prints_only_result_to_stdout(cube_config, monkeypatch, capsys):
+    monkeypatch.setattr(query_module, 'load_config', lambda path: cube_config)
+    assert query_module.main(['--type', '지출', '--level', '대분류', '--rollup']) == 0
+
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert lines[0].split() == ['금액합계', '거래건수', '평균금액', '금액_p50', '금액_p90']
+    assert 'iter_month_partials' not in captured.out
+    assert 'iter_month_partials' in captured.err
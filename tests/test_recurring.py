@@ -0,0 +1,90 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.analyzer.recurring import detect_recurring_payments, normalize_merchant
+
+
+def _charges(content, dates, amounts, member='가', method='카드A', large='문화', small='OTT'):
+    if not isinstance(amounts, list):
+        amounts = [amounts] * len(dates)
+    return pd.DataFrame({
+        '날짜': dates,
+        '타입': '지출',
+        '대분류': large,
+        '소분류': small,
+        '내용': content,
+        '금액': [-a for a in amounts],
+        '결제수단': method,
+        'member': member,
+    })
+
+
+@pytest.fixture
+def partitions():
+    monthly_dates = [f'2025-{m:02d}-05' for m in range(1, 11)]
+    frames = [
+        # 월간, 2025-07부터 가격 인상 (표기가 달라도 같은 가맹점)
+        _charges(['넷플릭스 '] * 6 + ['넷플릭스(정기결제)'] * 4, monthly_dates, [13500] * 6 + [17000] * 4),
+        # 연간
+        _charges('도메인 갱신', ['2023-03-10', '2024-03-09', '2025-03-10'], 24000, large='생활', small='인터넷'),
+        # 2025-07 이후 결제가 끊긴 월간 결제
+        _charges('헬스장', [f'2025-{m:02d}-15' for m in range(1, 8)], 60000, large='건강', small='운동'),
+        # 간격이 불규칙한 결제
+        _charges('카페', ['2025-01-02', '2025-01-09', '2025-03-20', '2025-03-21', '2025-08-30'], 5000,
+                 large='식비', small='카페'),
+        # 수입은 제외
+        _charges('급여', monthly_dates, -3000000, large='급여', small='').assign(타입='수입'),
+    ]
+    # 월별 파티션으로 나누어 전달 (iter_prepro와 같은 형태)
+    pdf = pd.concat(frames, ignore_index=True)
+    pdf['month'] = pdf['날짜'].str[:7]
+    return [df for _, df in pdf.groupby('month')]
+
+
+def test_detects_cadence_price_change_and_lapsed(config, partitions):
+    result = detect_recurring_payments(iter(partitions), config).set_index('가맹점(정규화)')
+
+    assert sorted(result.index) == ['넷플릭스', '도메인 갱신', '헬스장']
+
+    netflix = result.loc['넷플릭스']
+    assert (netflix['주기'], netflix['결제횟수'], netflix['상태']) == ('월간', 10, '활성')
+    assert netflix['최근금액'] == 17000
+    assert netflix['가격변경일'] == date(2025, 7, 5)
+    assert (netflix['변경전금액'], netflix['변경후금액']) == (13500, 17000)
+    assert netflix['변동률(%)'] == pytest.approx((17000 / 13500 - 1) * 100)
+    assert netflix['다음결제예정일'] == date(2025, 11, 5)
+
+    domain = result.loc['도메인 갱신']
+    assert (domain['주기'], domain['상태']) == ('연간', '활성')
+    assert domain['다음결제예정일'] == date(2026, 3, 10)
+    assert domain['월환산금액'] == 2000
+    assert pd.isna(domain['가격변경일'])
+
+    gym = result.loc['헬스장']
+    assert (gym['주기'], gym['상태']) == ('월간', '미결제')
+    assert gym['다음결제예정일'] == date(2025, 8, 15)
+
+    # 활성 -> 미결제 순
+    assert list(result['상태']) == ['활성', '활성', '미결제']
+
+
+def test_history_after_target_month_is_ignored(config, partitions):
+    config['target_month'] = date(2025, 6, 1)
+    result = detect_recurring_payments(iter(partitions), config).set_index('가맹점(정규화)')
+
+    assert result.loc['넷플릭스', '결제횟수'] == 6
+    assert pd.isna(result.loc['넷플릭스', '가격변경일'])
+    assert result.loc['헬스장', '상태'] == '활성'
+
+
+def test_frequent_price_changes_are_not_recurring(config):
+    amounts = [10000, 20000, 10000, 20000, 10000, 20000]
+    partitions = [_charges('배달앱', [f'2025-{m:02d}-03' for m in range(1, 7)], amounts)]
+    assert len(detect_recurring_payments(iter(partitions), config)) == 0
+
+
+def test_normalize_merchant():
+    content = pd.Series(['넷플릭스 ', 'NETFLIX(정기결제)', '넷플릭스 20250105', None])
+    assert list(normalize_merchant(content)) == ['넷플릭스', 'netflix', '넷플릭스', '']
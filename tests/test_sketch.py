@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src.analyzer.sketch import DEFAULT_COMPRESSION, build_sketch, merge_sketches, sketch_quantile
+
+QUANTILES = [0.01, 0.1, 0.5, 0.9, 0.99]
+
+
+def _rank_error(values, estimate, q):
+    """추정값의 실제 순위(ECDF)와 목표 분위의 차이"""
+    return abs(np.searchsorted(np.sort(values), estimate) / len(values) - q)
+
+
+@pytest.fixture
+def amounts():
+    return np.random.default_rng(0).lognormal(10, 1, 20000)
+
+
+def test_small_sketch_is_exact():
+    values = np.random.default_rng(1).integers(1, 100, DEFAULT_COMPRESSION // 2).astype(float)
+    sketch = build_sketch(values)
+    for q in QUANTILES:
+        assert sketch_quantile(sketch, q) == pytest.approx(np.quantile(values, q))
+
+
+@pytest.mark.parametrize('q', QUANTILES)
+def test_sketch_rank_error_is_bounded(amounts, q):
+    sketch = build_sketch(amounts)
+    assert len(sketch[0]) <= DEFAULT_COMPRESSION
+    assert _rank_error(amounts, sketch_quantile(sketch, q), q) < 0.005
+
+
+@pytest.mark.parametrize('q', QUANTILES)
+def test_sequential_merges_keep_rank_error_bounded(amounts, q):
+    # 월별 스케치를 한 달씩 누적 병합하는 경우 (100번 재압축)
+    merged = None
+    for part in np.array_split(amounts, 100):
+        merged = build_sketch(part) if merged is None else merge_sketches([merged, build_sketch(part)])
+
+    assert merged[1].sum() == len(amounts)
+    assert _rank_error(amounts, sketch_quantile(merged, q), q) < 0.01
+    assert sketch_quantile(merged, q) == pytest.approx(np.quantile(amounts, q), rel=0.1)
+
+
+def test_merge_ignores_missing_and_empty_sketches():
+    values = np.arange(10, dtype=float)
+    assert np.isnan(sketch_quantile(merge_sketches([None]), 0.5))
+    merged = merge_sketches([None, build_sketch(values), build_sketch([np.nan])])
+    assert sketch_quantile(merged, 0.5) == pytest.approx(np.median(values))